@@ -0,0 +1,3 @@
+"""
+Micro-benchmarks for hot paths of the application. Run each module with `python -m benchmarks.<name>`.
+"""
@@ -0,0 +1,68 @@
+"""
+Password hashing throughput per bcrypt cost.
+
+Reports single-core latency and hashes per second per core when all cores hash in
+parallel, to pick `HASH_BCRYPT_ROUNDS` / `HASH_TARGET_MS` and size `HASH_POOL_WORKERS`.
+
+Usage:
+    python -m benchmarks.hashing [--rounds 10 11 12] [--hashes 16] [--workers N]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from src.services.hashing import MIN_BCRYPT_ROUNDS
+
+
+def run(rounds: int, hashes: int, workers: int) -> dict:
+    """
+    Hash `hashes` passwords at the given cost, first on one thread and then on `workers` threads.
+
+    Args:
+        rounds (int): The bcrypt cost factor.
+        hashes (int): Number of hashes per measurement.
+        workers (int): Number of parallel threads (bcrypt releases the GIL).
+
+    Returns:
+        dict: Latency in ms, single-core and per-core throughput in hashes per second.
+    """
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    started = time.perf_counter()
+    for i in range(hashes):
+        context.hash(f"password-{i}")
+    single = time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        started = time.perf_counter()
+        list(executor.map(context.hash, (f"password-{i}" for i in range(hashes * workers))))
+        parallel = time.perf_counter() - started
+
+    return {
+        "rounds": rounds,
+        "latency_ms": single / hashes * 1000,
+        "single_core_per_sec": hashes / single,
+        "per_core_per_sec": hashes / parallel,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[MIN_BCRYPT_ROUNDS, 11, 12, 13])
+    parser.add_argument("--hashes", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"{'rounds':>6} {'latency ms':>11} {'1-core/s':>9} {'per-core/s':>11}  ({args.workers} workers)")
+    for rounds in args.rounds:
+        result = run(rounds, args.hashes, args.workers)
+        print(
+            f"{result['rounds']:>6} {result['latency_ms']:>11.1f} "
+            f"{result['single_core_per_sec']:>9.1f} {result['per_core_per_sec']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Per-request CPU cost of access token verification with and without the claims cache.
+
+Uses the configured key ring, so set JWT_KEYS_DIR / JWT_ALGORITHM to compare RS256 or ES256.
+
+Usage:
+    python -m benchmarks.jwt_claims [--requests 20000]
+"""
+import argparse
+import asyncio
+import time
+
+from src.services.auth import claims_cache, create_access_token, decode_access_token
+from src.services.jwt_keys import key_ring
+
+
+async def measure(decode, requests: int) -> float:
+    started = time.process_time()
+    for _ in range(requests):
+        await decode()
+    return (time.process_time() - started) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = asyncio.run(create_access_token({"sub": "benchmark"}))
+
+    uncached = asyncio.run(measure(lambda: key_ring.decode(token), args.requests))
+    claims_cache.clear()
+    cached = asyncio.run(measure(lambda: decode_access_token(token), args.requests))
+
+    print(f"key_ring.decode:     {uncached * 1e6:8.2f} us CPU/request ({key_ring.algorithm})")
+    print(f"decode_access_token: {cached * 1e6:8.2f} us CPU/request")
+    print(f"saved:               {(uncached - cached) * 1e6:8.2f} us CPU/request ({uncached / cached:.1f}x)")
+    print(f"cache:               {claims_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Mail template rendering throughput: shared registry vs. a fresh environment per email.
+
+A fresh environment per email is what fastapi-mail did for every `FastMail` instance.
+
+Usage:
+    python -m benchmarks.mail_templates [--renders 5000] [--template verify_email.html]
+"""
+import argparse
+import time
+
+from src.services.email import conf, mail_templates
+
+CONTEXT = {
+    "host": "http://localhost:8000/",
+    "username": "benchmark",
+    "token": "x" * 160,
+    "reset_link": "http://localhost:8000/api/auth/confirm_reset_password/" + "x" * 160,
+}
+
+
+def renders_per_second(render, renders: int) -> float:
+    started = time.perf_counter()
+    for _ in range(renders):
+        render()
+    return renders / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=5000)
+    parser.add_argument("--template", default="verify_email.html")
+    args = parser.parse_args()
+
+    per_email = renders_per_second(
+        lambda: conf.template_engine().get_template(args.template).render(**CONTEXT), max(args.renders // 10, 1)
+    )
+    mail_templates.load()
+    registry = renders_per_second(lambda: mail_templates.render(args.template, CONTEXT), args.renders)
+
+    print(f"environment per email: {per_email:10.0f} renders/s")
+    print(f"template registry:     {registry:10.0f} renders/s ({registry / per_email:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
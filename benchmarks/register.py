@@ -0,0 +1,134 @@
+"""
+End-to-end load test of registration and its confirmation email.
+
+Drives N concurrent `POST /api/auth/register` calls through the ASGI app, delivers the
+queued emails with the outbox worker into an in-process SMTP sink, and reports request
+latency, registration throughput, end-to-end latency (request start to email accepted by
+SMTP) and emails/sec.
+
+Uses a throwaway SQLite database unless `--database-url` is given.
+
+Usage:
+    python -m benchmarks.register [--users 200] [--concurrency 32] [--bcrypt-rounds 4]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)] if values else float("nan")
+
+
+async def run(args):
+    import httpx
+
+    from main import app
+    from src.conf.config import config
+    from src.db.db import sessionmanager
+    from src.db.models import Base
+    from src.services.email import mail_templates
+    from src.services.hashing import configure_hashing
+    from src.services.mail_transport import MailSink
+    from src.workers.email_sender import EmailSender
+
+    async with sessionmanager._engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    configure_hashing(args.bcrypt_rounds)
+    mail_templates.load()
+    config.OUTBOX_POLL_SECONDS = args.poll_seconds
+
+    sink = MailSink(port=args.sink_port)
+    sink.start()
+    sender = EmailSender(transport=sink.transport())
+    worker = asyncio.create_task(sender.run())
+
+    run_id = uuid.uuid4().hex[:8]
+    started_at = {}
+    responded_at = {}
+
+    async def timed_app(scope, receive, send):
+        # ASGITransport returns only after background tasks have run; record when the
+        # response body is complete, which is when a real server's client would see it.
+        email = dict(scope.get("headers", [])).get(b"x-bench-email", b"").decode()
+
+        async def timed_send(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                responded_at[email] = time.perf_counter()
+
+        await app(scope, receive, timed_send)
+    latencies = []
+    statuses = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=timed_app), base_url="http://bench/") as client:
+
+        async def register(i):
+            email = f"bench-{run_id}-{i}@example.com"
+            async with semaphore:
+                started = time.perf_counter()
+                started_at[email] = started
+                response = await client.post(
+                    "/api/auth/register",
+                    json={"username": f"bench-{run_id}-{i}", "email": email, "password": "12345678"},
+                    headers={"x-bench-email": email},
+                )
+                latencies.append(responded_at[email] - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        first = time.perf_counter()
+        await asyncio.gather(*(register(i) for i in range(args.users)))
+        registered_in = max(responded_at.values()) - first
+        expected = statuses.get(201, 0)
+        deadline = time.perf_counter() + args.timeout
+        while len(sink.received) < expected and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+
+    worker.cancel()
+    await asyncio.gather(worker, return_exceptions=True)
+    sink.stop()
+
+    end_to_end = [
+        received - started_at[recipient]
+        for received, recipients in sink.received
+        for recipient in recipients
+        if recipient in started_at
+    ]
+    elapsed = (max(received for received, _ in sink.received) if sink.received else time.perf_counter()) - first
+
+    print(f"users: {args.users}  concurrency: {args.concurrency}  statuses: {statuses}")
+    print(
+        f"request latency   p50 {percentile(latencies, 0.5) * 1000:8.1f} ms"
+        f"  p95 {percentile(latencies, 0.95) * 1000:8.1f} ms  mean {statistics.fmean(latencies) * 1000:8.1f} ms"
+    )
+    print(f"registrations     {statuses.get(201, 0) / registered_in:8.1f} req/s")
+    if end_to_end:
+        print(
+            f"end-to-end        p50 {percentile(end_to_end, 0.5) * 1000:8.1f} ms"
+            f"  p95 {percentile(end_to_end, 0.95) * 1000:8.1f} ms"
+        )
+    print(f"emails delivered: {len(end_to_end)}/{expected}  throughput {len(end_to_end) / elapsed:8.1f} emails/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4)
+    parser.add_argument("--poll-seconds", type=float, default=0.1)
+    parser.add_argument("--sink-port", type=int, default=8025)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./benchmark.db")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,44 @@
+import asyncio
+import contextlib
 import logging
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import JSONResponse
+from starlette.staticfiles import StaticFiles
 from slowapi.errors import RateLimitExceeded
-from src.api import utils, contacts, auth, users
+from redis.exceptions import RedisError
+from src.api import utils, contacts, auth, users, well_known
+from src.services.cache import user_cache
+from src.services.revocation import token_denylist
+from src.conf.config import config
+from src.services import avatar_variants
+from src.services.hashing import configure_hashing, hashing_pool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Calibrate password hashing and run background listeners for the lifetime of the application.
+    """
+    await asyncio.to_thread(configure_hashing, config.HASH_BCRYPT_ROUNDS, config.HASH_TARGET_MS)
+    try:
+        await token_denylist.sync()
+    except RedisError as e:
+        logger.warning("Initial token denylist sync failed: %s", e)
+    listeners = [asyncio.create_task(user_cache.listen()), asyncio.create_task(token_denylist.run())]
+    yield
+    for listener in listeners:
+        listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await listener
+    hashing_pool.shutdown()
+    avatar_variants.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:8000",
@@ -22,6 +52,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -37,6 +68,10 @@ app.include_router(utils.router, prefix="/api")
 app.include_router(contacts.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
+app.include_router(well_known.router)
+
+if config.AVATAR_STORAGE == "local":
+    app.mount(config.AVATAR_LOCAL_URL, StaticFiles(directory=config.AVATAR_LOCAL_DIR, check_dir=False), name="avatars")
 
 if __name__ == "__main__":
     import uvicorn
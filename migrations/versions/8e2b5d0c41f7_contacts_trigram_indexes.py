@@ -0,0 +1,45 @@
+"""Contacts trigram indexes
+
+Revision ID: 8e2b5d0c41f7
+Revises: 3c9f1a7d2b64
+Create Date: 2026-10-18 11:04:52.817330
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2b5d0c41f7'
+down_revision: Union[str, None] = '3c9f1a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRGM_COLUMNS = ('first_name', 'last_name', 'email')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm is PostgreSQL only; other backends keep plain substring scans.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRGM_COLUMNS:
+        op.create_index(
+            f'ix_contacts_{column}_trgm',
+            'contacts',
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in reversed(TRGM_COLUMNS):
+        op.drop_index(f'ix_contacts_{column}_trgm', table_name='contacts')
@@ -0,0 +1,40 @@
+"""Contacts full-text search vector
+
+Revision ID: b47e0f9a6c12
+Revises: 8e2b5d0c41f7
+Create Date: 2026-10-18 12:21:07.553402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b47e0f9a6c12'
+down_revision: Union[str, None] = '8e2b5d0c41f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contacts', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+            "coalesce(email, '') || ' ' || coalesce(phone_number, '') || ' ' || coalesce(info, ''))",
+            persisted=True,
+        ),
+        nullable=False,
+    ))
+    op.create_index('ix_contacts_search_vector', 'contacts', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_search_vector', table_name='contacts', postgresql_using='gin')
+    op.drop_column('contacts', 'search_vector')
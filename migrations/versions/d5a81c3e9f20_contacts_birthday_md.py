@@ -0,0 +1,38 @@
+"""Contacts birthday month-day column
+
+Revision ID: d5a81c3e9f20
+Revises: b47e0f9a6c12
+Create Date: 2026-10-18 13:40:18.092671
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a81c3e9f20'
+down_revision: Union[str, None] = 'b47e0f9a6c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contacts', sa.Column(
+        'birthday_md',
+        sa.Integer(),
+        sa.Computed(
+            "CAST(EXTRACT(MONTH FROM birthday_date) * 100 + EXTRACT(DAY FROM birthday_date) AS INTEGER)",
+            persisted=True,
+        ),
+        nullable=False,
+    ))
+    op.create_index('ix_contacts_user_id_birthday_md', 'contacts', ['user_id', 'birthday_md'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_user_id_birthday_md', table_name='contacts')
+    op.drop_column('contacts', 'birthday_md')
@@ -0,0 +1,34 @@
+"""Contacts email and phone unique per user
+
+Revision ID: f1c64b2a7e93
+Revises: d5a81c3e9f20
+Create Date: 2026-10-18 15:02:44.318925
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c64b2a7e93'
+down_revision: Union[str, None] = 'd5a81c3e9f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('contacts_email_key', 'contacts', type_='unique')
+    op.drop_constraint('contacts_phone_number_key', 'contacts', type_='unique')
+    op.create_unique_constraint('uq_contacts_user_id_email', 'contacts', ['user_id', 'email'])
+    op.create_unique_constraint('uq_contacts_user_id_phone_number', 'contacts', ['user_id', 'phone_number'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_contacts_user_id_phone_number', 'contacts', type_='unique')
+    op.drop_constraint('uq_contacts_user_id_email', 'contacts', type_='unique')
+    op.create_unique_constraint('contacts_phone_number_key', 'contacts', ['phone_number'])
+    op.create_unique_constraint('contacts_email_key', 'contacts', ['email'])
@@ -1,16 +1,25 @@
-import json
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 
-from src.conf.redis_client import redis_client
-from src.schemas import UserCreate, Token, User, RequestEmail, ResetPassword
+from src.schemas import UserCreate, Token, User, RequestEmail, ResetPassword, RefreshTokenRequest
 from src.services.email import send_email_confirmation, send_reset_password_email
-from src.services.auth import create_access_token, Hash, get_email_from_token, get_password_from_token
+from src.services.auth import (
+    create_access_token,
+    Hash,
+    get_email_from_token,
+    get_password_from_token,
+    decode_revocable_token,
+    oauth2_scheme,
+    revoke_access_token,
+)
+from src.services.cache import user_cache
+from src.services.gravatar import fill_default_avatar
+from src.services.refresh_tokens import RefreshTokenService
 from src.services.users import UserService
-from src.db.db import get_db
-from src.utils import model_to_dict
+from src.db.db import get_db, get_session_factory
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -20,18 +29,21 @@ async def register_user(
     user_data: UserCreate, 
     background_tasks: BackgroundTasks,
     request: Request, 
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_factory=Depends(get_session_factory),
 ):
     """
     Register a new user.
 
     This endpoint creates a new user with the provided credentials and sends a confirmation email.
+    Uniqueness is enforced by the database, and the Gravatar avatar is resolved in the background.
 
     Args:
         user_data (UserCreate): Data for creating a new user.
         background_tasks (BackgroundTasks): Background tasks manager for sending emails.
         request (Request): The current request object to construct the base URL.
         db (AsyncSession): The database session.
+        session_factory: Factory for the session used by the avatar background task.
 
     Returns:
         User: The created user object.
@@ -39,23 +51,9 @@ async def register_user(
     Raises:
         HTTPException: If the email or username is already in use.
     """
-    user_service = UserService(db)
-
-    email_user = await user_service.get_user_by_email(user_data.email)
-    if email_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="You can't use this email",
-        )
-
-    username_user = await user_service.get_user_by_username(user_data.username)
-    if username_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="You can't use this username",
-        )
-    user_data.password = Hash().get_pwd_hash(user_data.password)
-    new_user = await user_service.create_user(user_data)
+    user_data.password = await Hash().get_password_hash_async(user_data.password)
+    new_user = await UserService(db).create_user(user_data)
+    background_tasks.add_task(fill_default_avatar, new_user.id, new_user.email, session_factory)
     background_tasks.add_task(
         send_email_confirmation, new_user.email, new_user.username, str(request.base_url)
     )
@@ -71,26 +69,32 @@ async def login_user(
     """
     Log in a user.
 
-    This endpoint authenticates the user using their username and password and returns an access token.
+    This endpoint authenticates the user using their username and password and returns an access token
+    together with a refresh token for `/auth/refresh`.
 
     Args:
         form_data (OAuth2PasswordRequestForm): The form containing username and password.
         db (AsyncSession): The database session.
 
     Returns:
-        Token: An access token for the authenticated user.
+        Token: An access token and a refresh token for the authenticated user.
 
     Raises:
         HTTPException: If credentials are incorrect or the email is not confirmed.
     """
     user_service = UserService(db)
-    user = await user_service.get_user_by_username(form_data.username)
-    if not user or not Hash().verify_password(form_data.password, user.hashed_password):
+    user = await user_service.get_user_by_username(form_data.username, replica=False)
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await Hash().verify_and_update_async(form_data.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Wrong credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        await user_service.rehash_password(user, new_hash)
 
     if not user.confirmed:
         raise HTTPException(
@@ -99,9 +103,68 @@ async def login_user(
         )
 
     access_token = await create_access_token(data={"sub": user.username, "user_id": user.id})
-    await redis_client.set(f"user:{user.username}", json.dumps(model_to_dict(user, exclude=["password"])), ex=3600)
+    refresh_token = await RefreshTokenService(db).issue(user.id)
+    await user_cache.set(user)
+
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(body: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+
+    No password verification is needed. The presented refresh token is consumed; reusing
+    it later revokes every refresh token rotated from the same login.
+
+    Args:
+        body (RefreshTokenRequest): The refresh token.
+        db (AsyncSession): The database session.
+
+    Returns:
+        Token: A new access token and refresh token.
+
+    Raises:
+        HTTPException: If the refresh token is invalid, expired or already used.
+    """
+    user_id, refresh_token = await RefreshTokenService(db).rotate(body.refresh_token)
+    user = await UserService(db).get_user_by_id(user_id)
+    if user is None or not user.confirmed:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    access_token = await create_access_token(data={"sub": user.username, "user_id": user.id})
+
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
 
-    return {"access_token": access_token, "token_type": "bearer"}
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_user(
+    body: Optional[RefreshTokenRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Log out by revoking the access token used for this request.
+
+    If the refresh token is sent as well and belongs to the same user, it is revoked together
+    with every token rotated from the same login, so the session cannot be resumed through
+    `/auth/refresh`. The access token is verified first.
+
+    Args:
+        body (Optional[RefreshTokenRequest]): The refresh token of the session.
+        token (str): The bearer token.
+        db (AsyncSession): The database session.
+
+    Raises:
+        HTTPException: If the token is invalid or cannot be revoked.
+    """
+    claims = await decode_revocable_token(token)
+    if body is not None and "user_id" in claims:
+        await RefreshTokenService(db).revoke(body.refresh_token, claims["user_id"])
+    await revoke_access_token(claims)
 
 
 @router.get("/confirmed_email/{token}")
@@ -189,7 +252,7 @@ async def reset_password_request(
             detail="Email not confirmed",
         )
 
-    hashed_password = Hash().get_password_hash(body.password)
+    hashed_password = await Hash().get_password_hash_async(body.password)
 
     reset_token = await create_access_token(
         data={"sub": user.email, "password": hashed_password}
@@ -229,7 +292,7 @@ async def confirm_reset_password(token: str, db: AsyncSession = Depends(get_db))
             detail="User not found",
         )
 
-    await user.reset_password(user.id, hashed_password)
+    await user_service.reset_password(user.email, hashed_password)
 
     return {"message": "Password successfully changed"}
 
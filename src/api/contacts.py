@@ -1,11 +1,15 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Response, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
 from typing_extensions import Annotated
 
-from src.db.db import get_db
+from src.db.db import get_db, get_session_factory
 from src.db.models import User
-from src.schemas import ContactModel, ContactResponse
+from src.schemas import (
+    ContactModel, ContactResponse, ContactSortField, ContactFileFormat, ContactImportReport,
+    ContactSelector, ContactBulkUpdate, ContactBulkResult,
+)
 from src.services.auth import get_current_user
 from src.services.contacts import ContactService
 
@@ -62,32 +66,114 @@ async def get_upcoming_birthdays(
     return await contact_service.list_upcoming_birthdays(user.id, days)
 
 
+@router.get("/search", response_model=List[ContactResponse])
+async def search_contacts(
+    user: user_dependency,
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    skip: int = 0,
+    limit: int = Query(default=100, ge=1),
+    cursor: Optional[str] = None,
+    contact_service: ContactService = Depends(get_contact_service),
+):
+    """
+    Search contacts by name, email, phone and info in a single ranked query.
+
+    Paginates like the contact list: `skip`/`limit`, or the cursor from the
+    `X-Next-Cursor` response header.
+
+    Args:
+        user: Request user.
+        response (Response): The outgoing response, used to set the `X-Next-Cursor` header.
+        q (str): Web-search style query, e.g. `john "new york" -smith`.
+        skip (int): Number of records to skip for pagination. Ignored when `cursor` is given.
+        limit (int): Maximum number of records to return.
+        cursor (Optional[str]): Cursor from the `X-Next-Cursor` header of the previous page.
+        contact_service (ContactService): The contact service instance.
+
+    Returns:
+        List[ContactResponse]: Matching contacts, best matches first.
+    """
+    contacts, next_cursor = await contact_service.search_contacts(user.id, q, skip, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return contacts
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_contacts(
+    user: user_dependency,
+    file_format: ContactFileFormat = Query(default="csv", alias="format"),
+    session_factory=Depends(get_session_factory),
+):
+    """
+    Download all contacts of the user as a CSV or NDJSON file.
+
+    The file is streamed from a server-side cursor, so memory use does not grow with
+    the number of contacts.
+
+    Args:
+        user: Request user.
+        file_format (ContactFileFormat): "csv" (default) or "ndjson".
+        session_factory: Factory for the session that lives as long as the stream.
+
+    Returns:
+        StreamingResponse: The export file.
+    """
+    async def content():
+        async with session_factory() as session:
+            async for chunk in ContactService(session).export_contacts(user.id, file_format):
+                yield chunk
+
+    media_type = "text/csv" if file_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        content(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="contacts.{file_format}"'},
+    )
+
+
 @router.get("/", response_model=List[ContactResponse])
 async def get_all_contacts(
     user: user_dependency,
+    response: Response,
     first_name: str = "",
     last_name: str = "",
     email: str = "",
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(default=100, ge=1),
+    sort_by: ContactSortField = "id",
+    cursor: Optional[str] = None,
     contact_service: ContactService = Depends(get_contact_service),
 ):
     """
     Retrieve a list of all contacts with optional filters.
 
+    When a full page is returned, the `X-Next-Cursor` response header holds an opaque
+    cursor; pass it back as `cursor` to fetch the next page without an OFFSET scan.
+
     Args:
         user: Request user.
+        response (Response): The outgoing response, used to set the `X-Next-Cursor` header.
         first_name (str): Filter contacts by first name (optional).
         last_name (str): Filter contacts by last name (optional).
         email (str): Filter contacts by email (optional).
-        skip (int): Number of records to skip for pagination.
+        skip (int): Number of records to skip for pagination. Ignored when `cursor` is given.
         limit (int): Maximum number of records to return.
+        sort_by (ContactSortField): Field to order contacts by.
+        cursor (Optional[str]): Cursor from the `X-Next-Cursor` header of the previous page.
         contact_service (ContactService): The contact service instance.
 
     Returns:
         List[ContactResponse]: A list of contacts matching the filters.
     """
-    return await contact_service.list_contacts(user.id, first_name, last_name, email, skip, limit)
+    contacts = await contact_service.list_contacts(
+        user.id, first_name, last_name, email, skip, limit, sort_by=sort_by, cursor=cursor
+    )
+    next_cursor = ContactService.next_cursor(contacts, limit, sort_by)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return contacts
 
 
 @router.get("/{contact_id}", response_model=ContactResponse)
@@ -123,6 +209,76 @@ async def create_contact(
     return await contact_service.create_contact(user.id, body)
 
 
+@router.post("/import", response_model=ContactImportReport)
+async def import_contacts(
+    user: user_dependency,
+    file: UploadFile = File(),
+    file_format: Optional[ContactFileFormat] = Query(default=None, alias="format"),
+    contact_service: ContactService = Depends(get_contact_service),
+):
+    """
+    Bulk import contacts from a CSV or NDJSON file.
+
+    CSV files need a header row with `ContactModel` field names; NDJSON files hold one
+    contact object per line. Valid rows are stored, the rest are reported per row.
+
+    Args:
+        user: Request user.
+        file (UploadFile): The file to import.
+        file_format (Optional[ContactFileFormat]): "csv" or "ndjson"; guessed from the file name when omitted.
+        contact_service (ContactService): The contact service instance.
+
+    Returns:
+        ContactImportReport: Number of imported contacts and the rejected rows with their errors.
+    """
+    if file_format is None:
+        is_ndjson = (file.filename or "").lower().endswith((".ndjson", ".jsonl")) or (
+            file.content_type in ("application/x-ndjson", "application/jsonl")
+        )
+        file_format = "ndjson" if is_ndjson else "csv"
+    return await contact_service.import_contacts(user.id, file.file, file_format)
+
+
+@router.patch("/bulk", response_model=ContactBulkResult)
+async def bulk_update_contacts(
+    user: user_dependency,
+    body: ContactBulkUpdate,
+    contact_service: ContactService = Depends(get_contact_service),
+):
+    """
+    Update many contacts at once, selected by IDs and/or filters.
+
+    Args:
+        user: Request user.
+        body (ContactBulkUpdate): The contacts to update and the changes to apply.
+        contact_service (ContactService): The contact service instance.
+
+    Returns:
+        ContactBulkResult: The number and IDs of the updated contacts.
+    """
+    return await contact_service.bulk_update_contacts(user.id, body)
+
+
+@router.post("/bulk/delete", response_model=ContactBulkResult)
+async def bulk_delete_contacts(
+    user: user_dependency,
+    body: ContactSelector,
+    contact_service: ContactService = Depends(get_contact_service),
+):
+    """
+    Delete many contacts at once, selected by IDs and/or filters.
+
+    Args:
+        user: Request user.
+        body (ContactSelector): The contacts to delete.
+        contact_service (ContactService): The contact service instance.
+
+    Returns:
+        ContactBulkResult: The number and IDs of the deleted contacts.
+    """
+    return await contact_service.bulk_delete_contacts(user.id, body)
+
+
 @router.put("/{contact_id}", response_model=ContactResponse)
 async def update_contact(
     body: ContactModel,
@@ -3,11 +3,10 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.conf.config import config
 from src.db.db import get_db
 from src.schemas import User
 from src.services.auth import get_current_user, get_admin_user
-from src.services.upload_file import UploadFileService
+from src.services.upload_file import AvatarStorage, UploadFileService, get_avatar_storage
 from src.services.users import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -38,27 +37,31 @@ async def update_avatar_user(
         file: UploadFile = File(),
         user: User = Depends(get_admin_user),
         db: AsyncSession = Depends(get_db),
+        storage: AvatarStorage = Depends(get_avatar_storage),
 ):
     """
     Update the authenticated user's avatar.
 
-    This endpoint allows the user to upload a new avatar image, which is stored in a cloud storage
-    (e.g., Cloudinary), and updates the user's profile with the new avatar URL.
+    This endpoint allows the user to upload a new avatar image. The image is rendered into
+    thumbnail variants stored in the configured storage (Cloudinary or the local filesystem),
+    and the user's avatar is set to the URL of the manifest listing them. Uploading the
+    current avatar again changes nothing.
 
     Args:
-        file (UploadFile): The avatar image file to upload.
+        file (UploadFile): The avatar image file to upload (JPEG, PNG, GIF or WebP, at most `AVATAR_MAX_BYTES`).
         user (User): The authenticated user, injected via the `get_current_user` dependency.
         db (AsyncSession): The database session.
+        storage (AvatarStorage): The avatar storage backend.
 
     Returns:
-        User: The updated user profile with the new avatar URL.
+        User: The updated user profile with the new avatar manifest URL.
 
     Raises:
-        HTTPException: If an error occurs during file upload or database update.
+        HTTPException: If the file is too large or not an accepted image.
     """
-    avatar_url = UploadFileService(
-        config.CLD_NAME, config.CLD_API_KEY, config.CLD_API_SECRET
-    ).upload_file(file, user.username)
+    avatar_url = await UploadFileService(storage).upload_avatar(file)
+    if avatar_url == user.avatar:
+        return user
 
     user_service = UserService(db)
     user = await user_service.update_avatar_url(user.email, avatar_url)
@@ -2,7 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from src.db.db import get_db
+from src.db.db import get_db, sessionmanager
+from src.repositories.email_outbox import EmailOutboxRepository
+from src.schemas import User
+from src.services.auth import claims_cache, get_admin_user
+from src.services.cache import user_cache
+from src.services.hashing import hashing_pool
 
 router = APIRouter(tags=["utils"])
 
@@ -40,4 +45,26 @@ async def health(db: AsyncSession = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error connecting to the db",
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/metrics")
+async def metrics(db: AsyncSession = Depends(get_db), user: User = Depends(get_admin_user)):
+    """
+    Report in-process performance counters of this worker, including its database
+    connection pool, and the email outbox depth. Admins only.
+
+    Args:
+        db (AsyncSession): The database session, injected as a dependency.
+        user (User): The authenticated admin.
+
+    Returns:
+        dict: Counters grouped by component, e.g. the hit ratio of the local user cache.
+    """
+    return {
+        "email_outbox": await EmailOutboxRepository(db).depth(),
+        "user_cache": user_cache.local.stats(),
+        "claims_cache": claims_cache.stats(),
+        "hashing_pool": hashing_pool.stats(),
+        "db_pool": sessionmanager.pool_stats(),
+    }
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Response
+
+from src.services.jwt_keys import key_ring
+
+router = APIRouter(prefix="/.well-known", tags=["well-known"])
+
+
+@router.get("/jwks.json")
+async def jwks(response: Response):
+    """
+    Publish the public keys that verify tokens issued by this service.
+
+    Args:
+        response (Response): The response, used to set caching headers.
+
+    Returns:
+        dict: A JWKS document; empty when tokens are signed with a shared secret.
+    """
+    response.headers["Cache-Control"] = f"public, max-age={key_ring.jwks_max_age}"
+    return key_ring.jwks()
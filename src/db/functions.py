@@ -0,0 +1,30 @@
+"""
+Portable SQL expressions used in generated columns.
+"""
+from sqlalchemy import Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class month_day(FunctionElement):
+    """
+    `month_day(date)` is the date's calendar position as `month * 100 + day`, e.g. 1231 for Dec 31.
+
+    Unlike day-of-year it does not shift after February in leap years, so it can be
+    stored once and compared against any year's dates.
+    """
+    type = Integer()
+    name = "month_day"
+    inherit_cache = True
+
+
+@compiles(month_day)
+def _pg_month_day(element, compiler, **kw):
+    value = compiler.process(element.clauses, **kw)
+    return f"CAST(EXTRACT(MONTH FROM {value}) * 100 + EXTRACT(DAY FROM {value}) AS INTEGER)"
+
+
+@compiles(month_day, "sqlite")
+def _sqlite_month_day(element, compiler, **kw):
+    value = compiler.process(element.clauses, **kw)
+    return f"CAST(strftime('%m%d', {value}) AS INTEGER)"
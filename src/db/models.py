@@ -1,9 +1,13 @@
 from enum import Enum
 from datetime import datetime, date
-from sqlalchemy import Integer, String, func, Column, ForeignKey, Boolean, Enum as SqlEnum
+from sqlalchemy import JSON, Integer, String, Text, func, text, Column, Computed, ForeignKey, Boolean, Index, UniqueConstraint, Enum as SqlEnum
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import mapped_column, Mapped, DeclarativeBase, relationship
 from sqlalchemy.sql.sqltypes import DateTime, Date
 
+from src.db.functions import month_day
+from src.db.search import contact_search_document
+
 
 class Base(DeclarativeBase):
     """
@@ -31,25 +35,54 @@ class Contact(Base):
         id (int): Primary key, unique identifier for each contact.
         first_name (str): First name of the contact. Required, max length 50.
         last_name (str): Last name of the contact. Required, max length 50.
-        email (str): Email address of the contact. Must be unique. Required, max length 80.
-        phone_number (str): Phone number of the contact. Must be unique. Required, max length 15.
+        email (str): Email address of the contact. Unique per user. Required, max length 80.
+        phone_number (str): Phone number of the contact. Unique per user. Required, max length 15.
         birthday_date (date): Birthday of the contact. Required.
+        birthday_md (int): Birthday as `month * 100 + day`, generated from `birthday_date`. Not loaded by default.
         created_at (datetime): Timestamp of when the contact was created. Auto-generated.
         updated_at (datetime): Timestamp of the last update. Auto-generated on update.
         info (str): Additional information about the contact. Optional, max length 500.
+        search_vector (str): Stored full-text document over names, email, phone and info. Not loaded by default.
     """
     __tablename__ = "contacts"
+    __table_args__ = (
+        UniqueConstraint("user_id", "email", name="uq_contacts_user_id_email"),
+        UniqueConstraint("user_id", "phone_number", name="uq_contacts_user_id_phone_number"),
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        Index("ix_contacts_user_id_first_name_id", "user_id", "first_name", "id"),
+        Index("ix_contacts_user_id_last_name_id", "user_id", "last_name", "id"),
+        Index("ix_contacts_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_contacts_user_id_birthday_md", "user_id", "birthday_md"),
+        *(
+            Index(
+                f"ix_contacts_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql")
+            for column in ("first_name", "last_name", "email")
+        ),
+        Index("ix_contacts_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     first_name: Mapped[str] = mapped_column(String(50), nullable=False)
     last_name: Mapped[str] = mapped_column(String(50), nullable=False)
-    email: Mapped[str] = mapped_column(String(80), nullable=False, unique=True)
-    phone_number: Mapped[str] = mapped_column(String(15), nullable=False, unique=True)
+    email: Mapped[str] = mapped_column(String(80), nullable=False)
+    phone_number: Mapped[str] = mapped_column(String(15), nullable=False)
     birthday_date: Mapped[date] = mapped_column("birthday_date", Date, nullable=False)
+    birthday_md: Mapped[int] = mapped_column(
+        Integer, Computed(month_day(text("birthday_date")), persisted=True), deferred=True
+    )
     created_at: Mapped[datetime] = mapped_column("created_at", DateTime, default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         "updated_at", DateTime, default=func.now(), onupdate=func.now()
     )
     info: Mapped[str] = mapped_column(String(500), nullable=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR().with_variant(Text(), "sqlite"),
+        Computed(contact_search_document(), persisted=True),
+        deferred=True,
+    )
     user_id = Column(
         "user_id", ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -66,7 +99,7 @@ class User(Base):
         email (str): Email address of the user. Must be unique. Required.
         hashed_password (str): Hashed password for the user. Required.
         created_at (datetime): Timestamp of when the user was created. Auto-generated.
-        avatar (str): URL of the user's avatar. Optional, max length 255.
+        avatar (str): URL of the user's avatar or of its variant manifest. Optional, max length 255.
         confirmed (bool): Status indicating whether the user's email is confirmed. Default is False.
     """
     __tablename__ = "users"
@@ -78,3 +111,65 @@ class User(Base):
     avatar: Mapped[str] = mapped_column(String(255), nullable=True)
     confirmed: Mapped[bool] = mapped_column(Boolean, default=False)
     role: Mapped[Role] = mapped_column(SqlEnum(Role), default=Role.USER, nullable=False)
+
+
+class RefreshToken(Base):
+    """
+    Model representing a refresh token. Only the SHA-256 digest of the token is stored.
+
+    Tokens are single-use: refreshing revokes the presented token and issues a new one in
+    the same family. Presenting a revoked token again revokes the whole family.
+
+    Attributes:
+        id (int): Primary key.
+        user_id (int): Owner of the token.
+        token_hash (str): Hex SHA-256 digest of the token. Unique.
+        family_id (str): Identifier shared by all tokens rotated from one login.
+        created_at (datetime): Timestamp of when the token was issued, UTC.
+        expires_at (datetime): Timestamp after which the token is rejected, UTC.
+        revoked_at (datetime): Timestamp of rotation or revocation, UTC. Null while the token is usable.
+    """
+    __tablename__ = "refresh_tokens"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    family_id: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    revoked_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+
+class EmailOutbox(Base):
+    """
+    Model representing an email waiting to be sent by the email sender worker.
+
+    Attributes:
+        id (int): Primary key.
+        recipient (str): Email address of the recipient.
+        subject (str): Subject line.
+        template (str): Name of the mail template to render.
+        context (dict): Template variables, stored as JSON.
+        status (str): "pending", "sent" or "failed".
+        attempts (int): Number of delivery attempts so far.
+        next_attempt_at (datetime): Earliest time of the next attempt, UTC. Also serves as the claim lease.
+        last_error (str): Error of the last failed attempt. Optional.
+        created_at (datetime): Timestamp of when the email was queued, UTC.
+        sent_at (datetime): Timestamp of successful delivery, UTC. Optional.
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    recipient: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    template: Mapped[str] = mapped_column(String(100), nullable=False)
+    context: Mapped[dict] = mapped_column(JSON, nullable=False)
+    status: Mapped[str] = mapped_column(String(10), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_error: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    sent_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
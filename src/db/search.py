@@ -0,0 +1,80 @@
+"""
+Full-text search SQL constructs for contacts.
+
+PostgreSQL gets a real `tsvector` document, `@@` matching and `ts_rank` ordering.
+SQLite (used by the test suite) falls back to a lower-cased text document with
+substring matching and a constant rank, so the same queries run on both backends.
+"""
+from sqlalchemy import Boolean, Float, Text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+SEARCH_CONFIG = "simple"
+"""Text search configuration; `simple` avoids stemming names, emails and phone numbers."""
+
+SEARCH_COLUMNS = ("first_name", "last_name", "email", "phone_number", "info")
+"""Contact columns that make up the search document."""
+
+
+def _concatenated_columns() -> str:
+    return " || ' ' || ".join(f"coalesce({column}, '')" for column in SEARCH_COLUMNS)
+
+
+class contact_search_document(FunctionElement):
+    """
+    Generation expression of the stored `contacts.search_vector` column.
+    """
+    type = Text()
+    name = "contact_search_document"
+    inherit_cache = True
+
+
+@compiles(contact_search_document)
+def _pg_contact_search_document(element, compiler, **kw):
+    return f"to_tsvector('{SEARCH_CONFIG}', {_concatenated_columns()})"
+
+
+@compiles(contact_search_document, "sqlite")
+def _sqlite_contact_search_document(element, compiler, **kw):
+    return f"lower({_concatenated_columns()})"
+
+
+class ts_match(FunctionElement):
+    """
+    `ts_match(document, query)` is true when the search document matches a web-search style query.
+    """
+    type = Boolean()
+    name = "ts_match"
+    inherit_cache = True
+
+
+@compiles(ts_match)
+def _pg_ts_match(element, compiler, **kw):
+    document, query = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"{document} @@ websearch_to_tsquery('{SEARCH_CONFIG}', {query})"
+
+
+@compiles(ts_match, "sqlite")
+def _sqlite_ts_match(element, compiler, **kw):
+    document, query = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"instr({document}, lower({query})) > 0"
+
+
+class ts_rank(FunctionElement):
+    """
+    `ts_rank(document, query)` scores how well the search document matches a query.
+    """
+    type = Float()
+    name = "ts_rank"
+    inherit_cache = True
+
+
+@compiles(ts_rank)
+def _pg_ts_rank(element, compiler, **kw):
+    document, query = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"ts_rank({document}, websearch_to_tsquery('{SEARCH_CONFIG}', {query}))"
+
+
+@compiles(ts_rank, "sqlite")
+def _sqlite_ts_rank(element, compiler, **kw):
+    return "0.0"
@@ -1,9 +1,14 @@
 from datetime import date, timedelta
-from typing import List, Optional
-from sqlalchemy import select, func, or_, and_
+from typing import Any, AsyncIterator, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import select, insert, update, delete, case, or_, and_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.db import READ_REPLICA
 from src.db.models import Contact
-from src.schemas import ContactModel
+from src.db.search import ts_match, ts_rank
+from src.schemas import ContactModel, ContactSelector
 
 
 class ContactRepository:
@@ -26,54 +31,169 @@ class ContactRepository:
         """
         self._db_session = session
 
+    SORT_COLUMNS = {
+        "id": Contact.id,
+        "first_name": Contact.first_name,
+        "last_name": Contact.last_name,
+        "created_at": Contact.created_at,
+    }
+
     async def get_contacts(
-        self, user_id: int, first_name: str, last_name: str, email: str, skip: int, limit: int
+        self,
+        user_id: int,
+        first_name: str,
+        last_name: str,
+        email: str,
+        skip: int,
+        limit: int,
+        sort_by: str = "id",
+        after: Optional[Tuple[Any, int]] = None,
+        replica: bool = True,
     ) -> List[Contact]:
         """
         Retrieve a list of contacts based on search criteria.
 
+        Contacts are ordered by `(sort_by, id)`. When `after` is given the page starts
+        right after that position (keyset pagination) and `skip` is ignored, so deep
+        pages cost the same as the first one.
+
         Args:
             user_id (int): Filter by user_id.
-            first_name (str): Filter by first name (substring match).
-            last_name (str): Filter by last name (substring match).
-            email (str): Filter by email (substring match).
+            first_name (str): Filter by first name (substring match). Ignored when empty.
+            last_name (str): Filter by last name (substring match). Ignored when empty.
+            email (str): Filter by email (substring match). Ignored when empty.
             skip (int): Number of records to skip for pagination.
             limit (int): Maximum number of records to retrieve.
+            sort_by (str): Field to order by, one of `SORT_COLUMNS`. Default is "id".
+            after (Optional[Tuple[Any, int]]): The `(sort_value, id)` of the last contact of the previous page.
+            replica (bool): Whether a read replica may answer. Pass `False` when the result is cached.
 
         Returns:
             List[Contact]: A list of contacts matching the search criteria.
         """
+        sort_column = self.SORT_COLUMNS[sort_by]
+        order_by = (Contact.id,) if sort_column is Contact.id else (sort_column, Contact.id)
+
+        query = select(Contact).where(Contact.user_id == user_id).order_by(*order_by).limit(limit)
+        # Only filled-in filters become predicates: an empty `LIKE '%%'` cannot use the
+        # trigram indexes and would make the planner fall back to a scan.
+        for column, value in (
+            (Contact.first_name, first_name),
+            (Contact.last_name, last_name),
+            (Contact.email, email),
+        ):
+            if value:
+                query = query.where(column.contains(value))
+        if after is None:
+            query = query.offset(skip)
+        elif sort_column is Contact.id:
+            query = query.where(Contact.id > after[1])
+        else:
+            query = query.where(
+                tuple_(sort_column, Contact.id) > tuple_(after[0], after[1])
+            )
+        result = await self._db_session.execute(query, bind_arguments=READ_REPLICA if replica else None)
+        return list(result.scalars().all())
+
+    async def search_contacts(
+        self,
+        user_id: int,
+        search_query: str,
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[float, int]] = None,
+        replica: bool = True,
+    ) -> List[Tuple[Contact, float]]:
+        """
+        Full-text search over a user's contacts, best matches first.
+
+        Matches the query against the stored `search_vector` document (names, email,
+        phone and info) in a single query, ordered by `ts_rank` and then by ID.
+
+        Args:
+            user_id (int): Filter by user_id.
+            search_query (str): Web-search style query, e.g. `john -smith`.
+            skip (int): Number of records to skip for pagination.
+            limit (int): Maximum number of records to retrieve.
+            after (Optional[Tuple[float, int]]): The `(rank, id)` of the last contact of the previous page.
+            replica (bool): Whether a read replica may answer. Pass `False` when the result is cached.
 
+        Returns:
+            List[Tuple[Contact, float]]: Matching contacts paired with their rank.
+        """
+        rank = ts_rank(Contact.search_vector, search_query)
         query = (
-            select(Contact)
+            select(Contact, rank)
             .where(Contact.user_id == user_id)
-            .where(Contact.first_name.contains(first_name))
-            .where(Contact.last_name.contains(last_name))
-            .where(Contact.email.contains(email))
-            .offset(skip)
+            .where(ts_match(Contact.search_vector, search_query))
+            .order_by(rank.desc(), Contact.id)
             .limit(limit)
         )
-        result = await self._db_session.execute(query)
-        return list(result.scalars().all())
+        if after is None:
+            query = query.offset(skip)
+        else:
+            last_rank, last_id = after
+            query = query.where(or_(rank < last_rank, and_(rank == last_rank, Contact.id > last_id)))
+        result = await self._db_session.execute(query, bind_arguments=READ_REPLICA if replica else None)
+        return [(contact, contact_rank) for contact, contact_rank in result.all()]
 
-    async def get_contact_by_id(self, user_id: int, contact_id: int) -> Optional[Contact]:
+    EXPORT_COLUMNS = (
+        Contact.id,
+        Contact.first_name,
+        Contact.last_name,
+        Contact.email,
+        Contact.phone_number,
+        Contact.birthday_date,
+        Contact.info,
+        Contact.created_at,
+        Contact.updated_at,
+    )
+
+    async def stream_contacts(self, user_id: int, batch_size: int = 1000) -> AsyncIterator[List[dict]]:
+        """
+        Stream all contacts of a user in batches through a server-side cursor.
+
+        Plain column rows are fetched instead of ORM objects, so at most one batch is held
+        in memory at a time regardless of how many contacts the user has.
+
+        Args:
+            user_id (int): The ID of the user.
+            batch_size (int): Number of rows fetched from the cursor at a time. Default is 1000.
+
+        Yields:
+            List[dict]: The next batch of contacts as `{column: value}` mappings, ordered by ID.
+        """
+        query = (
+            select(*self.EXPORT_COLUMNS)
+            .where(Contact.user_id == user_id)
+            .order_by(Contact.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self._db_session.stream(query, bind_arguments=READ_REPLICA)
+        async for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
+    async def get_contact_by_id(self, user_id: int, contact_id: int, replica: bool = True) -> Optional[Contact]:
         """
         Retrieve a contact by its ID.
 
         Args:
             user_id (int): The ID of the user.
             contact_id (int): The ID of the contact.
+            replica (bool): Whether a read replica may answer. Pass `False` before modifying the contact.
 
         Returns:
             Optional[Contact]: The contact if found, or `None` if not found.
         """
         query = select(Contact).filter_by(user_id=user_id, id=contact_id)
-        result = await self._db_session.execute(query)
+        result = await self._db_session.execute(query, bind_arguments=READ_REPLICA if replica else None)
         return result.scalar_one_or_none()
 
     async def create_contact(self, user_id: int, body: ContactModel) -> Contact:
         """
-        Create a new contact.
+        Create a new contact with a single `INSERT ... RETURNING` statement.
+
+        Uniqueness of email and phone number per user is enforced by the database.
 
         Args:
             user_id (int): The user ID.
@@ -81,11 +201,18 @@ class ContactRepository:
 
         Returns:
             Contact: The newly created contact.
+
+        Raises:
+            IntegrityError: If the user already has a contact with the same email or phone number.
         """
-        new_contact = Contact(**body.model_dump(exclude_unset=True), user_id=user_id)
-        self._db_session.add(new_contact)
-        await self._db_session.commit()
-        await self._db_session.refresh(new_contact)
+        stmt = insert(Contact).values(**body.model_dump(exclude_unset=True), user_id=user_id).returning(Contact)
+        try:
+            result = await self._db_session.execute(stmt)
+            new_contact = result.scalar_one()
+            await self._db_session.commit()
+        except IntegrityError:
+            await self._db_session.rollback()
+            raise
         return new_contact
 
     async def update_contact(self, user_id: int, contact_id: int, body: ContactModel) -> Optional[Contact]:
@@ -100,7 +227,7 @@ class ContactRepository:
         Returns:
             Optional[Contact]: The updated contact if it exists, or `None` if not found.
         """
-        contact = await self.get_contact_by_id(user_id, contact_id)
+        contact = await self.get_contact_by_id(user_id, contact_id, replica=False)
         if not contact:
             return None
         update_data = body.model_dump(exclude_unset=True)
@@ -120,12 +247,75 @@ class ContactRepository:
         Returns:
             Optional[Contact]: The deleted contact if it exists, or `None` if not found.
         """
-        contact = await self.get_contact_by_id(user_id, contact_id)
+        contact = await self.get_contact_by_id(user_id, contact_id, replica=False)
         if contact:
             await self._db_session.delete(contact)
             await self._db_session.commit()
         return contact
 
+    @staticmethod
+    def _selector_conditions(user_id: int, selector: ContactSelector) -> list:
+        """
+        Translate a bulk-operation selector into WHERE conditions scoped to the user.
+        """
+        conditions = [Contact.user_id == user_id]
+        if selector.ids:
+            conditions.append(Contact.id.in_(selector.ids))
+        for column, value in (
+            (Contact.first_name, selector.first_name),
+            (Contact.last_name, selector.last_name),
+            (Contact.email, selector.email),
+        ):
+            if value:
+                conditions.append(column.contains(value))
+        return conditions
+
+    async def update_contacts(self, user_id: int, selector: ContactSelector, changes: dict) -> List[int]:
+        """
+        Update all selected contacts with one `UPDATE ... RETURNING` statement.
+
+        Args:
+            user_id (int): The ID of the user.
+            selector (ContactSelector): Which contacts to update.
+            changes (dict): Column values to set.
+
+        Returns:
+            List[int]: IDs of the updated contacts.
+        """
+        stmt = (
+            update(Contact)
+            .where(*self._selector_conditions(user_id, selector))
+            .values(**changes)
+            .returning(Contact.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._db_session.execute(stmt)
+        ids = list(result.scalars().all())
+        await self._db_session.commit()
+        return ids
+
+    async def remove_contacts(self, user_id: int, selector: ContactSelector) -> List[int]:
+        """
+        Delete all selected contacts with one `DELETE ... RETURNING` statement.
+
+        Args:
+            user_id (int): The ID of the user.
+            selector (ContactSelector): Which contacts to delete.
+
+        Returns:
+            List[int]: IDs of the deleted contacts.
+        """
+        stmt = (
+            delete(Contact)
+            .where(*self._selector_conditions(user_id, selector))
+            .returning(Contact.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._db_session.execute(stmt)
+        ids = list(result.scalars().all())
+        await self._db_session.commit()
+        return ids
+
     async def does_contact_exist(self, user_id: int, email: str, phone_number: str) -> bool:
         """
         Check if a contact exists with the given email or phone number.
@@ -138,48 +328,97 @@ class ContactRepository:
         Returns:
             bool: `True` if the contact exists, otherwise `False`.
         """
-        query = select(Contact).filter_by(user_id=user_id).where(
+        query = select(Contact.id).filter_by(user_id=user_id).where(
             or_(Contact.email == email, Contact.phone_number == phone_number)
         )
+        result = await self._db_session.execute(query)
+        return result.scalars().first() is not None
 
-        try:
-            result = await self._db_session.execute(query)
-            return bool(result.scalars().first())
-        except Exception as e:
-            return False
+    async def find_existing_contacts(
+        self, user_id: int, emails: Iterable[str], phone_numbers: Iterable[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Find which of the given emails and phone numbers are already used by a user's contacts.
 
-    async def get_upcoming_birthdays(self, user_id: int, days: int) -> List[Contact]:
+        Args:
+            user_id (int): The ID of the user.
+            emails (Iterable[str]): Email addresses to check.
+            phone_numbers (Iterable[str]): Phone numbers to check.
+
+        Returns:
+            Tuple[Set[str], Set[str]]: The emails and the phone numbers that already exist.
+        """
+        emails, phone_numbers = list(emails), list(phone_numbers)
+        query = (
+            select(Contact.email, Contact.phone_number)
+            .where(Contact.user_id == user_id)
+            .where(or_(Contact.email.in_(emails), Contact.phone_number.in_(phone_numbers)))
+        )
+        result = await self._db_session.execute(query)
+        existing_emails, existing_phones = set(), set()
+        for email, phone_number in result.all():
+            existing_emails.add(email)
+            existing_phones.add(phone_number)
+        return existing_emails, existing_phones
+
+    async def insert_contacts(self, user_id: int, bodies: List[ContactModel]) -> Set[str]:
+        """
+        Insert many contacts with one multi-row `INSERT ... ON CONFLICT DO NOTHING`.
+
+        Rows hitting a unique constraint are skipped instead of failing the whole batch.
+
+        Args:
+            user_id (int): The ID of the user.
+            bodies (List[ContactModel]): The contacts to insert.
+
+        Returns:
+            Set[str]: Emails of the contacts that were actually inserted.
+        """
+        if not bodies:
+            return set()
+        insert = sqlite_insert if self._db_session.get_bind().dialect.name == "sqlite" else pg_insert
+        stmt = (
+            insert(Contact)
+            .values([{**body.model_dump(), "user_id": user_id} for body in bodies])
+            .on_conflict_do_nothing()
+            .returning(Contact.email)
+        )
+        result = await self._db_session.execute(stmt)
+        inserted = set(result.scalars().all())
+        await self._db_session.commit()
+        return inserted
+
+    async def get_upcoming_birthdays(self, user_id: int, days: int, replica: bool = True) -> List[Contact]:
         """
         Retrieve contacts with upcoming birthdays within a specified number of days.
 
+        Uses the stored `birthday_md` (month * 100 + day) column, so the lookup is a range
+        scan of the `(user_id, birthday_md)` index. Windows crossing New Year are split
+        into two ranges.
+
         Args:
             user_id (int): The ID of user.
             days (int): The number of days to look ahead for upcoming birthdays.
+            replica (bool): Whether a read replica may answer. Pass `False` when the result is cached.
 
         Returns:
-            List[Contact]: A list of contacts with upcoming birthdays.
+            List[Contact]: Contacts with upcoming birthdays, ordered by next occurrence.
         """
         today = date.today()
         end_date = today + timedelta(days=days)
+        today_md = today.month * 100 + today.day
+        end_md = end_date.month * 100 + end_date.day
 
-        query = (
-            select(Contact).filter_by(user_id=user_id)
-            .where(
-                or_(
-                    func.date_part("day", Contact.birthday_date).between(
-                        func.date_part("day", today), func.date_part("day", end_date)
-                    ),
-                    and_(
-                        func.date_part("day", end_date) < func.date_part("day", today),
-                        or_(
-                            func.date_part("day", Contact.birthday_date) >= func.date_part("day", today),
-                            func.date_part("day", Contact.birthday_date) <= func.date_part("day", end_date),
-                        ),
-                    ),
-                )
-            )
-            .order_by(func.date_part("day", Contact.birthday_date).asc())
+        query = select(Contact).filter_by(user_id=user_id)
+        if end_date.year == today.year:
+            query = query.where(Contact.birthday_md.between(today_md, end_md))
+        elif days < 365:
+            query = query.where(or_(Contact.birthday_md >= today_md, Contact.birthday_md <= end_md))
+        query = query.order_by(
+            case((Contact.birthday_md >= today_md, 0), else_=1),
+            Contact.birthday_md,
+            Contact.id,
         )
 
-        result = await self._db_session.execute(query)
+        result = await self._db_session.execute(query, bind_arguments=READ_REPLICA if replica else None)
         return list(result.scalars().all())
@@ -0,0 +1,168 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models import EmailOutbox
+
+
+class EmailOutboxRepository:
+    """
+    Repository class for the email outbox.
+
+    Rows are claimed by setting `next_attempt_at` to a lease expiry, so an email whose
+    worker died mid-batch becomes due again once the lease runs out.
+
+    Attributes:
+        db (AsyncSession): The database session used for executing queries.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the EmailOutboxRepository with a database session.
+
+        Args:
+            session (AsyncSession): The asynchronous database session.
+        """
+        self.db = session
+
+    async def enqueue(self, recipient: str, subject: str, template: str, context: dict, now: datetime) -> None:
+        """
+        Queue an email for delivery.
+
+        Args:
+            recipient (str): Email address of the recipient.
+            subject (str): Subject line.
+            template (str): Name of the mail template.
+            context (dict): JSON-serializable template variables.
+            now (datetime): Current time, naive UTC.
+        """
+        self.db.add(
+            EmailOutbox(
+                recipient=recipient,
+                subject=subject,
+                template=template,
+                context=context,
+                status="pending",
+                attempts=0,
+                next_attempt_at=now,
+                created_at=now,
+            )
+        )
+        await self.db.commit()
+
+    async def claim(self, limit: int, now: datetime, lease_until: datetime) -> List[EmailOutbox]:
+        """
+        Claim a batch of due emails for this worker.
+
+        Uses `FOR UPDATE SKIP LOCKED` on PostgreSQL, so concurrent workers claim disjoint batches.
+
+        Args:
+            limit (int): Maximum number of emails to claim.
+            now (datetime): Current time, naive UTC.
+            lease_until (datetime): When the claim expires if the worker does not report back.
+
+        Returns:
+            List[EmailOutbox]: The claimed emails, oldest first, with `attempts` already incremented.
+        """
+        due = (
+            select(EmailOutbox.id)
+            .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due.scalar_subquery()))
+            .values(attempts=EmailOutbox.attempts + 1, next_attempt_at=lease_until)
+            .returning(EmailOutbox)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        emails = sorted(result.scalars().all(), key=lambda email: email.id)
+        await self.db.commit()
+        return emails
+
+    async def mark_sent(self, ids: List[int], now: datetime) -> None:
+        """
+        Mark emails as delivered.
+
+        Args:
+            ids (List[int]): IDs of the delivered emails.
+            now (datetime): Delivery time, naive UTC.
+        """
+        if not ids:
+            return
+        stmt = (
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(ids))
+            .values(status="sent", sent_at=now, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+
+    async def mark_failed(self, email_id: int, error: str, next_attempt_at: datetime, give_up: bool) -> None:
+        """
+        Record a failed delivery attempt.
+
+        Args:
+            email_id (int): The email ID.
+            error (str): Description of the failure.
+            next_attempt_at (datetime): When to retry, naive UTC.
+            give_up (bool): Whether to stop retrying and mark the email as failed.
+        """
+        stmt = (
+            update(EmailOutbox)
+            .where(EmailOutbox.id == email_id)
+            .values(
+                status="failed" if give_up else "pending",
+                next_attempt_at=next_attempt_at,
+                last_error=error[:1000],
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+
+    async def purge_sent(self, sent_before: datetime, limit: int) -> int:
+        """
+        Delete a batch of emails delivered before a cutoff.
+
+        Args:
+            sent_before (datetime): Cutoff, naive UTC.
+            limit (int): Maximum number of emails to delete.
+
+        Returns:
+            int: Number of deleted emails.
+        """
+        batch = (
+            select(EmailOutbox.id)
+            .where(EmailOutbox.status == "sent", EmailOutbox.sent_at < sent_before)
+            .limit(limit)
+        )
+        stmt = (
+            delete(EmailOutbox)
+            .where(EmailOutbox.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        return result.rowcount
+
+    async def depth(self) -> dict:
+        """
+        Count queued and failed emails.
+
+        Returns:
+            dict: Number of emails per status, excluding delivered ones.
+        """
+        stmt = (
+            select(EmailOutbox.status, func.count())
+            .where(EmailOutbox.status.in_(("pending", "failed")))
+            .group_by(EmailOutbox.status)
+        )
+        counts = dict((await self.db.execute(stmt)).all())
+        return {"pending": counts.get("pending", 0), "failed": counts.get("failed", 0)}
@@ -0,0 +1,123 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models import RefreshToken
+
+
+class RefreshTokenRepository:
+    """
+    Repository class for storing and rotating refresh tokens.
+
+    Attributes:
+        db (AsyncSession): The database session used for executing queries.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the RefreshTokenRepository with a database session.
+
+        Args:
+            session (AsyncSession): The asynchronous database session.
+        """
+        self.db = session
+
+    async def create(
+        self, user_id: int, token_hash: str, family_id: str, created_at: datetime, expires_at: datetime
+    ) -> None:
+        """
+        Store a new refresh token.
+
+        Args:
+            user_id (int): The owner of the token.
+            token_hash (str): Hex SHA-256 digest of the token.
+            family_id (str): The rotation family of the token.
+            created_at (datetime): Issue time, naive UTC.
+            expires_at (datetime): Expiry time, naive UTC.
+        """
+        self.db.add(
+            RefreshToken(
+                user_id=user_id,
+                token_hash=token_hash,
+                family_id=family_id,
+                created_at=created_at,
+                expires_at=expires_at,
+            )
+        )
+        await self.db.commit()
+
+    async def consume(self, token_hash: str, now: datetime) -> Optional[RefreshToken]:
+        """
+        Atomically revoke a usable refresh token, so that only one caller can rotate it.
+
+        Args:
+            token_hash (str): Hex SHA-256 digest of the token.
+            now (datetime): Current time, naive UTC.
+
+        Returns:
+            Optional[RefreshToken]: The consumed token, or `None` if it is unknown, expired or already revoked.
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(revoked_at=now)
+            .returning(RefreshToken)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        token = result.scalar_one_or_none()
+        await self.db.commit()
+        return token
+
+    async def get_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        """
+        Retrieve a refresh token by its digest, whatever its state.
+
+        Args:
+            token_hash (str): Hex SHA-256 digest of the token.
+
+        Returns:
+            Optional[RefreshToken]: The token, or `None` if it is unknown.
+        """
+        result = await self.db.execute(select(RefreshToken).filter_by(token_hash=token_hash))
+        return result.scalar_one_or_none()
+
+    async def revoke_family(self, family_id: str, now: datetime) -> None:
+        """
+        Revoke all usable tokens of a rotation family.
+
+        Args:
+            family_id (str): The rotation family.
+            now (datetime): Current time, naive UTC.
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+
+    async def revoke_user(self, user_id: int, now: datetime) -> None:
+        """
+        Revoke all usable refresh tokens of a user.
+
+        Args:
+            user_id (int): The owner of the tokens.
+            now (datetime): Current time, naive UTC.
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
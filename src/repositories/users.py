@@ -1,5 +1,9 @@
-from sqlalchemy import select
+from typing import Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.db import READ_REPLICA
 from src.db.models import User
 from src.schemas import UserCreate
 
@@ -34,40 +38,44 @@ class UserRepository:
             User | None: The user object if found, or `None` if no user exists with the given ID.
         """
         stmt = select(User).filter_by(id=user_id)
-        user = await self.db.execute(stmt)
+        user = await self.db.execute(stmt, bind_arguments=READ_REPLICA)
         return user.scalar_one_or_none()
 
-    async def get_user_by_username(self, username: str) -> User | None:
+    async def get_user_by_username(self, username: str, replica: bool = True) -> User | None:
         """
         Retrieve a user by their username.
 
         Args:
             username (str): The username of the user to retrieve.
+            replica (bool): Whether a read replica may answer. Pass `False` when the user is cached.
 
         Returns:
             User | None: The user object if found, or `None` if no user exists with the given username.
         """
         stmt = select(User).filter_by(username=username)
-        user = await self.db.execute(stmt)
+        user = await self.db.execute(stmt, bind_arguments=READ_REPLICA if replica else None)
         return user.scalar_one_or_none()
 
-    async def get_user_by_email(self, email: str) -> User | None:
+    async def get_user_by_email(self, email: str, replica: bool = True) -> User | None:
         """
         Retrieve a user by their email address.
 
         Args:
             email (str): The email address of the user to retrieve.
+            replica (bool): Whether a read replica may answer. Pass `False` before modifying the user.
 
         Returns:
             User | None: The user object if found, or `None` if no user exists with the given email address.
         """
         stmt = select(User).filter_by(email=email)
-        user = await self.db.execute(stmt)
+        user = await self.db.execute(stmt, bind_arguments=READ_REPLICA if replica else None)
         return user.scalar_one_or_none()
 
     async def create_user(self, body: UserCreate, avatar: str = None) -> User:
         """
-        Create a new user.
+        Create a new user with a single INSERT.
+
+        Uniqueness of username and email is enforced by the database.
 
         Args:
             body (UserCreate): The data for the new user.
@@ -75,18 +83,29 @@ class UserRepository:
 
         Returns:
             User: The newly created user object.
+
+        Raises:
+            IntegrityError: If the username or email is already taken.
         """
-        user = User(
-            **body.model_dump(exclude_unset=True, exclude={"password"}),
-            hashed_password=body.password,
-            avatar=avatar
+        stmt = (
+            insert(User)
+            .values(
+                **body.model_dump(exclude_unset=True, exclude={"password"}),
+                hashed_password=body.password,
+                avatar=avatar,
+            )
+            .returning(User)
         )
-        self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        try:
+            result = await self.db.execute(stmt)
+            user = result.scalar_one()
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise
         return user
 
-    async def confirm_email(self, email: str) -> None:
+    async def confirm_email(self, email: str) -> User:
         """
         Confirm a user's email address.
 
@@ -94,11 +113,12 @@ class UserRepository:
             email (str): The email address to confirm.
 
         Returns:
-            None
+            User: The confirmed user.
         """
-        user = await self.get_user_by_email(email)
+        user = await self.get_user_by_email(email, replica=False)
         user.confirmed = True
         await self.db.commit()
+        return user
 
     async def update_avatar_url(self, email: str, url: str) -> User:
         """
@@ -111,8 +131,46 @@ class UserRepository:
         Returns:
             User: The updated user object with the new avatar URL.
         """
-        user = await self.get_user_by_email(email)
+        user = await self.get_user_by_email(email, replica=False)
         user.avatar = url
         await self.db.commit()
         await self.db.refresh(user)
-        return user
\ No newline at end of file
+        return user
+
+    async def set_default_avatar(self, user_id: int, url: str) -> Optional[str]:
+        """
+        Set the avatar URL of a user who has no avatar yet.
+
+        Args:
+            user_id (int): The user ID.
+            url (str): The avatar URL.
+
+        Returns:
+            Optional[str]: The username if the avatar was set, `None` if the user has an avatar or does not exist.
+        """
+        stmt = (
+            update(User)
+            .where(User.id == user_id, User.avatar.is_(None))
+            .values(avatar=url)
+            .returning(User.username)
+            .execution_options(synchronize_session=False)
+        )
+        username = (await self.db.execute(stmt)).scalar_one_or_none()
+        await self.db.commit()
+        return username
+
+    async def update_password(self, email: str, hashed_password: str) -> User:
+        """
+        Replace the password hash of a user.
+
+        Args:
+            email (str): The email address of the user.
+            hashed_password (str): The new password hash.
+
+        Returns:
+            User: The updated user object.
+        """
+        user = await self.get_user_by_email(email, replica=False)
+        user.hashed_password = hashed_password
+        await self.db.commit()
+        return user
@@ -1,6 +1,9 @@
 from datetime import date, datetime
-from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, field_validator, model_validator
+
+ContactSortField = Literal["id", "first_name", "last_name", "created_at"]
+"""Fields the contact list can be ordered by; each is backed by a `(user_id, field, id)` index."""
 
 
 class ContactModel(BaseModel):
@@ -39,6 +42,115 @@ class ContactResponse(ContactModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ContactSelector(BaseModel):
+    """
+    Selects the contacts a bulk operation applies to.
+
+    Contacts are selected by ID, by substring filters, or both (all given criteria must
+    match). At least one criterion is required so a bulk operation never hits every
+    contact by accident.
+
+    Attributes:
+        ids (Optional[List[int]]): Contact IDs, at most 1000.
+        first_name (Optional[str]): Substring of the first name.
+        last_name (Optional[str]): Substring of the last name.
+        email (Optional[str]): Substring of the email.
+    """
+    ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=1000)
+    first_name: Optional[str] = Field(default=None, min_length=1)
+    last_name: Optional[str] = Field(default=None, min_length=1)
+    email: Optional[str] = Field(default=None, min_length=1)
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not (self.ids or self.first_name or self.last_name or self.email):
+            raise ValueError("Provide contact ids or at least one filter")
+        return self
+
+
+class ContactPatch(BaseModel):
+    """
+    Fields that can be changed on many contacts at once.
+
+    Email and phone number are unique per contact and therefore cannot be bulk-updated.
+    First name, last name and birth date are required on a contact, so they may be
+    omitted but not set to null; only `info` can be cleared.
+
+    Attributes:
+        first_name (Optional[str]): New first name.
+        last_name (Optional[str]): New last name.
+        birthday_date (Optional[date]): New birth date.
+        info (Optional[str]): New additional information.
+    """
+    first_name: Optional[str] = Field(default=None, min_length=2, max_length=50)
+    last_name: Optional[str] = Field(default=None, min_length=2, max_length=50)
+    birthday_date: Optional[date] = None
+    info: Optional[str] = Field(default=None, max_length=500)
+
+    @field_validator("first_name", "last_name", "birthday_date")
+    @classmethod
+    def check_not_null(cls, value):
+        if value is None:
+            raise ValueError("Field cannot be null")
+        return value
+
+
+class ContactBulkUpdate(ContactSelector):
+    """
+    Represents a bulk update request: which contacts to change and how.
+
+    Attributes:
+        changes (ContactPatch): The fields to set; only fields present in the request are changed.
+    """
+    changes: ContactPatch
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        if not self.changes.model_fields_set:
+            raise ValueError("Provide at least one field to change")
+        return self
+
+
+class ContactBulkResult(BaseModel):
+    """
+    Represents the outcome of a bulk update or delete.
+
+    Attributes:
+        affected (int): Number of contacts changed or deleted.
+        ids (List[int]): IDs of the affected contacts.
+    """
+    affected: int
+    ids: List[int]
+
+ContactFileFormat = Literal["csv", "ndjson"]
+"""File formats supported by contact import and export."""
+
+
+class ContactImportError(BaseModel):
+    """
+    Represents a row of an imported file that was not stored.
+
+    Attributes:
+        row (int): 1-based number of the data row in the file (the CSV header is not counted).
+        errors (List[str]): Why the row was rejected.
+    """
+    row: int
+    errors: List[str]
+
+
+class ContactImportReport(BaseModel):
+    """
+    Represents the outcome of a bulk contact import.
+
+    Attributes:
+        imported (int): Number of contacts that were created.
+        failed (int): Number of rows that were rejected.
+        errors (List[ContactImportError]): Per-row details for every rejected row.
+    """
+    imported: int = 0
+    failed: int = 0
+    errors: List[ContactImportError] = []
+
 class User(BaseModel):
     """
     Represents the user model for API responses.
@@ -47,12 +159,12 @@ class User(BaseModel):
         id (int): The unique identifier of the user.
         username (str): The username of the user.
         email (str): The email address of the user.
-        avatar (str): The URL of the user's avatar.
+        avatar (Optional[str]): The URL of the user's avatar, `None` until the default avatar is resolved.
     """
     id: int
     username: str
     email: EmailStr = Field(min_length=7, max_length=80)
-    avatar: str
+    avatar: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -78,9 +190,21 @@ class Token(BaseModel):
     Attributes:
         access_token (str): The access token for the user.
         token_type (str): The type of the token (e.g., "bearer").
+        refresh_token (Optional[str]): Single-use token for `/auth/refresh`. Default is None.
     """
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    """
+    Represents a request to exchange a refresh token for new tokens.
+
+    Attributes:
+        refresh_token (str): The refresh token returned by login or a previous refresh.
+    """
+    refresh_token: str
 
 
 class RequestEmail(BaseModel):
@@ -1,27 +1,36 @@
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import JWTError, jwt
+from jose import JWTError
 
-from src.db.db import get_db
+from src.db.db import get_db, stick_to
 from src.conf.config import config
 from src.services.users import UserService
 from src.db.models import User, Role
-import json
 from src.conf.redis_client import redis_client
-from src.utils import model_to_dict
+from src.services.cache import TTLCache, user_cache
+from src.services.jwt_keys import key_ring
+from src.services.revocation import token_denylist
+from src.services.hashing import (
+    hashing_pool, hash_password, pwd_context, verify_password, verify_and_update_password
+)
 
 
 class Hash:
     """
     A utility class for hashing and verifying passwords using bcrypt.
+
+    The synchronous methods block for the full bcrypt cost; request handlers should use
+    the `*_async` variants, which run in the bounded `hashing_pool`.
     """
 
-    _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    _pwd_context = pwd_context
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
@@ -60,6 +69,53 @@ class Hash:
         """
         return self._pwd_context.hash(password)
 
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password in the hashing pool without blocking the event loop.
+
+        Args:
+            plain_password (str): The plain-text password.
+            hashed_password (str): The hashed password.
+
+        Returns:
+            bool: True if the password matches, False otherwise.
+
+        Raises:
+            HTTPException: 503 if the hashing pool is saturated.
+        """
+        return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """
+        Hash a password in the hashing pool without blocking the event loop.
+
+        Args:
+            password (str): Plain password
+
+        Returns:
+            str: Hashed password
+
+        Raises:
+            HTTPException: 503 if the hashing pool is saturated.
+        """
+        return await hashing_pool.run(hash_password, password)
+
+    async def verify_and_update_async(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password in the hashing pool and produce a new hash if the stored one is outdated.
+
+        Args:
+            plain_password (str): The plain-text password.
+            hashed_password (str): The hashed password.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Whether the password matches, and a replacement hash if one is needed.
+
+        Raises:
+            HTTPException: 503 if the hashing pool is saturated.
+        """
+        return await hashing_pool.run(verify_and_update_password, plain_password, hashed_password)
+
 
 # OAuth2 configuration for token validation
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -67,7 +123,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 async def create_access_token(data: dict, expires_delta: Optional[int] = None) -> str:
     """
-    Create a new JWT access token.
+    Create a new JWT access token with a unique `jti` so it can be revoked.
 
     Args:
         data (dict): The data to encode into the token.
@@ -82,8 +138,44 @@ async def create_access_token(data: dict, expires_delta: Optional[int] = None) -
         if expires_delta
         else timedelta(minutes=config.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+    to_encode.update({"jti": uuid.uuid4().hex, "iat": datetime.now(timezone.utc), "exp": expire})
+    return key_ring.encode(to_encode)
+
+
+claims_cache = TTLCache(config.JWT_CLAIMS_CACHE_SIZE, config.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+"""
+In-process cache of verified access token claims, keyed by the SHA-256 digest of the token.
+"""
+
+
+async def decode_access_token(token: str) -> dict:
+    """
+    Verify an access token and return its claims, reusing claims of tokens verified before.
+
+    A token seen before is answered from `claims_cache` without checking the signature or
+    parsing JSON again. Entries expire at the token's `exp`, so expired tokens are never
+    accepted from the cache. The returned dict is shared; treat it as read-only.
+
+    Args:
+        token (str): The encoded JWT.
+
+    Returns:
+        dict: The token claims.
+
+    Raises:
+        JWTError: If the token is invalid or expired.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = claims_cache.get(digest)
+    if claims is not None:
+        return claims
+    claims = await key_ring.decode(token)
+    ttl = claims_cache.ttl
+    if "exp" in claims:
+        ttl = min(ttl, claims["exp"] - time.time())
+    if ttl > 0:
+        claims_cache.set(digest, claims, ttl=ttl)
+    return claims
 
 
 async def get_current_user(
@@ -92,6 +184,9 @@ async def get_current_user(
     """
     Retrieve the currently authenticated user from the access token.
 
+    Revoked tokens are rejected; see `TokenDenylist`. The session is tagged with the
+    username so the user reads their own writes when replicas are used; see `stick_to`.
+
     Args:
         token (str): The JWT token provided via OAuth2 scheme.
         db (AsyncSession): The database session.
@@ -109,26 +204,72 @@ async def get_current_user(
     )
 
     try:
-        payload = jwt.decode(token, config.JWT_SECRET_KEY, algorithms=[config.JWT_ALGORITHM])
+        payload = await decode_access_token(token)
         username = payload.get("sub")
         if not username:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+    if await token_denylist.is_revoked(payload):
+        raise credentials_exception
+    stick_to(db, username)
 
-    cached_user = await redis_client.get(f"user:{username}")
+    cached_user = await user_cache.get(username)
     if cached_user:
-        return User(**json.loads(cached_user))
+        return cached_user
 
     user_service = UserService(db)
-    user = await user_service.get_user_by_username(username)
+    # The user is cached for all workers, so it must not come from a lagging replica.
+    user = await user_service.get_user_by_username(username, replica=False)
     if not user:
         raise credentials_exception
 
-    await redis_client.set(f"user:{username}", json.dumps(model_to_dict(user, exclude=["password"])), ex=3600)
+    await user_cache.set(user)
     return user
 
 
+async def decode_revocable_token(token: str) -> dict:
+    """
+    Verify an access token that is about to be revoked, e.g. on logout.
+
+    Args:
+        token (str): The encoded JWT.
+
+    Returns:
+        dict: The token claims.
+
+    Raises:
+        HTTPException: 401 if the token is invalid, 400 if it has no `jti` or `exp` claim.
+    """
+    try:
+        claims = await decode_access_token(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Unable to validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if "jti" not in claims or "exp" not in claims:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token cannot be revoked",
+        )
+    return claims
+
+
+async def revoke_access_token(claims: dict) -> None:
+    """
+    Revoke an access token for the rest of its lifetime.
+
+    Args:
+        claims (dict): The claims returned by `decode_revocable_token`.
+
+    Raises:
+        HTTPException: 503 if the revocation store is unavailable.
+    """
+    await token_denylist.revoke_token(claims)
+
+
 def create_email_token(data: dict) -> str:
     """
     Create a new JWT token for email verification.
@@ -142,7 +283,7 @@ def create_email_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(days=config.MAIL_TOKEN_EXP_DAYS)
     to_encode.update({"iat": datetime.now(timezone.utc), "exp": expire})
-    return jwt.encode(to_encode, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+    return key_ring.encode(to_encode)
 
 
 async def get_email_from_token(token: str) -> str:
@@ -159,7 +300,7 @@ async def get_email_from_token(token: str) -> str:
         HTTPException: If the token is invalid or the email address cannot be decoded.
     """
     try:
-        payload = jwt.decode(token, config.JWT_SECRET_KEY, algorithms=[config.JWT_ALGORITHM])
+        payload = await key_ring.decode(token)
         email = payload.get("sub")
         if not email:
             raise ValueError("Email not found in token payload")
@@ -185,9 +326,7 @@ async def get_password_from_token(token: str) -> str:
         HTTPException: Wrong token
     """
     try:
-        payload = jwt.decode(
-            token, config.JWT_SECRET_KEY, algorithms=[config.JWT_ALGORITHM]
-        )
+        payload = await key_ring.decode(token)
         password = payload["password"]
         return password
     except JWTError as e:
@@ -0,0 +1,138 @@
+"""
+Server-side avatar thumbnails.
+
+An uploaded image is decoded once, cropped to a square and scaled down to every size in
+`AVATAR_SIZES`, each encoded as WebP and JPEG. Rendering is CPU-bound and runs in a
+dedicated thread pool (Pillow releases the GIL while resizing and encoding).
+"""
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Sequence
+
+from fastapi import HTTPException, status
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from src.conf.config import config
+
+FORMATS = {"webp": ("WEBP", "image/webp"), "jpg": ("JPEG", "image/jpeg")}
+"""Variant file extension to Pillow format and content type."""
+
+
+def content_type_for(name: str) -> str:
+    """
+    Content type of a variant file name such as "128.webp".
+
+    Args:
+        name (str): The variant file name.
+
+    Returns:
+        str: The content type.
+    """
+    return FORMATS[name.rsplit(".", 1)[1]][1]
+
+
+def render_variants(
+    data: bytes, sizes: Sequence[int], quality: int, max_pixels: Optional[int] = None
+) -> Dict[str, bytes]:
+    """
+    Decode an image once and encode square variants of every size.
+
+    The pixel count is checked against the header before anything is decoded.
+
+    Args:
+        data (bytes): The uploaded image.
+        sizes (Sequence[int]): Edge lengths of the variants in pixels.
+        quality (int): Encoder quality (1-100).
+        max_pixels (Optional[int]): Largest accepted width times height. Defaults to `AVATAR_MAX_PIXELS`.
+
+    Returns:
+        Dict[str, bytes]: Encoded variants keyed by file name, e.g. "128.webp".
+
+    Raises:
+        PIL.UnidentifiedImageError: If the data is not a decodable image.
+        PIL.Image.DecompressionBombError: If the image has more than `max_pixels` pixels.
+    """
+    sizes = sorted(set(sizes), reverse=True)
+    max_pixels = max_pixels or config.AVATAR_MAX_PIXELS
+    with Image.open(io.BytesIO(data)) as img:
+        if img.width * img.height > max_pixels:
+            raise Image.DecompressionBombError(f"Image has {img.width * img.height} pixels, limit is {max_pixels}")
+        # Let the JPEG decoder downscale by a power of two while decoding.
+        img.draft("RGB", (sizes[0], sizes[0]))
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+
+    side = min(img.size)
+    img = ImageOps.fit(img, (min(side, sizes[0]),) * 2, Image.Resampling.LANCZOS)
+
+    variants = {}
+    for size in sizes:
+        if img.width > size:
+            img = img.resize((size, size), Image.Resampling.LANCZOS)
+        flat = img
+        if img.mode == "RGBA":
+            flat = Image.new("RGB", img.size, (255, 255, 255))
+            flat.paste(img, mask=img.getchannel("A"))
+        for ext, (fmt, _) in FORMATS.items():
+            buffer = io.BytesIO()
+            (img if fmt == "WEBP" else flat).save(buffer, fmt, quality=quality, optimize=fmt == "JPEG")
+            variants[f"{size}.{ext}"] = buffer.getvalue()
+    return variants
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+async def render_avatar(data: bytes) -> Dict[str, bytes]:
+    """
+    Render the configured avatar variants in the image pool.
+
+    Args:
+        data (bytes): The uploaded image.
+
+    Returns:
+        Dict[str, bytes]: Encoded variants keyed by file name.
+
+    Raises:
+        HTTPException: 415 if the image cannot be decoded, 413 if its dimensions are too large.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=config.AVATAR_POOL_WORKERS, thread_name_prefix="avatars")
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _executor, render_variants, data, config.AVATAR_SIZES, config.AVATAR_QUALITY, config.AVATAR_MAX_PIXELS
+        )
+    except Image.DecompressionBombError:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Image dimensions are too large")
+    except (UnidentifiedImageError, OSError):
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="File is not a valid image")
+
+
+def shutdown() -> None:
+    """
+    Shut down the image pool.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def manifest(digest: str, urls: Dict[str, str]) -> dict:
+    """
+    Build the variant manifest `User.avatar` points to.
+
+    Args:
+        digest (str): Hex SHA-256 of the original upload.
+        urls (Dict[str, str]): Variant URLs keyed by file name.
+
+    Returns:
+        dict: `{"hash": ..., "variants": {"<size>": {"webp": url, "jpg": url}}}`.
+    """
+    variants: Dict[str, Dict[str, str]] = {}
+    for name, url in urls.items():
+        size, ext = name.split(".", 1)
+        variants.setdefault(size, {})[ext] = url
+    return {"hash": digest, "variants": dict(sorted(variants.items(), key=lambda item: int(item[0])))}
@@ -1,13 +1,375 @@
-# from aiocache import caches
-#
-# caches.set_config({
-#     "default": {
-#         "cache": "aiocache.RedisCache",
-#         "endpoint": "localhost",
-#         "port": 6379,
-#         "timeout": 10,
-#         "serializer": {
-#             "class": "aiocache.serializers.PickleSerializer"
-#         },
-#     }
-# })
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Set
+
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.conf.redis_client import redis_client
+from src.db.models import User
+from src.utils import model_to_dict
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache whose entries also expire after a time-to-live.
+
+    Not shared between worker processes; use it only in front of a shared store or for
+    data that is safe to keep per process.
+
+    Attributes:
+        maxsize (int): Maximum number of entries; the least recently used entry is evicted first.
+        ttl (float): Default lifetime of an entry in seconds.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that found nothing or an expired entry.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the TTLCache.
+
+        Args:
+            maxsize (int): Maximum number of entries.
+            ttl (float): Default lifetime of an entry in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a live entry and mark it as recently used.
+
+        Args:
+            key (Hashable): The entry key.
+            default (Any): Value returned on a miss.
+
+        Returns:
+            Any: The cached value, or `default`.
+        """
+        item = self._data.get(key)
+        if item is None or item[0] <= time.monotonic():
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store an entry, evicting the least recently used one when full.
+
+        Args:
+            key (Hashable): The entry key.
+            value (Any): The value to store.
+            ttl (Optional[float]): Lifetime of this entry in seconds. Defaults to `ttl`.
+        """
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Remove an entry if present.
+
+        Args:
+            key (Hashable): The entry key.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """
+        Report size and hit ratio.
+
+        Returns:
+            dict: Current size, capacity, hit and miss counts and the hit ratio.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ContactCache:
+    """
+    Read-through Redis cache for contact queries with a versioned namespace per user.
+
+    Every cached payload lives under `contacts:{user_id}:v{version}:{shape}`. Writes bump
+    the user's version instead of deleting keys, so stale payloads are never read again
+    and simply expire. Redis errors are logged and treated as cache misses.
+
+    A version bump that fails is kept as pending and retried before the next cache access
+    of this process; until it succeeds, this process bypasses the cache for that user.
+    Other processes may serve the old payloads until the retry succeeds, and at most for
+    `CONTACTS_CACHE_TTL` if the process exits first.
+
+    Attributes:
+        _redis: The asynchronous Redis client.
+        _ttl (int): Lifetime of cached payloads in seconds.
+    """
+
+    def __init__(self, redis=redis_client, ttl: int = config.CONTACTS_CACHE_TTL):
+        """
+        Initialize the ContactCache.
+
+        Args:
+            redis: The asynchronous Redis client. Defaults to the shared client.
+            ttl (int): Lifetime of cached payloads in seconds.
+        """
+        self._redis = redis
+        self._ttl = ttl
+        self._pending: Set[int] = set()
+
+    @staticmethod
+    def _version_key(user_id: int) -> str:
+        return f"contacts:{user_id}:version"
+
+    @staticmethod
+    def shape(*parts: Any) -> str:
+        """
+        Build a compact key for a query shape from its parameters.
+
+        Args:
+            *parts: The query name and all parameters that affect its result.
+
+        Returns:
+            str: A digest identifying the query shape.
+        """
+        return hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()
+
+    async def version(self, user_id: int) -> Optional[str]:
+        """
+        Get the current namespace version of a user.
+
+        A missing version is initialized from the clock rather than to zero, so an evicted
+        version key can never bring back payloads cached under an older version.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            Optional[str]: The version, or `None` if Redis is unavailable or an invalidation
+            of the user is still pending.
+        """
+        if self._pending:
+            await self._bump_pending()
+            if user_id in self._pending:
+                return None
+        try:
+            version = await self._redis.get(self._version_key(user_id))
+            if version is None:
+                await self._redis.set(self._version_key(user_id), time.time_ns(), nx=True)
+                version = await self._redis.get(self._version_key(user_id))
+            return version
+        except RedisError as e:
+            logger.warning("Contact cache unavailable: %s", e)
+            return None
+
+    async def get(self, user_id: int, version: Optional[str], shape: str) -> Optional[Any]:
+        """
+        Read a cached payload.
+
+        Args:
+            user_id (int): The ID of the user.
+            version (Optional[str]): The namespace version from `version()`.
+            shape (str): The query shape from `shape()`.
+
+        Returns:
+            Optional[Any]: The decoded payload, or `None` on a miss.
+        """
+        if version is None:
+            return None
+        try:
+            payload = await self._redis.get(f"contacts:{user_id}:v{version}:{shape}")
+        except RedisError as e:
+            logger.warning("Contact cache read failed: %s", e)
+            return None
+        return json.loads(payload) if payload is not None else None
+
+    async def set(self, user_id: int, version: Optional[str], shape: str, payload: Any) -> None:
+        """
+        Store a payload under the namespace version that was read before querying the database.
+
+        If a write bumped the version in the meantime, the payload lands in the old namespace
+        and is never served.
+
+        Args:
+            user_id (int): The ID of the user.
+            version (Optional[str]): The namespace version from `version()`.
+            shape (str): The query shape from `shape()`.
+            payload (Any): JSON-serializable payload.
+        """
+        if version is None:
+            return
+        try:
+            await self._redis.set(f"contacts:{user_id}:v{version}:{shape}", json.dumps(payload), ex=self._ttl)
+        except RedisError as e:
+            logger.warning("Contact cache write failed: %s", e)
+
+    async def invalidate(self, user_id: int) -> None:
+        """
+        Drop all cached payloads of a user by bumping the namespace version.
+
+        A missing version key is seeded from the clock before the increment, as in
+        `version()`; a bare `INCR` would restart it at 1 and could reuse an old version.
+
+        If Redis is unavailable, the bump stays pending and is retried, see the class docstring.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+        self._pending.add(user_id)
+        await self._bump_pending()
+
+    async def _bump_pending(self) -> None:
+        user_ids = set(self._pending)
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                for user_id in user_ids:
+                    pipe.set(self._version_key(user_id), time.time_ns(), nx=True)
+                    pipe.incr(self._version_key(user_id))
+                await pipe.execute()
+        except RedisError as e:
+            logger.error("Contact cache invalidation failed for users %s: %s", sorted(user_ids), e)
+            return
+        self._pending -= user_ids
+
+
+class UserCache:
+    """
+    Two-tier cache of authenticated users: an in-process `TTLCache` in front of Redis.
+
+    Changes to a user are announced on a Redis pub/sub channel so every worker drops its
+    local copy. Local entries also expire after a short TTL, which bounds staleness if an
+    invalidation message is missed.
+
+    Attributes:
+        CHANNEL (str): Redis pub/sub channel carrying usernames to invalidate.
+        local (TTLCache): The in-process tier.
+    """
+
+    CHANNEL = "user-invalidations"
+
+    def __init__(self, redis=redis_client, ttl: int = 3600):
+        """
+        Initialize the UserCache.
+
+        Args:
+            redis: The asynchronous Redis client. Defaults to the shared client.
+            ttl (int): Lifetime of the Redis entries in seconds.
+        """
+        self._redis = redis
+        self._ttl = ttl
+        self.local = TTLCache(config.USER_CACHE_LOCAL_SIZE, config.USER_CACHE_LOCAL_TTL)
+
+    @staticmethod
+    def _key(username: str) -> str:
+        return f"user:{username}"
+
+    async def get(self, username: str) -> Optional[User]:
+        """
+        Get a cached user, trying the in-process tier first and Redis second.
+
+        The returned `User` is detached and shared between requests; treat it as read-only.
+
+        Args:
+            username (str): The username.
+
+        Returns:
+            Optional[User]: The cached user, or `None` on a miss.
+        """
+        user = self.local.get(username)
+        if user is not None:
+            return user
+        try:
+            cached_user = await self._redis.get(self._key(username))
+        except RedisError as e:
+            logger.warning("User cache unavailable: %s", e)
+            return None
+        if not cached_user:
+            return None
+        user = User(**json.loads(cached_user))
+        self.local.set(username, user)
+        return user
+
+    async def set(self, user: User) -> None:
+        """
+        Cache a user in both tiers.
+
+        Args:
+            user (User): The user loaded from the database.
+        """
+        data = model_to_dict(user, exclude=["password"])
+        try:
+            await self._redis.set(self._key(user.username), json.dumps(data), ex=self._ttl)
+        except RedisError as e:
+            logger.warning("User cache write failed: %s", e)
+        self.local.set(user.username, User(**data))
+
+    async def invalidate(self, username: str) -> None:
+        """
+        Drop a user from Redis and from the in-process tier of every worker.
+
+        Args:
+            username (str): The username.
+        """
+        self.local.pop(username)
+        try:
+            await self._redis.delete(self._key(username))
+            await self._redis.publish(self.CHANNEL, username)
+        except RedisError as e:
+            logger.error("User cache invalidation failed for %s: %s", username, e)
+
+    async def listen(self) -> None:
+        """
+        Evict local entries named on the invalidation channel until cancelled.
+
+        The local tier is cleared after every (re)subscription, since messages sent while
+        disconnected are lost.
+        """
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    self.local.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.local.pop(message["data"])
+            except RedisError as e:
+                logger.warning("User invalidation listener disconnected: %s", e)
+                await asyncio.sleep(1)
+
+
+contact_cache = ContactCache()
+"""
+Global contact cache; shared so that pending invalidations outlive the request.
+"""
+
+user_cache = UserCache()
+"""
+Global user cache shared by authentication and user services.
+"""
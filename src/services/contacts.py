@@ -1,8 +1,139 @@
+import csv
+import io
+import json
+import math
+from datetime import date, datetime
+from typing import (
+    Any, AsyncIterator, Awaitable, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+)
+
 from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.repositories.contacts import ContactRepository
-from src.schemas import ContactModel
+from src.services.cache import ContactCache, contact_cache
+from src.schemas import (
+    ContactModel, ContactResponse, ContactImportError, ContactImportReport,
+    ContactSelector, ContactBulkUpdate, ContactBulkResult,
+)
+from src.utils import decode_cursor, encode_cursor
+
+
+IMPORT_CHUNK_SIZE = 1000
+"""Number of rows validated, deduplicated and inserted per database round-trip during import."""
+
+EXPORT_BATCH_SIZE = 1000
+"""Number of rows fetched from the server-side cursor per batch during export."""
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_after(cursor: str, key: str, value_type: type) -> Tuple[Any, int]:
+    """
+    Decode a pagination cursor and check its values before they reach a query.
+
+    Args:
+        cursor (str): The opaque cursor.
+        key (str): The ordering the cursor must belong to.
+        value_type (type): Python type of the ordering value: `int`, `str`, `float`, `date` or `datetime`.
+
+    Returns:
+        Tuple[Any, int]: The ordering value converted to `value_type`, and the contact ID.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed, was issued for another ordering or holds values of the wrong type.
+    """
+    try:
+        value, contact_id = decode_cursor(cursor, key)
+        if type(contact_id) is not int:
+            raise ValueError("Cursor ID is not an integer")
+        if value_type in (date, datetime):
+            if not isinstance(value, str):
+                raise ValueError("Cursor value is not an ISO date")
+            value = value_type.fromisoformat(value)
+            if isinstance(value, datetime) and value.tzinfo is not None:
+                raise ValueError("Cursor value has a time zone")
+        elif value_type is float:
+            if type(value) not in (int, float) or not math.isfinite(value):
+                raise ValueError("Cursor value is not a number")
+            value = float(value)
+        elif type(value) is not value_type:
+            raise ValueError(f"Cursor value is not of type {value_type.__name__}")
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor."
+        )
+    return value, contact_id
+
+
+def _read_csv_rows(file: BinaryIO) -> Iterator[Tuple[int, Union[Dict, str]]]:
+    """
+    Lazily read an uploaded CSV file whose header row names `ContactModel` fields.
+
+    A row that is not valid UTF-8 or cannot be parsed is reported with its line number
+    and skipped; reading continues with the next row.
+
+    Yields:
+        Tuple[int, Union[Dict, str]]: The row number and its fields, or a parse error message.
+    """
+    undecodable = set()
+
+    def lines() -> Iterator[str]:
+        for line_number, line in enumerate(file, start=1):
+            try:
+                yield line.decode("utf-8-sig" if line_number == 1 else "utf-8")
+            except UnicodeDecodeError:
+                undecodable.add(line_number)
+                yield line.decode("utf-8", errors="replace")
+
+    reader = csv.DictReader(lines())
+    row_number = 0
+    while True:
+        first_line = reader.line_num + 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            row_number += 1
+            yield row_number, f"Unreadable CSV at line {first_line}: {e}"
+            continue
+        row_number += 1
+        bad_lines = sorted(n for n in undecodable if first_line <= n <= reader.line_num)
+        if bad_lines:
+            yield row_number, f"Line {bad_lines[0]} is not valid UTF-8"
+            continue
+        yield row_number, {key: value for key, value in row.items() if key and value not in ("", None)}
+
+
+def _read_ndjson_rows(file: BinaryIO) -> Iterator[Tuple[int, Union[Dict, str]]]:
+    """
+    Lazily read an uploaded newline-delimited JSON file, one contact object per line.
+
+    Yields:
+        Tuple[int, Union[Dict, str]]: The row number and its fields, or a parse error message.
+    """
+    row_number = 0
+    for line in file:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield row_number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, "Expected a JSON object"
+            continue
+        yield row_number, row
 
 
 class ContactService:
@@ -12,18 +143,48 @@ class ContactService:
     This class provides a higher-level interface for working with contacts,
     leveraging the `ContactRepository` for database interactions.
 
+    Reads are served through a per-user Redis cache; every write through this service
+    invalidates the user's cached reads.
+
     Attributes:
         _repository (ContactRepository): Repository for performing database operations on contacts.
+        _cache (ContactCache): Read-through cache for contact queries.
     """
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, cache: Optional[ContactCache] = None):
         """
         Initialize the ContactService with a database session.
 
         Args:
             db (AsyncSession): The asynchronous database session.
+            cache (Optional[ContactCache]): Cache for contact reads. Defaults to the shared `contact_cache`.
         """
         self._repository = ContactRepository(db)
+        self._cache = cache or contact_cache
+
+    async def _read_through(self, user_id: int, shape_parts: tuple, load: Callable[[bool], Awaitable[Any]]) -> Any:
+        """
+        Return the cached payload for a query shape, or build it with `load` and cache it.
+
+        `load(replica)` may only read from a replica when the result is not going to be
+        cached. Read-your-writes is tracked per process, so another worker could otherwise
+        store rows from a lagging replica under the version a write has just bumped.
+        """
+        version = await self._cache.version(user_id)
+        shape = ContactCache.shape(*shape_parts)
+        payload = await self._cache.get(user_id, version, shape)
+        if payload is None:
+            payload = await load(version is None)
+            await self._cache.set(user_id, version, shape, payload)
+        return payload
+
+    @staticmethod
+    def _dump(contacts: Iterable) -> List[dict]:
+        return [ContactResponse.model_validate(contact).model_dump(mode="json") for contact in contacts]
+
+    @staticmethod
+    def _restore(payload: List[dict]) -> List[ContactResponse]:
+        return [ContactResponse.model_validate(item) for item in payload]
 
     async def create_contact(self, user_id: int, data: ContactModel):
         """
@@ -39,16 +200,124 @@ class ContactService:
         Raises:
             HTTPException: If a contact with the same email or phone number already exists.
         """
-        existing_contact = await self._repository.does_contact_exist(user_id, data.email, data.phone_number)
-        if existing_contact:
+        try:
+            contact = await self._repository.create_contact(user_id, data)
+        except IntegrityError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Contact with email '{data.email}' or phone '{data.phone_number}' already exists."
             )
-        return await self._repository.create_contact(user_id, data)
+        await self._cache.invalidate(user_id)
+        return contact
+
+    async def import_contacts(self, user_id: int, file: BinaryIO, file_format: str) -> ContactImportReport:
+        """
+        Import contacts from an uploaded CSV or NDJSON file.
+
+        Rows are read lazily and handled in chunks of `IMPORT_CHUNK_SIZE`: each chunk is
+        validated against `ContactModel`, checked for existing emails and phone numbers
+        with one query and written with one multi-row insert.
+
+        Args:
+            user_id (int): The ID of the user.
+            file (BinaryIO): The uploaded file.
+            file_format (str): Either "csv" or "ndjson".
+
+        Returns:
+            ContactImportReport: Number of imported contacts and an error entry for every rejected row.
+        """
+        rows = _read_csv_rows(file) if file_format == "csv" else _read_ndjson_rows(file)
+        report = ContactImportReport()
+        chunk: List[Tuple[int, ContactModel]] = []
+        for row_number, row in rows:
+            if isinstance(row, str):
+                report.errors.append(ContactImportError(row=row_number, errors=[row]))
+                continue
+            try:
+                chunk.append((row_number, ContactModel.model_validate(row)))
+            except ValidationError as e:
+                report.errors.append(ContactImportError(
+                    row=row_number,
+                    errors=[f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()],
+                ))
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                await self._import_chunk(user_id, chunk, report)
+                chunk = []
+        await self._import_chunk(user_id, chunk, report)
+        if report.imported:
+            await self._cache.invalidate(user_id)
+        report.errors.sort(key=lambda error: error.row)
+        report.failed = len(report.errors)
+        return report
+
+    async def _import_chunk(
+        self, user_id: int, chunk: List[Tuple[int, ContactModel]], report: ContactImportReport
+    ) -> None:
+        """
+        Deduplicate and insert one chunk of validated import rows, recording the outcome in `report`.
+        """
+        if not chunk:
+            return
+        existing_emails, existing_phones = await self._repository.find_existing_contacts(
+            user_id, {body.email for _, body in chunk}, {body.phone_number for _, body in chunk}
+        )
+        to_insert: List[Tuple[int, ContactModel]] = []
+        for row_number, body in chunk:
+            if body.email in existing_emails or body.phone_number in existing_phones:
+                report.errors.append(ContactImportError(
+                    row=row_number,
+                    errors=[f"Contact with email '{body.email}' or phone '{body.phone_number}' already exists."],
+                ))
+                continue
+            existing_emails.add(body.email)
+            existing_phones.add(body.phone_number)
+            to_insert.append((row_number, body))
+
+        inserted = await self._repository.insert_contacts(user_id, [body for _, body in to_insert])
+        report.imported += len(inserted)
+        for row_number, body in to_insert:
+            if body.email not in inserted:
+                report.errors.append(ContactImportError(
+                    row=row_number,
+                    errors=[f"Contact with email '{body.email}' or phone '{body.phone_number}' already exists."],
+                ))
+
+    async def export_contacts(self, user_id: int, file_format: str) -> AsyncIterator[str]:
+        """
+        Serialize all contacts of a user as CSV or NDJSON, one batch at a time.
+
+        Args:
+            user_id (int): The ID of the user.
+            file_format (str): Either "csv" or "ndjson".
+
+        Yields:
+            str: The next piece of the export file.
+        """
+        fields = [column.key for column in ContactRepository.EXPORT_COLUMNS]
+        if file_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=fields, lineterminator="\n")
+            writer.writeheader()
+            yield buffer.getvalue()
+        async for batch in self._repository.stream_contacts(user_id, batch_size=EXPORT_BATCH_SIZE):
+            if file_format == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(batch)
+                yield buffer.getvalue()
+            else:
+                yield "".join(json.dumps(row, default=_json_default) + "\n" for row in batch)
 
     async def list_contacts(
-        self, user_id: int, first_name: str = "", last_name: str = "", email: str = "", skip: int = 0, limit: int = 100
+        self,
+        user_id: int,
+        first_name: str = "",
+        last_name: str = "",
+        email: str = "",
+        skip: int = 0,
+        limit: int = 100,
+        sort_by: str = "id",
+        cursor: Optional[str] = None,
     ):
         """
         Retrieve a list of contacts with optional filters.
@@ -60,12 +329,81 @@ class ContactService:
             email (str): Filter by email (substring match). Default is "".
             skip (int): Number of records to skip for pagination. Default is 0.
             limit (int): Maximum number of records to return. Default is 100.
+            sort_by (str): Field to order contacts by. Default is "id".
+            cursor (Optional[str]): Opaque cursor returned for the previous page. Overrides `skip`.
 
         Returns:
-            List[Contact]: A list of contacts matching the filters.
+            List[ContactResponse]: A list of contacts matching the filters.
+
+        Raises:
+            HTTPException: If the cursor is malformed, was issued for another ordering or holds invalid values.
         """
+        after = None
+        if cursor:
+            after = _decode_after(cursor, sort_by, ContactRepository.SORT_COLUMNS[sort_by].type.python_type)
         filters = {"user_id": user_id, "first_name": first_name, "last_name": last_name, "email": email}
-        return await self._repository.get_contacts(**filters, skip=skip, limit=limit)
+
+        async def load(replica: bool):
+            return self._dump(await self._repository.get_contacts(
+                **filters, skip=skip, limit=limit, sort_by=sort_by, after=after, replica=replica
+            ))
+
+        shape = ("list", first_name, last_name, email, skip, limit, sort_by, cursor)
+        return self._restore(await self._read_through(user_id, shape, load))
+
+    @staticmethod
+    def next_cursor(contacts: list, limit: int, sort_by: str = "id") -> Optional[str]:
+        """
+        Build the cursor pointing right after the last contact of a page.
+
+        Args:
+            contacts (list): The contacts of the current page.
+            limit (int): The page size that was requested.
+            sort_by (str): Field the page was ordered by. Default is "id".
+
+        Returns:
+            Optional[str]: The cursor for the next page, or `None` if this was the last page.
+        """
+        if not contacts or len(contacts) < limit:
+            return None
+        last = contacts[-1]
+        return encode_cursor(sort_by, getattr(last, sort_by), last.id)
+
+    async def search_contacts(
+        self, user_id: int, search_query: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[ContactResponse], Optional[str]]:
+        """
+        Full-text search over a user's contacts, best matches first.
+
+        Args:
+            user_id (int): The ID of the user.
+            search_query (str): Web-search style query.
+            skip (int): Number of records to skip for pagination. Default is 0.
+            limit (int): Maximum number of records to return. Default is 100.
+            cursor (Optional[str]): Opaque cursor returned for the previous page. Overrides `skip`.
+
+        Returns:
+            Tuple[List[ContactResponse], Optional[str]]: The matching contacts and the cursor of the next page, if any.
+
+        Raises:
+            HTTPException: If the cursor is malformed, was not issued by a search or holds invalid values.
+        """
+        after = None
+        if cursor:
+            after = _decode_after(cursor, "rank", float)
+
+        async def load(replica: bool):
+            rows = await self._repository.search_contacts(
+                user_id, search_query, skip=skip, limit=limit, after=after, replica=replica
+            )
+            next_cursor = None
+            if rows and len(rows) == limit:
+                last_contact, last_rank = rows[-1]
+                next_cursor = encode_cursor("rank", last_rank, last_contact.id)
+            return {"contacts": self._dump(contact for contact, _ in rows), "next_cursor": next_cursor}
+
+        payload = await self._read_through(user_id, ("search", search_query, skip, limit, cursor), load)
+        return self._restore(payload["contacts"]), payload["next_cursor"]
 
     async def retrieve_contact(self, user_id: int,  contact_id: int):
         """
@@ -76,18 +414,22 @@ class ContactService:
             contact_id (int): The ID of the contact to retrieve.
 
         Returns:
-            Contact: The retrieved contact.
+            ContactResponse: The retrieved contact.
 
         Raises:
             HTTPException: If no contact exists with the given ID.
         """
-        contact = await self._repository.get_contact_by_id(user_id, contact_id)
-        if not contact:
+        async def load(replica: bool):
+            contact = await self._repository.get_contact_by_id(user_id, contact_id, replica=replica)
+            return self._dump([contact] if contact else [])
+
+        contacts = self._restore(await self._read_through(user_id, ("contact", contact_id), load))
+        if not contacts:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Contact with ID {contact_id} not found."
             )
-        return contact
+        return contacts[0]
 
     async def modify_contact(self, user_id: int, contact_id: int, data: ContactModel):
         """
@@ -110,6 +452,7 @@ class ContactService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Unable to update contact with ID {contact_id}. It may not exist."
             )
+        await self._cache.invalidate(user_id)
         return updated_contact
 
     async def delete_contact(self, user_id: int, contact_id: int):
@@ -132,8 +475,42 @@ class ContactService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Unable to delete contact with ID {contact_id}. It may not exist."
             )
+        await self._cache.invalidate(user_id)
         return deleted_contact
 
+    async def bulk_update_contacts(self, user_id: int, body: ContactBulkUpdate) -> ContactBulkResult:
+        """
+        Apply the same changes to many contacts in a single statement.
+
+        Args:
+            user_id (int): The ID of the user.
+            body (ContactBulkUpdate): The contacts to update and the changes to apply.
+
+        Returns:
+            ContactBulkResult: The number and IDs of the updated contacts.
+        """
+        changes = body.changes.model_dump(exclude_unset=True)
+        ids = await self._repository.update_contacts(user_id, body, changes)
+        if ids:
+            await self._cache.invalidate(user_id)
+        return ContactBulkResult(affected=len(ids), ids=ids)
+
+    async def bulk_delete_contacts(self, user_id: int, selector: ContactSelector) -> ContactBulkResult:
+        """
+        Delete many contacts in a single statement.
+
+        Args:
+            user_id (int): The ID of the user.
+            selector (ContactSelector): The contacts to delete.
+
+        Returns:
+            ContactBulkResult: The number and IDs of the deleted contacts.
+        """
+        ids = await self._repository.remove_contacts(user_id, selector)
+        if ids:
+            await self._cache.invalidate(user_id)
+        return ContactBulkResult(affected=len(ids), ids=ids)
+
     async def list_upcoming_birthdays(self, user_id: int, days: int):
         """
         Retrieve a list of contacts with upcoming birthdays within a specified number of days.
@@ -143,6 +520,10 @@ class ContactService:
             days (int): The number of days to look ahead for upcoming birthdays.
 
         Returns:
-            List[Contact]: A list of contacts with upcoming birthdays.
+            List[ContactResponse]: A list of contacts with upcoming birthdays.
         """
-        return await self._repository.get_upcoming_birthdays(user_id, days)
+        async def load(replica: bool):
+            return self._dump(await self._repository.get_upcoming_birthdays(user_id, days, replica=replica))
+
+        shape = ("birthdays", date.today(), days)
+        return self._restore(await self._read_through(user_id, shape, load))
@@ -1,12 +1,18 @@
 import logging
+from email.message import EmailMessage
+from email.utils import formataddr
 from pathlib import Path
+from typing import Dict
 
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from fastapi_mail.errors import ConnectionErrors
+from fastapi_mail import ConnectionConfig
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 from pydantic import EmailStr
 
+from src.db.db import sessionmanager
+from src.repositories.email_outbox import EmailOutboxRepository
 from src.services.auth import create_email_token
 from src.conf.config import config
+from src.utils import utcnow
 
 # Configure logging
 logging.basicConfig(
@@ -30,18 +36,116 @@ conf = ConnectionConfig(
     TEMPLATE_FOLDER=Path(__file__).parent.parent / "mail-templates",
 )
 """
-Global email configuration for FastMail.
+Global email configuration.
 
-This configuration is used to send emails with the specified settings, such as 
-email server, port, authentication, and template folder.
+This configuration holds the email server, port, authentication and template folder
+used by the email sender worker (`python -m src.workers.email_sender`).
 """
 
 
+class TemplateRegistry:
+    """
+    Mail templates compiled once and rendered through one shared Jinja environment.
+
+    fastapi-mail builds a new environment for every `FastMail` instance, so each email
+    re-read and re-parsed its template. The registry compiles every template in the folder
+    up front (`load`) and keeps the compiled templates for the life of the process.
+    Variables are HTML-escaped.
+
+    Attributes:
+        env (Environment): The shared Jinja environment.
+    """
+
+    def __init__(self, folder: Path):
+        """
+        Initialize the TemplateRegistry.
+
+        Args:
+            folder (Path): Directory of the mail templates.
+        """
+        self.env = Environment(
+            loader=FileSystemLoader(folder),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False,
+            cache_size=-1,
+        )
+        self._templates: Dict[str, Template] = {}
+
+    def load(self) -> None:
+        """
+        Compile all templates of the folder.
+        """
+        for name in self.env.list_templates(extensions=["html"]):
+            self._templates[name] = self.env.get_template(name)
+
+    def render(self, name: str, context: dict) -> str:
+        """
+        Render a template, compiling it first if `load` has not seen it.
+
+        Args:
+            name (str): Template file name, e.g. "verify_email.html".
+            context (dict): Template variables.
+
+        Returns:
+            str: The rendered HTML.
+
+        Raises:
+            TemplateNotFound: If there is no such template.
+        """
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.env.get_template(name)
+        return template.render(context)
+
+
+mail_templates = TemplateRegistry(conf.TEMPLATE_FOLDER)
+"""
+Global registry of mail templates, loaded at worker startup.
+"""
+
+
+async def enqueue_email(recipient: str, subject: str, template: str, context: dict) -> None:
+    """
+    Queue an email in the outbox for the email sender worker.
+
+    Runs as a background task after the response is sent, so it opens its own session.
+
+    Args:
+        recipient (str): Email address of the recipient.
+        subject (str): Subject line.
+        template (str): Name of the template in the mail templates folder.
+        context (dict): JSON-serializable template variables.
+    """
+    async with sessionmanager.session() as session:
+        await EmailOutboxRepository(session).enqueue(recipient, subject, template, context, utcnow())
+
+
+def build_message(recipient: str, subject: str, template: str, context: dict) -> EmailMessage:
+    """
+    Render an outbox email into a MIME message.
+
+    Args:
+        recipient (str): Email address of the recipient.
+        subject (str): Subject line.
+        template (str): Name of the template in the mail templates folder.
+        context (dict): Template variables.
+
+    Returns:
+        EmailMessage: The message, ready to be sent over SMTP.
+    """
+    message = EmailMessage()
+    message["From"] = formataddr((config.MAIL_FROM_NAME, config.MAIL_FROM))
+    message["To"] = recipient
+    message["Subject"] = subject
+    message.set_content(mail_templates.render(template, context), subtype="html")
+    return message
+
+
 async def send_reset_password_email(
     to_email: EmailStr, username: str, host: str, reset_token: str
 ) -> None:
     """
-    Send a reset password email to the user.
+    Queue a reset password email to the user.
 
     Args:
         to_email (EmailStr): Email of the user.
@@ -51,32 +155,22 @@ async def send_reset_password_email(
 
     Returns:
         None
-
-    Raises:
-        ConnectionErrors: If there is an error sending the email.
     """
-    try:
-        reset_link = f"{host}api/auth/confirm_reset_password/{reset_token}"
-
-        message = MessageSchema(
-            subject="Important: Update your account information",
-            recipients=[to_email],
-            template_body={"reset_link": reset_link, "username": username},
-            subtype=MessageType.html,
-        )
-
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="reset_password.html")
-    except ConnectionErrors as err:
-        logger.error("A connection error occurred: %s", err)
+    reset_link = f"{host}api/auth/confirm_reset_password/{reset_token}"
+    await enqueue_email(
+        to_email,
+        "Important: Update your account information",
+        "reset_password.html",
+        {"reset_link": reset_link, "username": username},
+    )
 
 
 async def send_email_confirmation(email: EmailStr, username: str, host: str) -> None:
     """
-    Send an email to a user for email verification.
+    Queue an email to a user for email verification.
 
-    This function creates a verification token, formats an email message using a 
-    template, and sends the email to the specified recipient.
+    This function creates a verification token and queues an email that the email
+    sender worker renders from a template and delivers.
 
     Args:
         email (EmailStr): The recipient's email address.
@@ -85,27 +179,13 @@ async def send_email_confirmation(email: EmailStr, username: str, host: str) ->
 
     Returns:
         None
-
-    Raises:
-        ConnectionErrors: If there is an error connecting to the email server.
     """
-    try:
-        # Generate the email verification token
-        token_verification = create_email_token({"sub": email})
-
-        # Define the email message
-        message = MessageSchema(
-            subject="Confirm your email",
-            recipients=[email],
-            template_body={
-                "host": host,
-                "username": username,
-                "token": token_verification,
-            },
-            subtype=MessageType.html,
-        )
-
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="verify_email.html")
-    except ConnectionErrors as err:
-        logger.error("A connection error occurred: %s", err)
\ No newline at end of file
+    # Generate the email verification token
+    token_verification = create_email_token({"sub": email})
+
+    await enqueue_email(
+        email,
+        "Confirm your email",
+        "verify_email.html",
+        {"host": host, "username": username, "token": token_verification},
+    )
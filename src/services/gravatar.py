@@ -0,0 +1,53 @@
+"""
+Default avatars from Gravatar.
+
+Registration stores users without an avatar; `fill_default_avatar` runs afterwards as a
+background task and sets the Gravatar URL unless the user has uploaded an avatar in the
+meantime. The URL is derived from the email address locally, without a request to
+Gravatar, so it is not cached.
+"""
+import logging
+from typing import Callable
+
+from libgravatar import Gravatar
+
+from src.db.db import sessionmanager
+from src.repositories.users import UserRepository
+from src.services.cache import user_cache
+
+logger = logging.getLogger(__name__)
+
+
+def gravatar_url(email: str) -> str:
+    """
+    Resolve the Gravatar image URL of an email address.
+
+    Args:
+        email (str): The email address.
+
+    Returns:
+        str: The image URL.
+    """
+    return Gravatar(email).get_image()
+
+
+async def fill_default_avatar(user_id: int, email: str, session_factory: Callable = sessionmanager.session) -> None:
+    """
+    Set a new user's avatar to their Gravatar if they have none yet.
+
+    Errors are logged and leave the avatar empty.
+
+    Args:
+        user_id (int): The user ID.
+        email (str): The user's email address.
+        session_factory (Callable): Factory of database sessions.
+    """
+    try:
+        url = gravatar_url(email)
+        async with session_factory() as session:
+            username = await UserRepository(session).set_default_avatar(user_id, url)
+    except Exception as e:
+        logger.error("Resolving the default avatar of user %s failed: %s", user_id, e)
+        return
+    if username is not None:
+        await user_cache.invalidate(username)
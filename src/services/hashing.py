@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import math
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from src.conf.config import config
+
+logger = logging.getLogger(__name__)
+
+MIN_BCRYPT_ROUNDS = 10
+MAX_BCRYPT_ROUNDS = 16
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+"""
+Password hashing policy shared by the web workers and the hashing pool.
+
+Stored hashes whose bcrypt cost is below the current policy are reported by
+`needs_update` and are rehashed on the next successful login. Stronger hashes are kept,
+so workers that calibrated to different costs only ever upgrade hashes, never downgrade them.
+"""
+
+
+def measure_hash_seconds(rounds: int, samples: int = 3) -> float:
+    """
+    Measure the median time of one bcrypt hash at the given cost on this machine.
+
+    Args:
+        rounds (int): The bcrypt cost factor (log2 of the iteration count).
+        samples (int): Number of timed hashes.
+
+    Returns:
+        float: Median seconds per hash.
+    """
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.hash("calibration-password")
+        timings.append(time.perf_counter() - started)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate_bcrypt_rounds(target_ms: float) -> int:
+    """
+    Pick the bcrypt cost whose verification time is closest to a target on this machine.
+
+    Each extra round doubles the cost, so one measurement at the minimum cost is enough
+    to extrapolate. The result is clamped to [`MIN_BCRYPT_ROUNDS`, `MAX_BCRYPT_ROUNDS`].
+
+    Args:
+        target_ms (float): Desired time of one hash or verification in milliseconds.
+
+    Returns:
+        int: The bcrypt cost factor.
+    """
+    base_ms = measure_hash_seconds(MIN_BCRYPT_ROUNDS) * 1000
+    rounds = MIN_BCRYPT_ROUNDS + round(math.log2(max(target_ms / base_ms, 1e-9)))
+    return max(MIN_BCRYPT_ROUNDS, min(MAX_BCRYPT_ROUNDS, rounds))
+
+
+def configure_hashing(rounds: Optional[int] = None, target_ms: float = 250) -> int:
+    """
+    Apply the bcrypt cost to the shared hashing policy.
+
+    Uses `rounds` when given, otherwise calibrates for `target_ms`. Called once at startup,
+    before the hashing pool starts its workers. Calibration runs per worker and is noisy
+    near a rounding boundary, so production deployments should pin `HASH_BCRYPT_ROUNDS`
+    (e.g. to a value measured once with `python -m benchmarks.hashing`).
+
+    The cost is also the policy minimum: only hashes with fewer rounds need an update.
+
+    Args:
+        rounds (Optional[int]): Fixed bcrypt cost factor.
+        target_ms (float): Target verification latency used for calibration.
+
+    Returns:
+        int: The bcrypt cost factor in use.
+    """
+    if rounds is None:
+        rounds = calibrate_bcrypt_rounds(target_ms)
+        logger.info("Calibrated bcrypt cost to %s rounds for a %s ms target", rounds, target_ms)
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+    return rounds
+
+
+def bcrypt_rounds() -> int:
+    """
+    Get the bcrypt cost factor new hashes are created with.
+
+    Returns:
+        int: The bcrypt cost factor.
+    """
+    return pwd_context.handler("bcrypt").default_rounds
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a plain-text password against a hash. Blocking; run it in `hashing_pool`.
+
+    Args:
+        plain_password (str): The plain-text password.
+        hashed_password (str): The stored hash.
+
+    Returns:
+        bool: True if the password matches, False otherwise.
+    """
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored hash uses an outdated policy. Blocking.
+
+    Args:
+        plain_password (str): The plain-text password.
+        hashed_password (str): The stored hash.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password matches, and a replacement hash if one is needed.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a plain-text password. Blocking; run it in `hashing_pool`.
+
+    Args:
+        password (str): The plain-text password.
+
+    Returns:
+        str: The hashed password.
+    """
+    return pwd_context.hash(password)
+
+
+class HashingPool:
+    """
+    Bounded executor for CPU-heavy password hashing.
+
+    Hashing runs off the event loop in a thread or process pool. When more calls are
+    waiting than the pool and its queue allow, new calls fail fast with 503 instead of
+    piling up, so a login burst cannot starve the rest of the worker.
+
+    Attributes:
+        workers (int): Number of threads or processes hashing in parallel.
+        max_queue (int): Number of calls allowed to wait for a free worker.
+        kind (str): "thread" or "process".
+        rejected (int): Number of calls refused because the pool was saturated.
+    """
+
+    def __init__(self, workers: int, max_queue: int, kind: str = "thread"):
+        """
+        Initialize the HashingPool. The executor is created on first use.
+
+        Args:
+            workers (int): Number of threads or processes hashing in parallel.
+            max_queue (int): Number of calls allowed to wait for a free worker.
+            kind (str): "thread" (bcrypt releases the GIL) or "process".
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self.kind = kind
+        self.rejected = 0
+        self._pending = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hashing")
+        return self._executor
+
+    async def run(self, func: Callable, *args):
+        """
+        Run a blocking hashing function in the pool.
+
+        Args:
+            func (Callable): A module-level function (picklable for process pools).
+            *args: Arguments for `func`.
+
+        Returns:
+            The result of `func`.
+
+        Raises:
+            HTTPException: 503 if the pool and its queue are full.
+        """
+        if self._pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            logger.warning("Hashing pool saturated, rejecting request")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy. Try again later.",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        """
+        Report pool usage.
+
+        Returns:
+            dict: Current bcrypt cost, pool kind and size, calls in flight or queued, the capacity and rejected calls.
+        """
+        return {
+            "bcrypt_rounds": bcrypt_rounds(),
+            "kind": self.kind,
+            "workers": self.workers,
+            "pending": self._pending,
+            "capacity": self.workers + self.max_queue,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """
+        Stop the executor, waiting for running calls to finish.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(config.HASH_POOL_WORKERS, config.HASH_POOL_MAX_QUEUE, config.HASH_POOL_KIND)
+"""
+Global hashing pool used by the authentication endpoints.
+"""
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+
+from src.conf.config import config
+from src.utils import utcnow
+
+logger = logging.getLogger(__name__)
+
+JWKS_MIN_REFETCH_SECONDS = 10
+"""Minimum interval between JWKS fetches triggered by unknown key IDs."""
+
+
+class KeyRing:
+    """
+    Signing and verification keys for JWTs, identified by key ID (`kid`).
+
+    With asymmetric keys (RS256 or ES256), every `<kid>.pem` private key in the keys
+    directory verifies tokens and is published in the JWKS document; only the active key
+    signs. Rotating means adding a new key, making it active once the JWKS has propagated,
+    and deleting the old key after the longest token lifetime.
+
+    A verifier without private keys can instead load public keys from another instance's
+    JWKS URL. Keys are kept in-process, refreshed after `jwks_ttl`, and fetched early
+    when an unknown `kid` shows up (at most every `JWKS_MIN_REFETCH_SECONDS`).
+
+    Tokens without a `kid` header are verified with the shared HMAC secret in HS256
+    deployments. Once asymmetric keys are configured, such tokens are rejected unless
+    `accept_legacy_hmac` is set to bridge the switch, optionally until `legacy_hmac_until`;
+    otherwise anyone holding the shared secret could still mint accepted tokens.
+
+    Attributes:
+        algorithm (str): Signing algorithm of the key ring.
+        active_kid (Optional[str]): Key ID used for signing, or `None` for HMAC signing.
+        jwks_max_age (int): Seconds clients may cache the published JWKS document.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret: Optional[str] = None,
+        keys_dir: Optional[str] = None,
+        active_kid: Optional[str] = None,
+        jwks_url: Optional[str] = None,
+        jwks_ttl: float = 300,
+        accept_legacy_hmac: bool = False,
+        legacy_hmac_until: Optional[datetime] = None,
+    ):
+        """
+        Initialize the KeyRing.
+
+        Args:
+            algorithm (str): "HS256" for a shared secret, or "RS256"/"ES256" for key pairs.
+            secret (Optional[str]): Shared HMAC secret for tokens without a `kid`.
+            keys_dir (Optional[str]): Directory of `<kid>.pem` private keys.
+            active_kid (Optional[str]): Key ID to sign with. Defaults to the last key ID in sort order.
+            jwks_url (Optional[str]): JWKS document to load public keys from.
+            jwks_ttl (float): Seconds before fetched public keys are refreshed.
+            accept_legacy_hmac (bool): Accept HMAC tokens without a `kid` alongside asymmetric keys.
+            legacy_hmac_until (Optional[datetime]): Stop accepting them after this time. Naive values are UTC.
+        """
+        self.algorithm = algorithm
+        self._secret = secret
+        self._hmac_algorithm = algorithm if algorithm.startswith("HS") else "HS256"
+        self._signing_keys: Dict[str, Key] = {}
+        self._local_keys: Dict[str, Key] = {}
+        self._remote_keys: Dict[str, Key] = {}
+        self._jwks_url = jwks_url
+        self._jwks_ttl = jwks_ttl
+        self.jwks_max_age = int(jwks_ttl)
+        self._jwks_fetched_at: Optional[float] = None
+        self._jwks_lock = asyncio.Lock()
+        self._accept_legacy_hmac = accept_legacy_hmac
+        if legacy_hmac_until is not None and legacy_hmac_until.tzinfo is not None:
+            legacy_hmac_until = legacy_hmac_until.astimezone(timezone.utc).replace(tzinfo=None)
+        self._legacy_hmac_until = legacy_hmac_until
+
+        if keys_dir:
+            for path in sorted(Path(keys_dir).glob("*.pem")):
+                key = jwk.construct(path.read_text(), algorithm)
+                self._signing_keys[path.stem] = key
+                self._local_keys[path.stem] = key.public_key()
+        self.active_kid = active_kid or (list(self._signing_keys)[-1] if self._signing_keys else None)
+        if self.active_kid is not None and self.active_kid not in self._signing_keys:
+            raise ValueError(f"Active signing key {self.active_kid!r} not found in {keys_dir}")
+
+    def encode(self, claims: dict) -> str:
+        """
+        Sign claims with the active key, or with the shared secret if there is none.
+
+        Args:
+            claims (dict): The token claims.
+
+        Returns:
+            str: The encoded JWT.
+        """
+        if self.active_kid is None:
+            return jwt.encode(claims, self._secret, algorithm=self._hmac_algorithm)
+        return jwt.encode(
+            claims, self._signing_keys[self.active_kid], algorithm=self.algorithm, headers={"kid": self.active_kid}
+        )
+
+    async def decode(self, token: str) -> dict:
+        """
+        Verify a token with the key named in its header and return its claims.
+
+        Args:
+            token (str): The encoded JWT.
+
+        Returns:
+            dict: The token claims.
+
+        Raises:
+            JWTError: If the token is malformed, expired, signed with an unknown key or has a bad signature.
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            if self._secret is None or not self._accepts_hmac():
+                raise JWTError("Token has no key ID")
+            return jwt.decode(token, self._secret, algorithms=[self._hmac_algorithm])
+        key = await self._get_key(kid)
+        if key is None:
+            raise JWTError("Unknown signing key")
+        return jwt.decode(token, key, algorithms=[self.algorithm])
+
+    def _accepts_hmac(self) -> bool:
+        if not self._signing_keys and self._jwks_url is None:
+            return True
+        if not self._accept_legacy_hmac:
+            return False
+        return self._legacy_hmac_until is None or utcnow() < self._legacy_hmac_until
+
+    async def _get_key(self, kid: str) -> Optional[Key]:
+        key = self._local_keys.get(kid)
+        if key is not None or self._jwks_url is None:
+            return key
+        age = None if self._jwks_fetched_at is None else time.monotonic() - self._jwks_fetched_at
+        if age is None or age >= self._jwks_ttl or (kid not in self._remote_keys and age >= JWKS_MIN_REFETCH_SECONDS):
+            await self.refresh()
+        return self._remote_keys.get(kid)
+
+    async def refresh(self) -> None:
+        """
+        Load public keys from the JWKS URL. Concurrent callers share a single fetch.
+
+        Fetch errors are logged and keep the previously loaded keys.
+        """
+        seen = self._jwks_fetched_at
+        async with self._jwks_lock:
+            if self._jwks_fetched_at != seen:
+                return
+            self._jwks_fetched_at = time.monotonic()
+            try:
+                async with httpx.AsyncClient(timeout=5) as client:
+                    response = await client.get(self._jwks_url)
+                    response.raise_for_status()
+                keys = {
+                    data["kid"]: jwk.construct(data, data.get("alg", self.algorithm))
+                    for data in response.json()["keys"]
+                }
+            except (httpx.HTTPError, JWTError, KeyError, ValueError) as e:
+                logger.warning("Failed to load JWKS from %s: %s", self._jwks_url, e)
+                return
+            self._remote_keys = keys
+
+    def jwks(self) -> dict:
+        """
+        Build the public JWKS document of the local keys.
+
+        Returns:
+            dict: `{"keys": [...]}` with one public JWK per key ID.
+        """
+        return {
+            "keys": [
+                {**key.to_dict(), "kid": kid, "alg": self.algorithm, "use": "sig"}
+                for kid, key in self._local_keys.items()
+            ]
+        }
+
+
+key_ring = KeyRing(
+    algorithm=config.JWT_ALGORITHM,
+    secret=config.JWT_SECRET_KEY,
+    keys_dir=config.JWT_KEYS_DIR,
+    active_kid=config.JWT_ACTIVE_KID,
+    jwks_url=config.JWT_JWKS_URL,
+    jwks_ttl=config.JWT_JWKS_CACHE_SECONDS,
+    accept_legacy_hmac=config.JWT_ACCEPT_LEGACY_HS256,
+    legacy_hmac_until=config.JWT_LEGACY_HS256_UNTIL,
+)
+"""
+Global key ring used to sign and verify access and email tokens.
+"""
@@ -0,0 +1,201 @@
+"""
+Mail transports used by the email sender worker.
+
+`MAIL_TRANSPORT=smtp` (the default) delivers through `MAIL_SERVER`. `MAIL_TRANSPORT=sink`
+starts an in-process SMTP server that accepts and counts every message, so the whole
+pipeline, SMTP included, can be exercised and load-tested without a mail provider.
+"""
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+import aiosmtplib
+
+from src.conf.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPTransport:
+    """
+    A long-lived SMTP connection reused across messages and batches.
+
+    The connection is opened on first use and reopened once if the server has dropped
+    it in the meantime (e.g. after an idle timeout).
+    """
+
+    def __init__(self, **connect_kwargs):
+        """
+        Initialize the SMTPTransport.
+
+        Args:
+            **connect_kwargs: Arguments for `aiosmtplib.SMTP`, e.g. hostname, port, use_tls, username, password.
+        """
+        self._connect_kwargs = connect_kwargs
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+
+    @classmethod
+    def from_config(cls) -> "SMTPTransport":
+        """
+        Create a transport for the configured mail server.
+
+        Returns:
+            SMTPTransport: The transport.
+        """
+        kwargs = {
+            "hostname": config.MAIL_SERVER,
+            "port": config.MAIL_PORT,
+            "use_tls": config.MAIL_SSL_TLS,
+            "start_tls": config.MAIL_STARTTLS,
+            "validate_certs": config.VALIDATE_CERTS,
+        }
+        if config.USE_CREDENTIALS:
+            kwargs.update(username=config.MAIL_USERNAME, password=config.MAIL_PASSWORD)
+        return cls(**kwargs)
+
+    async def _ensure_connected(self) -> aiosmtplib.SMTP:
+        if self._smtp is None or not self._smtp.is_connected:
+            self._smtp = aiosmtplib.SMTP(**self._connect_kwargs)
+            await self._smtp.connect()
+        return self._smtp
+
+    async def send(self, message) -> None:
+        """
+        Send a message, reconnecting once if the connection was lost.
+
+        Args:
+            message (EmailMessage): The message.
+
+        Raises:
+            aiosmtplib.SMTPException: If the message could not be delivered.
+        """
+        smtp = await self._ensure_connected()
+        try:
+            await smtp.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            self._smtp = None
+            smtp = await self._ensure_connected()
+            await smtp.send_message(message)
+
+    async def close(self) -> None:
+        """
+        Close the connection if it is open.
+        """
+        if self._smtp is not None and self._smtp.is_connected:
+            try:
+                await self._smtp.quit()
+            except aiosmtplib.SMTPException:
+                self._smtp.close()
+        self._smtp = None
+
+    async def shutdown(self) -> None:
+        """
+        Release the transport for good, e.g. when the worker stops. Unlike `close`, the
+        transport must not be used afterwards.
+        """
+        await self.close()
+
+
+class SinkTransport(SMTPTransport):
+    """
+    SMTP transport to a `MailSink` started for it; shutting the transport down stops the sink.
+
+    Attributes:
+        sink (MailSink): The sink the transport delivers to.
+    """
+
+    def __init__(self, sink: "MailSink"):
+        """
+        Initialize the SinkTransport.
+
+        Args:
+            sink (MailSink): A started sink.
+        """
+        super().__init__(hostname=sink.hostname, port=sink.port, use_tls=False, start_tls=False)
+        self.sink = sink
+
+    async def shutdown(self) -> None:
+        await super().shutdown()
+        await asyncio.to_thread(self.sink.stop)
+
+
+class MailSink:
+    """
+    In-process SMTP server (aiosmtpd) that accepts every message and records its arrival.
+
+    The server runs on its own thread and event loop.
+
+    Attributes:
+        hostname (str): Address the server listens on.
+        port (int): Port the server listens on.
+        received (List[Tuple[float, List[str]]]): `time.perf_counter()` and recipients of every message.
+    """
+
+    def __init__(self, hostname: str = "127.0.0.1", port: int = 8025):
+        """
+        Initialize the MailSink.
+
+        Args:
+            hostname (str): Address to listen on.
+            port (int): Port to listen on.
+        """
+        self.hostname = hostname
+        self.port = port
+        self.received: List[Tuple[float, List[str]]] = []
+        self._controller = None
+
+    async def handle_DATA(self, server, session, envelope) -> str:
+        self.received.append((time.perf_counter(), list(envelope.rcpt_tos)))
+        return "250 Message accepted for delivery"
+
+    def start(self) -> None:
+        """
+        Start listening.
+        """
+        from aiosmtpd.controller import Controller
+
+        self._controller = Controller(self, hostname=self.hostname, port=self.port)
+        self._controller.start()
+        logger.info("Mail sink listening on %s:%s", self.hostname, self.port)
+
+    def stop(self) -> None:
+        """
+        Stop listening.
+        """
+        if self._controller is not None:
+            self._controller.stop()
+            self._controller = None
+
+    def transport(self) -> SMTPTransport:
+        """
+        Create an SMTP transport that delivers to this sink.
+
+        Returns:
+            SMTPTransport: The transport.
+        """
+        return SMTPTransport(hostname=self.hostname, port=self.port, use_tls=False, start_tls=False)
+
+
+def get_transport(name: Optional[str] = None) -> SMTPTransport:
+    """
+    Create the mail transport selected by `MAIL_TRANSPORT`.
+
+    Args:
+        name (Optional[str]): "smtp" or "sink". Defaults to `MAIL_TRANSPORT`.
+
+    Returns:
+        SMTPTransport: The transport. For "sink", a `SinkTransport` whose started `MailSink` on
+        `MAIL_SINK_PORT` is stopped by `shutdown()`.
+
+    Raises:
+        ValueError: If the transport name is unknown.
+    """
+    name = name or config.MAIL_TRANSPORT
+    if name == "smtp":
+        return SMTPTransport.from_config()
+    if name == "sink":
+        sink = MailSink(port=config.MAIL_SINK_PORT)
+        sink.start()
+        return SinkTransport(sink)
+    raise ValueError(f"Unknown mail transport {name!r}")
@@ -0,0 +1,114 @@
+import hashlib
+import logging
+import secrets
+import uuid
+from datetime import timedelta
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import config
+from src.repositories.refresh_tokens import RefreshTokenRepository
+from src.utils import utcnow
+
+logger = logging.getLogger(__name__)
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class RefreshTokenService:
+    """
+    Service class for issuing and rotating refresh tokens.
+
+    Refresh tokens are random strings; only their SHA-256 digest is stored. Each refresh
+    consumes the presented token and issues a new one in the same family, so a stolen
+    token that is used after its owner has rotated it revokes the whole family.
+
+    Attributes:
+        repository (RefreshTokenRepository): Repository for refresh token storage.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize the RefreshTokenService with a database session.
+
+        Args:
+            db (AsyncSession): The asynchronous database session.
+        """
+        self.repository = RefreshTokenRepository(db)
+
+    async def issue(self, user_id: int, family_id: Optional[str] = None) -> str:
+        """
+        Issue a new refresh token.
+
+        Args:
+            user_id (int): The owner of the token.
+            family_id (Optional[str]): The rotation family; a new family is started if omitted.
+
+        Returns:
+            str: The refresh token. It cannot be recovered from the database later.
+        """
+        token = secrets.token_urlsafe(32)
+        now = utcnow()
+        await self.repository.create(
+            user_id=user_id,
+            token_hash=_hash_token(token),
+            family_id=family_id or uuid.uuid4().hex,
+            created_at=now,
+            expires_at=now + timedelta(days=config.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+        return token
+
+    async def rotate(self, token: str) -> Tuple[int, str]:
+        """
+        Exchange a refresh token for a new one.
+
+        Args:
+            token (str): The refresh token presented by the client.
+
+        Returns:
+            Tuple[int, str]: The ID of the token owner and the new refresh token.
+
+        Raises:
+            HTTPException: 401 if the token is unknown, expired or was already used.
+        """
+        token_hash = _hash_token(token)
+        now = utcnow()
+        consumed = await self.repository.consume(token_hash, now)
+        if consumed is None:
+            stored = await self.repository.get_by_hash(token_hash)
+            if stored is not None and stored.revoked_at is not None:
+                logger.warning("Refresh token reuse detected for user %s, revoking family", stored.user_id)
+                await self.repository.revoke_family(stored.family_id, now)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return consumed.user_id, await self.issue(consumed.user_id, consumed.family_id)
+
+    async def revoke(self, token: str, user_id: int) -> None:
+        """
+        Revoke a refresh token and every token rotated from the same login, e.g. on logout.
+
+        Unknown tokens and tokens of other users are ignored, so logging out twice is harmless.
+
+        Args:
+            token (str): The refresh token presented by the client.
+            user_id (int): The authenticated user; only their tokens are revoked.
+        """
+        stored = await self.repository.get_by_hash(_hash_token(token))
+        if stored is not None and stored.user_id == user_id:
+            await self.repository.revoke_family(stored.family_id, utcnow())
+
+    async def revoke_user(self, user_id: int) -> None:
+        """
+        Revoke all refresh tokens of a user.
+
+        Args:
+            user_id (int): The owner of the tokens.
+        """
+        await self.repository.revoke_user(user_id, utcnow())
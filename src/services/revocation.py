@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Iterable
+
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.conf.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over strings.
+
+    Answers "definitely not present" without false negatives; a positive answer may be
+    a false positive and has to be confirmed elsewhere.
+
+    Attributes:
+        size (int): Number of bits.
+        hashes (int): Number of bit positions per item.
+    """
+
+    def __init__(self, size: int, hashes: int, items: Iterable[str] = ()):
+        """
+        Initialize the BloomFilter.
+
+        Args:
+            size (int): Number of bits.
+            hashes (int): Number of bit positions per item.
+            items (Iterable[str]): Items to add right away.
+        """
+        self.size = size
+        self.hashes = hashes
+        self._bits = bytearray((size + 7) // 8)
+        for item in items:
+            self.add(item)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        """
+        Add an item.
+
+        Args:
+            item (str): The item.
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenDenylist:
+    """
+    Revocation store for access tokens, kept in Redis and prefiltered by a local bloom filter.
+
+    A single token is revoked by its `jti` until it expires. All tokens of a user issued
+    before a cutoff (e.g. a password reset) are revoked through a per-user timestamp.
+    Every worker mirrors the revoked identifiers in a `BloomFilter`, rebuilt periodically
+    from Redis and updated immediately through pub/sub, so checking a token that was not
+    revoked needs no network round-trip. Only filter hits are confirmed in Redis.
+
+    Attributes:
+        CHANNEL (str): Redis pub/sub channel carrying newly revoked filter items.
+        bloom (BloomFilter): The local prefilter.
+    """
+
+    CHANNEL = "token-revocations"
+    JTI_INDEX = "revoked:jti"
+    SUB_INDEX = "revoked:sub"
+
+    def __init__(self, redis=redis_client):
+        """
+        Initialize the TokenDenylist.
+
+        Args:
+            redis: The asynchronous Redis client. Defaults to the shared client.
+        """
+        self._redis = redis
+        self.bloom = self._new_filter()
+
+    @staticmethod
+    def _new_filter(items: Iterable[str] = ()) -> BloomFilter:
+        return BloomFilter(config.REVOCATION_BLOOM_SIZE, config.REVOCATION_BLOOM_HASHES, items)
+
+    @staticmethod
+    def _unavailable() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Token revocation is unavailable. Try again later.",
+            headers={"Retry-After": "1"},
+        )
+
+    async def revoke_token(self, claims: dict) -> None:
+        """
+        Revoke a single access token until it expires.
+
+        Args:
+            claims (dict): The decoded token claims; must contain `jti` and `exp`.
+
+        Raises:
+            HTTPException: 503 if Redis is unavailable, so the token was not revoked.
+        """
+        jti = claims["jti"]
+        ttl = max(int(claims["exp"] - time.time()), 1)
+        self.bloom.add(f"jti:{jti}")
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.set(f"{self.JTI_INDEX}:{jti}", 1, ex=ttl)
+                pipe.zadd(self.JTI_INDEX, {jti: claims["exp"]})
+                pipe.publish(self.CHANNEL, f"jti:{jti}")
+                await pipe.execute()
+        except RedisError as e:
+            logger.error("Token revocation failed for %s: %s", jti, e)
+            raise self._unavailable() from e
+
+    async def revoke_user(self, username: str) -> None:
+        """
+        Revoke all access tokens of a user issued before now.
+
+        Args:
+            username (str): The username (`sub` claim).
+
+        Raises:
+            HTTPException: 503 if Redis is unavailable, so the tokens were not revoked.
+        """
+        cutoff = int(time.time())
+        lifetime = config.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        self.bloom.add(f"sub:{username}")
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.set(f"{self.SUB_INDEX}:{username}", cutoff, ex=lifetime)
+                pipe.zadd(self.SUB_INDEX, {username: cutoff + lifetime})
+                pipe.publish(self.CHANNEL, f"sub:{username}")
+                await pipe.execute()
+        except RedisError as e:
+            logger.error("Token revocation failed for user %s: %s", username, e)
+            raise self._unavailable() from e
+
+    async def is_revoked(self, claims: dict) -> bool:
+        """
+        Check whether an access token was revoked.
+
+        Tokens missing from the bloom filter are accepted without contacting Redis. Filter
+        hits are confirmed in Redis; if Redis is unavailable then, the token is rejected.
+
+        Args:
+            claims (dict): The decoded token claims.
+
+        Returns:
+            bool: True if the token must not be accepted.
+        """
+        jti, username = claims.get("jti"), claims.get("sub")
+        check_jti = jti is not None and f"jti:{jti}" in self.bloom
+        check_sub = username is not None and f"sub:{username}" in self.bloom
+        if not check_jti and not check_sub:
+            return False
+        try:
+            if check_jti and await self._redis.exists(f"{self.JTI_INDEX}:{jti}"):
+                return True
+            if check_sub:
+                cutoff = await self._redis.get(f"{self.SUB_INDEX}:{username}")
+                return cutoff is not None and claims.get("iat", 0) < int(cutoff)
+        except RedisError as e:
+            logger.warning("Token denylist unavailable, rejecting token: %s", e)
+            return True
+        return False
+
+    async def sync(self) -> None:
+        """
+        Rebuild the bloom filter from the revocations in Redis that have not expired yet.
+        """
+        now = time.time()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(self.JTI_INDEX, "-inf", now)
+            pipe.zremrangebyscore(self.SUB_INDEX, "-inf", now)
+            pipe.zrangebyscore(self.JTI_INDEX, now, "+inf")
+            pipe.zrangebyscore(self.SUB_INDEX, now, "+inf")
+            _, _, jtis, usernames = await pipe.execute()
+        self.bloom = self._new_filter(
+            [f"jti:{jti}" for jti in jtis] + [f"sub:{username}" for username in usernames]
+        )
+
+    async def run(self) -> None:
+        """
+        Keep the bloom filter in sync until cancelled: rebuild it every
+        `REVOCATION_SYNC_SECONDS` and add revocations announced on `CHANNEL` in between.
+        """
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    await self.sync()
+                    next_sync = time.monotonic() + config.REVOCATION_SYNC_SECONDS
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True,
+                            timeout=max(next_sync - time.monotonic(), 0),
+                        )
+                        if message is not None:
+                            self.bloom.add(message["data"])
+                        if time.monotonic() >= next_sync:
+                            await self.sync()
+                            next_sync = time.monotonic() + config.REVOCATION_SYNC_SECONDS
+            except RedisError as e:
+                logger.warning("Token denylist sync disconnected: %s", e)
+                await asyncio.sleep(1)
+
+
+token_denylist = TokenDenylist()
+"""
+Global access token denylist shared by authentication and user services.
+"""
@@ -1,70 +1,267 @@
+import asyncio
+import functools
+import hashlib
+import io
+import json
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
 import cloudinary
 import cloudinary.uploader
+import cloudinary.utils
+import httpx
+from fastapi import HTTPException, UploadFile, status
 
+from src.conf.config import config
+from src.services import avatar_variants
 
-class UploadFileService:
+CHUNK_SIZE = 64 * 1024
+"""Size of the chunks an upload is read in."""
+
+IMAGE_SIGNATURES = {
+    "image/jpeg": (b"\xff\xd8\xff",),
+    "image/png": (b"\x89PNG\r\n\x1a\n",),
+    "image/gif": (b"GIF87a", b"GIF89a"),
+    "image/webp": (b"RIFF",),
+}
+"""Leading bytes of the accepted image formats, used to check the declared content type."""
+
+
+def _matches_signature(content_type: str, head: bytes) -> bool:
+    if content_type == "image/webp":
+        return head.startswith(b"RIFF") and head[8:12] == b"WEBP"
+    return any(head.startswith(signature) for signature in IMAGE_SIGNATURES.get(content_type, ()))
+
+
+class AvatarStorage(ABC):
     """
-    A service class for uploading files to Cloudinary.
+    Base class of avatar storage backends.
 
-    This class provides methods for configuring Cloudinary and uploading files, 
-    with default settings for resizing avatars.
+    Objects are immutable and addressed by content-hashed keys, so they can be cached
+    forever and an existing key never needs to be written again. The methods are called
+    off the event loop and may block.
+    """
 
-    Attributes:
-        DEFAULT_AVATAR_HEIGHT (int): Default height for avatar images. Default is 250 pixels.
-        DEFAULT_AVATAR_WIDTH (int): Default width for avatar images. Default is 250 pixels.
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """
+        Check whether an object is stored.
+
+        Args:
+            key (str): The object key, e.g. "<sha256>/128.webp".
+
+        Returns:
+            bool: Whether the object exists.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        """
+        Store an object.
+
+        Args:
+            key (str): The object key.
+            data (bytes): The object content.
+            content_type (str): The content type of the object.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """
+        Public URL of an object.
+
+        Args:
+            key (str): The object key.
+
+        Returns:
+            str: The URL.
+        """
+        raise NotImplementedError
+
+
+class CloudinaryStorage(AvatarStorage):
     """
+    Stores avatar objects in Cloudinary as raw files under the "RestApp/avatars" folder.
 
-    DEFAULT_AVATAR_HEIGHT: int = 250
-    DEFAULT_AVATAR_WIDTH: int = 250
+    Variants are rendered by `src.services.avatar_variants`, so they are stored as they
+    are instead of being transformed by Cloudinary. Existence checks go to the public
+    delivery URL rather than the rate-limited Admin API.
+    """
+
+    FOLDER = "RestApp/avatars"
 
     def __init__(self, cloud_name: str, api_key: str, api_secret: str):
         """
-        Initialize the UploadFileService with Cloudinary configuration.
+        Configure the Cloudinary SDK. Done once per process, see `get_avatar_storage`.
 
         Args:
             cloud_name (str): The Cloudinary cloud name.
             api_key (str): The Cloudinary API key.
             api_secret (str): The Cloudinary API secret.
-
-        Example:
-            >>> service = UploadFileService("my_cloud_name", "my_api_key", "my_api_secret")
         """
-        self.cloud_name = cloud_name
-        self.api_key = api_key
-        self.api_secret = api_secret
-        cloudinary.config(
-            cloud_name=self.cloud_name,
-            api_key=self.api_key,
-            api_secret=self.api_secret,
-            secure=True,
+        cloudinary.config(cloud_name=cloud_name, api_key=api_key, api_secret=api_secret, secure=True)
+
+    def exists(self, key: str) -> bool:
+        try:
+            response = httpx.head(self.url(key), timeout=5)
+        except httpx.HTTPError:
+            return False
+        return response.status_code == 200
+
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        cloudinary.uploader.upload(
+            io.BytesIO(data), public_id=f"{self.FOLDER}/{key}", resource_type="raw", overwrite=False
         )
 
-    @staticmethod
-    def upload_file(file, username: str) -> str:
+    def url(self, key: str) -> str:
+        return cloudinary.utils.cloudinary_url(f"{self.FOLDER}/{key}", resource_type="raw")[0]
+
+
+class LocalStorage(AvatarStorage):
+    """
+    Stores avatar objects on the local filesystem, e.g. for development and tests.
+
+    Attributes:
+        root (Path): Directory the files are written to.
+        base_url (str): URL prefix the directory is served under.
+    """
+
+    def __init__(self, root: str, base_url: str):
+        """
+        Initialize the LocalStorage.
+
+        Args:
+            root (str): Directory the files are written to.
+            base_url (str): URL prefix the directory is served under.
+        """
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def exists(self, key: str) -> bool:
+        return (self.root / key).is_file()
+
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+@functools.lru_cache(maxsize=None)
+def get_avatar_storage() -> AvatarStorage:
+    """
+    Dependency returning the avatar storage selected by `AVATAR_STORAGE`, created once per process.
+
+    Returns:
+        AvatarStorage: The storage backend.
+
+    Raises:
+        ValueError: If `AVATAR_STORAGE` is unknown.
+    """
+    if config.AVATAR_STORAGE == "cloudinary":
+        return CloudinaryStorage(config.CLD_NAME, config.CLD_API_KEY, config.CLD_API_SECRET)
+    if config.AVATAR_STORAGE == "local":
+        return LocalStorage(config.AVATAR_LOCAL_DIR, config.AVATAR_LOCAL_URL)
+    raise ValueError(f"Unknown avatar storage {config.AVATAR_STORAGE!r}")
+
+
+class UploadFileService:
+    """
+    A service class for validating avatar uploads and storing their variants.
+
+    Uploads are read in chunks to enforce the size limit and hash the content, and the
+    content type is checked against the file's leading bytes. The image is then rendered
+    into thumbnail variants stored under its content hash, followed by a manifest listing
+    them. The manifest is written last, so its presence means the set is complete and an
+    identical re-upload can skip decoding and storage altogether.
+
+    Attributes:
+        storage (AvatarStorage): The storage backend.
+        max_bytes (int): Maximum accepted file size.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, storage: AvatarStorage, max_bytes: Optional[int] = None):
         """
-        Upload a file to Cloudinary and generate a resized URL.
+        Initialize the UploadFileService.
 
-        The uploaded file is stored with a public ID that includes the username. The
-        resulting image URL is resized to the default avatar dimensions (250x250 pixels)
-        and cropped to fill the specified size.
+        Args:
+            storage (AvatarStorage): The storage backend.
+            max_bytes (Optional[int]): Maximum accepted file size. Defaults to `AVATAR_MAX_BYTES`.
+        """
+        self.storage = storage
+        self.max_bytes = max_bytes or config.AVATAR_MAX_BYTES
+
+    async def _validate(self, file: UploadFile) -> str:
+        content_type = file.content_type
+        if content_type not in IMAGE_SIGNATURES:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"Unsupported image type. Allowed: {', '.join(IMAGE_SIGNATURES)}",
+            )
+        too_large = HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File is larger than {self.max_bytes} bytes",
+        )
+        if file.size is not None and file.size > self.max_bytes:
+            raise too_large
+
+        digest = hashlib.sha256()
+        size = 0
+        await file.seek(0)
+        while chunk := await file.read(CHUNK_SIZE):
+            if size == 0 and not _matches_signature(content_type, chunk):
+                raise HTTPException(
+                    status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                    detail="File content does not match its image type",
+                )
+            size += len(chunk)
+            if size > self.max_bytes:
+                raise too_large
+            digest.update(chunk)
+        if size == 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File is empty")
+        await file.seek(0)
+        return digest.hexdigest()
+
+    async def upload_avatar(self, file: UploadFile) -> str:
+        """
+        Validate an uploaded avatar, render and store its variants.
 
         Args:
-            file: The file to upload. This should be a file-like object with a `.file` attribute.
-            username (str): The username to use for the public ID in Cloudinary.
+            file (UploadFile): The uploaded file.
 
         Returns:
-            str: The URL of the uploaded and resized file.
+            str: The URL of the variant manifest.
 
-        Example:
-            >>> file_url = UploadFileService.upload_file(my_file, "username123")
-            >>> print(file_url)
+        Raises:
+            HTTPException: 413 if the file is too large, 415 if it is not an accepted image, 400 if it is empty.
         """
-        public_id = f"RestApp/{username}"
-        r = cloudinary.uploader.upload(file.file, public_id=public_id, overwrite=True)
-        src_url = cloudinary.CloudinaryImage(public_id).build_url(
-            width=UploadFileService.DEFAULT_AVATAR_WIDTH,
-            height=UploadFileService.DEFAULT_AVATAR_HEIGHT,
-            crop="fill",
-            version=r.get("version"),
+        digest = await self._validate(file)
+        manifest_key = f"{digest}/{self.MANIFEST}"
+        if await asyncio.to_thread(self.storage.exists, manifest_key):
+            return self.storage.url(manifest_key)
+
+        variants = await avatar_variants.render_avatar(await file.read())
+        keys = {name: f"{digest}/{name}" for name in variants}
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(self.storage.put, keys[name], data, avatar_variants.content_type_for(name))
+                for name, data in variants.items()
+            )
         )
-        return src_url
+        document = avatar_variants.manifest(digest, {name: self.storage.url(key) for name, key in keys.items()})
+        await asyncio.to_thread(self.storage.put, manifest_key, json.dumps(document).encode(), "application/json")
+        return self.storage.url(manifest_key)
@@ -1,10 +1,14 @@
 import logging
 
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from libgravatar import Gravatar
 
 from src.repositories.users import UserRepository
+from src.services.refresh_tokens import RefreshTokenService
 from src.schemas import UserCreate
+from src.services.cache import user_cache
+from src.services.revocation import token_denylist
 
 logging.basicConfig(
     level=logging.ERROR,
@@ -22,6 +26,7 @@ class UserService:
 
     Attributes:
         repository (UserRepository): An instance of the user repository for database interactions.
+        refresh_tokens (RefreshTokenService): Service for the user's refresh tokens.
     """
 
     def __init__(self, db: AsyncSession):
@@ -32,40 +37,46 @@ class UserService:
             db (AsyncSession): The asynchronous database session.
         """
         self.repository = UserRepository(db)
+        self.refresh_tokens = RefreshTokenService(db)
 
     async def create_user(self, body: UserCreate):
         """
         Create a new user.
 
-        This method attempts to retrieve a Gravatar image for the user's email address
-        and uses it as the default avatar. If an error occurs, the avatar will be set to `None`.
+        The user is stored without an avatar; the default avatar is filled in afterwards
+        by `src.services.gravatar.fill_default_avatar`.
 
         Args:
-            body (UserCreate): The user creation data.
+            body (UserCreate): The user creation data, with the password already hashed.
 
         Returns:
             User: The newly created user object.
+
+        Raises:
+            HTTPException: 409 if the email or username is already in use.
         """
-        avatar = None
         try:
-            gravatar_inst = Gravatar(body.email)
-            avatar = gravatar_inst.get_image()
-        except Exception as e:
-            logger.error("Create user exception occurred: %s", e)
-
-        return await self.repository.create_user(body, avatar)
-
-    async def get_user_by_username(self, username: str):
+            return await self.repository.create_user(body)
+        except IntegrityError:
+            # The conflicting row may be too recent to have reached a replica.
+            if await self.repository.get_user_by_email(body.email, replica=False):
+                detail = "You can't use this email"
+            else:
+                detail = "You can't use this username"
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+    async def get_user_by_username(self, username: str, replica: bool = True):
         """
         Retrieve a user by their username.
 
         Args:
             username (str): The username of the user to retrieve.
+            replica (bool): Whether a read replica may answer. Pass `False` when the user is cached.
 
         Returns:
             User | None: The user object if found, or `None` if no user exists with the given username.
         """
-        return await self.repository.get_user_by_username(username)
+        return await self.repository.get_user_by_username(username, replica=replica)
 
     async def get_user_by_id(self, user_id: int):
         """
@@ -102,7 +113,9 @@ class UserService:
         Returns:
             User: The updated user object.
         """
-        return await self.repository.update_avatar_url(email, url)
+        user = await self.repository.update_avatar_url(email, url)
+        await user_cache.invalidate(user.username)
+        return user
 
     async def confirmed_email(self, email: str):
         """
@@ -114,4 +127,40 @@ class UserService:
         Returns:
             None
         """
-        return await self.repository.confirm_email(email)
\ No newline at end of file
+        user = await self.repository.confirm_email(email)
+        await user_cache.invalidate(user.username)
+
+    async def reset_password(self, email: str, hashed_password: str):
+        """
+        Set a new password hash for a user and revoke all access and refresh tokens issued before.
+
+        Args:
+            email (str): The email address of the user.
+            hashed_password (str): The new password hash.
+
+        Returns:
+            User: The updated user object.
+
+        Raises:
+            HTTPException: 503 if the access tokens could not be revoked.
+        """
+        user = await self.repository.update_password(email, hashed_password)
+        await user_cache.invalidate(user.username)
+        await self.refresh_tokens.revoke_user(user.id)
+        await token_denylist.revoke_user(user.username)
+        return user
+
+    async def rehash_password(self, user, hashed_password: str):
+        """
+        Store a stronger hash of the user's current password, e.g. after the bcrypt cost was raised.
+
+        Args:
+            user (User): The user who just logged in.
+            hashed_password (str): The new hash of the same password.
+
+        Returns:
+            User: The updated user object.
+        """
+        user = await self.repository.update_password(user.email, hashed_password)
+        await user_cache.invalidate(user.username)
+        return user
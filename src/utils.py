@@ -1,5 +1,8 @@
+import base64
+import binascii
+import json
 from sqlalchemy import inspect
-from datetime import datetime
+from datetime import date, datetime, timezone
 
 
 def model_to_dict(obj, exclude=None):
@@ -18,3 +21,53 @@ def model_to_dict(obj, exclude=None):
             result[c.key] = value
 
     return result
+
+
+def utcnow() -> datetime:
+    """
+    Get the current time as a naive UTC datetime, as stored in `DateTime` columns.
+
+    Returns:
+        datetime: The current UTC time without tzinfo.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def encode_cursor(key: str, *values) -> str:
+    """
+    Encode keyset pagination values into an opaque cursor string.
+
+    Args:
+        key (str): Name of the ordering the cursor belongs to (e.g. the sort field).
+        *values: The ordering values of the last returned row, e.g. `(sort_value, id)`.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    payload = [key, *(v.isoformat() if isinstance(v, (date, datetime)) else v for v in values)]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key: str) -> list:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The opaque cursor string.
+        key (str): The ordering the cursor is expected to belong to.
+
+    Returns:
+        list: The encoded ordering values.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for a different ordering.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(payload, list) or len(payload) < 2 or payload[0] != key:
+        raise ValueError("Cursor does not match the requested ordering")
+    return payload[1:]
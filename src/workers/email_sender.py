@@ -0,0 +1,161 @@
+"""
+Email sender worker: delivers emails queued in the outbox.
+
+Run one or more instances next to the web app::
+
+    python -m src.workers.email_sender
+"""
+import asyncio
+import logging
+import random
+import time
+from datetime import timedelta
+from typing import List, Optional
+
+import aiosmtplib
+
+from src.conf.config import config
+from src.db.db import sessionmanager
+from src.db.models import EmailOutbox
+from src.repositories.email_outbox import EmailOutboxRepository
+from src.services.email import build_message, mail_templates
+from src.services.mail_transport import SMTPTransport, get_transport
+from src.utils import utcnow
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """
+    Compute the delay before the next attempt: exponential in the attempts made, capped and jittered.
+
+    Args:
+        attempts (int): Number of attempts made so far (at least 1).
+
+    Returns:
+        timedelta: The delay.
+    """
+    delay = min(config.OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1), config.OUTBOX_BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+class EmailSender:
+    """
+    Claims due outbox emails in batches and delivers them over one pooled transport connection.
+
+    Rendering errors and permanent SMTP rejections (5xx) fail an email immediately; other errors are retried
+    with exponential backoff until `OUTBOX_MAX_ATTEMPTS`. If the server cannot be reached,
+    the rest of the batch is rescheduled instead of being tried one by one. Delivered emails
+    are deleted after `OUTBOX_SENT_RETENTION_HOURS`, so the outbox does not grow forever.
+
+    Attributes:
+        transport (SMTPTransport): The pooled mail transport.
+        sent (int): Number of emails delivered by this worker.
+        failed (int): Number of failed attempts in this worker.
+    """
+
+    def __init__(self, transport: Optional[SMTPTransport] = None, session_factory=sessionmanager.session):
+        """
+        Initialize the EmailSender.
+
+        Args:
+            transport (Optional[SMTPTransport]): Transport to reuse. Defaults to the one selected by `MAIL_TRANSPORT`.
+            session_factory (Callable): Factory of database session context managers.
+        """
+        self.transport = transport or get_transport()
+        self._session_factory = session_factory
+        self.sent = 0
+        self.failed = 0
+        self._purged_at: Optional[float] = None
+
+    async def send_batch(self) -> int:
+        """
+        Claim and deliver one batch of due emails.
+
+        Returns:
+            int: Number of emails claimed.
+        """
+        async with self._session_factory() as session:
+            repository = EmailOutboxRepository(session)
+            now = utcnow()
+            emails = await repository.claim(
+                config.OUTBOX_BATCH_SIZE, now, now + timedelta(seconds=config.OUTBOX_LEASE_SECONDS)
+            )
+            delivered: List[int] = []
+            for index, email in enumerate(emails):
+                try:
+                    message = build_message(email.recipient, email.subject, email.template, email.context)
+                except Exception as e:
+                    await self._fail(repository, email, f"Rendering failed: {e}", permanent=True)
+                    continue
+                try:
+                    await self.transport.send(message)
+                    delivered.append(email.id)
+                except aiosmtplib.SMTPRecipientsRefused as e:
+                    await self._fail(repository, email, str(e), permanent=True)
+                except aiosmtplib.SMTPResponseException as e:
+                    await self._fail(repository, email, str(e), permanent=e.code >= 500)
+                except (aiosmtplib.SMTPException, OSError) as e:
+                    logger.warning("SMTP server unavailable: %s", e)
+                    await self.transport.close()
+                    for pending in emails[index:]:
+                        await self._fail(repository, pending, str(e), permanent=False)
+                    break
+            await repository.mark_sent(delivered, utcnow())
+            self.sent += len(delivered)
+            return len(emails)
+
+    async def purge_sent(self) -> int:
+        """
+        Delete emails delivered more than `OUTBOX_SENT_RETENTION_HOURS` ago in batches of `OUTBOX_PURGE_BATCH_SIZE`.
+
+        Returns:
+            int: Number of deleted emails.
+        """
+        sent_before = utcnow() - timedelta(hours=config.OUTBOX_SENT_RETENTION_HOURS)
+        purged = 0
+        async with self._session_factory() as session:
+            repository = EmailOutboxRepository(session)
+            while True:
+                deleted = await repository.purge_sent(sent_before, config.OUTBOX_PURGE_BATCH_SIZE)
+                purged += deleted
+                if deleted < config.OUTBOX_PURGE_BATCH_SIZE:
+                    return purged
+
+    async def _fail(self, repository: EmailOutboxRepository, email: EmailOutbox, error: str, permanent: bool):
+        self.failed += 1
+        give_up = permanent or email.attempts >= config.OUTBOX_MAX_ATTEMPTS
+        if give_up:
+            logger.error("Giving up on email %s to %s: %s", email.id, email.recipient, error)
+        await repository.mark_failed(email.id, error, utcnow() + backoff_delay(email.attempts), give_up)
+
+    async def run(self) -> None:
+        """
+        Deliver emails until cancelled. Full batches are followed immediately by the next
+        one; otherwise the worker sleeps `OUTBOX_POLL_SECONDS`. Old delivered emails are
+        purged every `OUTBOX_PURGE_SECONDS`.
+        """
+        try:
+            while True:
+                try:
+                    if self._purged_at is None or time.monotonic() - self._purged_at >= config.OUTBOX_PURGE_SECONDS:
+                        self._purged_at = time.monotonic()
+                        await self.purge_sent()
+                    claimed = await self.send_batch()
+                except Exception as e:
+                    logger.exception("Email batch failed: %s", e)
+                    claimed = 0
+                if claimed < config.OUTBOX_BATCH_SIZE:
+                    await asyncio.sleep(config.OUTBOX_POLL_SECONDS)
+        finally:
+            await self.transport.shutdown()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    mail_templates.load()
+    asyncio.run(EmailSender().run())
+
+
+if __name__ == "__main__":
+    main()
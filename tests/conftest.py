@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 from main import app
 from src.db.models import Base, User, Contact
-from src.db.db import get_db
+from src.db.db import get_db, get_session_factory
 from src.schemas import ContactModel
 from src.services.auth import create_access_token, Hash, get_current_user
 
@@ -126,6 +126,7 @@ def client():
         return User(id=1, username='test', email='test@test.com', avatar='test_avatar.png')
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
     app.dependency_overrides[get_current_user] = override_get_current_user
 
     yield TestClient(app)
@@ -1,6 +1,11 @@
-from unittest.mock import Mock, AsyncMock
+import asyncio
+from unittest.mock import Mock, AsyncMock, MagicMock
 
 import pytest
+from redis.exceptions import RedisError
+
+from src.services.auth import create_access_token
+from tests.conftest import test_user
 
 
 # Test user data
@@ -151,3 +156,114 @@ async def test_request_email(client, monkeypatch):
     )
     assert response.status_code == 200
     assert response.json()["message"] == "Check your mail for verification"
+
+
+def test_logout_revokes_token(client, monkeypatch):
+    revoke_token = AsyncMock()
+    monkeypatch.setattr("src.services.auth.token_denylist.revoke_token", revoke_token)
+    token = asyncio.run(create_access_token(data={"sub": user_data["username"]}))
+
+    response = client.post("api/auth/logout", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 204, response.text
+    claims = revoke_token.call_args.args[0]
+    assert claims["sub"] == user_data["username"]
+    assert "jti" in claims
+
+
+def test_logout_fails_when_revocation_is_unavailable(client, monkeypatch):
+    pipe = MagicMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.execute = AsyncMock(side_effect=RedisError("down"))
+    monkeypatch.setattr("src.services.auth.token_denylist._redis", MagicMock(pipeline=MagicMock(return_value=pipe)))
+    token = asyncio.run(create_access_token(data={"sub": user_data["username"]}))
+
+    response = client.post("api/auth/logout", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 503, response.text
+
+
+def test_logout_with_invalid_token(client):
+    response = client.post("api/auth/logout", headers={"Authorization": "Bearer invalid"})
+
+    assert response.status_code == 401, response.text
+
+
+def test_refresh_rotates_tokens(client):
+    response = client.post(
+        "api/auth/login",
+        data={"username": test_user["username"], "password": test_user["password"]},
+    )
+    assert response.status_code == 200, response.text
+    refresh_token = response.json()["refresh_token"]
+
+    response = client.post("api/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["access_token"]
+    assert data["refresh_token"] != refresh_token
+
+    response = client.post("api/auth/refresh", json={"refresh_token": data["refresh_token"]})
+    assert response.status_code == 200, response.text
+
+
+def test_refresh_token_reuse_revokes_family(client):
+    response = client.post(
+        "api/auth/login",
+        data={"username": test_user["username"], "password": test_user["password"]},
+    )
+    first = response.json()["refresh_token"]
+    second = client.post("api/auth/refresh", json={"refresh_token": first}).json()["refresh_token"]
+
+    response = client.post("api/auth/refresh", json={"refresh_token": first})
+    assert response.status_code == 401, response.text
+    response = client.post("api/auth/refresh", json={"refresh_token": second})
+    assert response.status_code == 401, response.text
+
+
+def test_refresh_fails_after_logout(client, monkeypatch):
+    monkeypatch.setattr("src.services.auth.token_denylist.revoke_token", AsyncMock())
+    response = client.post(
+        "api/auth/login",
+        data={"username": test_user["username"], "password": test_user["password"]},
+    )
+    tokens = response.json()
+    rotated = client.post("api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+
+    response = client.post(
+        "api/auth/logout",
+        json={"refresh_token": rotated["refresh_token"]},
+        headers={"Authorization": f"Bearer {rotated['access_token']}"},
+    )
+    assert response.status_code == 204, response.text
+
+    response = client.post("api/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert response.status_code == 401, response.text
+
+
+def test_logout_keeps_refresh_token_of_other_user(client, monkeypatch):
+    monkeypatch.setattr("src.services.auth.token_denylist.revoke_token", AsyncMock())
+    response = client.post(
+        "api/auth/login",
+        data={"username": test_user["username"], "password": test_user["password"]},
+    )
+    refresh_token = response.json()["refresh_token"]
+    other = asyncio.run(create_access_token(data={"sub": "other", "user_id": 999}))
+
+    response = client.post(
+        "api/auth/logout", json={"refresh_token": refresh_token}, headers={"Authorization": "Bearer invalid"}
+    )
+    assert response.status_code == 401, response.text
+    response = client.post(
+        "api/auth/logout", json={"refresh_token": refresh_token}, headers={"Authorization": f"Bearer {other}"}
+    )
+    assert response.status_code == 204, response.text
+
+    response = client.post("api/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200, response.text
+
+
+def test_refresh_with_unknown_token(client):
+    response = client.post("api/auth/refresh", json={"refresh_token": "unknown"})
+
+    assert response.status_code == 401, response.text
@@ -1,7 +1,7 @@
 import pytest
 import json
 from datetime import datetime, timezone
-from jose import jwt
+from jose import JWTError, jwt
 from fastapi import HTTPException
 from unittest.mock import AsyncMock, patch, MagicMock
 
@@ -11,7 +11,10 @@ from src.services.auth import (
     get_email_from_token,
     get_password_from_token,
     create_email_token,
-    get_admin_user
+    get_admin_user,
+    claims_cache,
+    decode_access_token,
+    key_ring,
 )
 from src.conf.config import config
 from src.db.models import User, Role
@@ -89,6 +92,32 @@ async def test_get_current_user_from_db_and_cache(mock_get_user, mock_redis_set,
     user = await get_current_user(token=token, db=db_mock)
     assert user.username == fake_user.username
     mock_redis_set.assert_called()
+    mock_get_user.assert_awaited_once_with(fake_user.username, replica=False)
+
+
+@pytest.mark.asyncio
+async def test_decode_access_token_caches_claims():
+    claims_cache.clear()
+    token = await create_access_token({"sub": "johndoe"})
+
+    with patch("src.services.auth.key_ring.decode", wraps=key_ring.decode) as mock_decode:
+        first = await decode_access_token(token)
+        second = await decode_access_token(token)
+
+    assert first == second
+    assert first["sub"] == "johndoe"
+    mock_decode.assert_called_once()
+    assert claims_cache.stats()["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_decode_access_token_does_not_cache_expired_token():
+    claims_cache.clear()
+    token = jwt.encode({"sub": "johndoe", "exp": 1}, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+
+    with pytest.raises(JWTError):
+        await decode_access_token(token)
+    assert len(claims_cache) == 0
 
 
 @pytest.mark.asyncio
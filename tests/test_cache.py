@@ -0,0 +1,81 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.db.models import User
+from src.services.cache import ContactCache, TTLCache, UserCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["hit_ratio"] == pytest.approx(3 / 4)
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.services.cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("short", 1, ttl=5)
+    cache.set("long", 2)
+
+    now[0] += 10
+
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_user_cache_serves_local_tier_without_redis():
+    redis = AsyncMock()
+    redis.get.return_value = json.dumps({"id": 1, "username": "neo", "email": "neo@example.com"})
+    cache = UserCache(redis=redis)
+
+    first = await cache.get("neo")
+    second = await cache.get("neo")
+
+    assert first is second
+    assert isinstance(first, User)
+    redis.get.assert_awaited_once_with("user:neo")
+
+
+@pytest.mark.asyncio
+async def test_user_cache_invalidate_publishes():
+    redis = AsyncMock()
+    cache = UserCache(redis=redis)
+    cache.local.set("neo", User(id=1, username="neo"))
+
+    await cache.invalidate("neo")
+
+    assert cache.local.get("neo") is None
+    redis.delete.assert_awaited_once_with("user:neo")
+    redis.publish.assert_awaited_once_with(UserCache.CHANNEL, "neo")
+
+
+@pytest.mark.asyncio
+async def test_contact_cache_retries_failed_invalidation():
+    redis = AsyncMock()
+    redis.get.return_value = "7"
+    pipe = MagicMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.execute = AsyncMock(side_effect=[RedisError("down"), RedisError("down"), None])
+    redis.pipeline = MagicMock(return_value=pipe)
+    cache = ContactCache(redis=redis)
+
+    await cache.invalidate(1)
+    assert await cache.version(1) is None
+    assert await cache.version(2) == "7"
+
+    assert await cache.version(1) == "7"
+    assert pipe.incr.call_count == 3
+    pipe.incr.assert_called_with("contacts:1:version")
@@ -1,6 +1,15 @@
+import asyncio
+import json
+from datetime import date
+
 import pytest
 from unittest.mock import AsyncMock
 from fastapi import HTTPException, status
+from sqlalchemy import delete
+
+from src.db.models import Contact
+from src.schemas import ContactResponse
+from tests.conftest import TestingSessionLocal
 
 user_data = {
     "id": 1,
@@ -87,3 +96,182 @@ async def test_delete_contact_not_found(client, monkeypatch, auth_headers):
     assert response.status_code == 404
     assert response.json()["detail"] == "Contact not found."
     mock_delete_contact.assert_called_once_with(1, contact_id)
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_next_cursor_header(client, monkeypatch, auth_headers):
+    """
+    Test that a full page exposes the cursor of the next page.
+    """
+    page = [
+        ContactResponse(**{**contact, "birthday_date": contact["birth_date"]})
+        for contact in contacts
+    ]
+    mock_list_contacts = AsyncMock(return_value=page)
+    monkeypatch.setattr(
+        "src.services.contacts.ContactService.list_contacts", mock_list_contacts
+    )
+
+    response = client.get("/api/contacts/?limit=2", headers=auth_headers)
+    assert response.status_code == 200
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get(f"/api/contacts/?limit=2&cursor={cursor}", headers=auth_headers)
+    assert response.status_code == 200
+    assert mock_list_contacts.call_args.kwargs["cursor"] == cursor
+
+
+@pytest.mark.asyncio
+async def test_search_contacts(client, monkeypatch, auth_headers):
+    """
+    Test full-text search over contacts.
+    """
+    mock_search_contacts = AsyncMock(return_value=([], None))
+    monkeypatch.setattr(
+        "src.services.contacts.ContactService.search_contacts", mock_search_contacts
+    )
+
+    response = client.get("/api/contacts/search?q=john&limit=10", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert "X-Next-Cursor" not in response.headers
+    mock_search_contacts.assert_called_once_with(1, "john", 0, 10, None)
+
+
+def test_import_contacts(client, auth_headers):
+    """
+    Test bulk import with valid, invalid and duplicate rows.
+    """
+    csv_body = (
+        "first_name,last_name,email,phone_number,birthday_date\n"
+        "Ann,Lee,ann.lee@example.com,5550001,1991-02-03\n"
+        "B,Lee,not-an-email,5550002,1991-02-03\n"
+        "Ann,Twin,ann.lee@example.com,5550003,1991-02-03\n"
+    )
+    response = client.post(
+        "/api/contacts/import",
+        files={"file": ("contacts.csv", csv_body, "text/csv")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["imported"] == 1
+    assert report["failed"] == 2
+    assert [error["row"] for error in report["errors"]] == [2, 3]
+
+    ndjson_body = (
+        '{"first_name": "Cid", "last_name": "Lee", "email": "cid.lee@example.com", '
+        '"phone_number": "5550004", "birthday_date": "1990-05-06"}\n'
+        "{broken\n"
+    )
+    response = client.post(
+        "/api/contacts/import",
+        files={"file": ("contacts.ndjson", ndjson_body, "application/x-ndjson")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["imported"] == 1
+    assert report["errors"][0]["row"] == 2
+
+
+@pytest.fixture
+def seeded_contacts(client):
+    """
+    Fixture inserting two contacts of the test user directly, removed again afterwards.
+    """
+    contacts = [
+        Contact(first_name="Eve", last_name="Seeded", email="eve.seeded@example.com",
+                phone_number="5550101", birthday_date=date(1992, 3, 4), user_id=1),
+        Contact(first_name="Gus", last_name="Seeded", email="gus.seeded@example.com",
+                phone_number="5550102", birthday_date=date(1993, 5, 6), user_id=1),
+    ]
+
+    async def seed():
+        async with TestingSessionLocal() as session:
+            session.add_all(contacts)
+            await session.commit()
+
+    async def remove():
+        async with TestingSessionLocal() as session:
+            await session.execute(delete(Contact).where(Contact.id.in_([contact.id for contact in contacts])))
+            await session.commit()
+
+    asyncio.run(seed())
+    yield contacts
+    asyncio.run(remove())
+
+
+def test_export_contacts(client, auth_headers, seeded_contacts):
+    """
+    Test streaming export in both formats.
+    """
+    response = client.get("/api/contacts/export", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines[0].startswith("id,first_name,last_name,email,phone_number,birthday_date")
+    assert any("eve.seeded@example.com" in line for line in lines[1:])
+
+    response = client.get("/api/contacts/export?format=ndjson", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    rows = {row["email"]: row for row in map(json.loads, response.text.splitlines())}
+    assert {"eve.seeded@example.com", "gus.seeded@example.com"} <= set(rows)
+    assert rows["eve.seeded@example.com"]["birthday_date"] == "1992-03-04"
+
+
+def test_bulk_update_and_delete_contacts(client, auth_headers, seeded_contacts):
+    """
+    Test bulk update and bulk delete of contacts selected by last name.
+    """
+    response = client.patch(
+        "/api/contacts/bulk",
+        json={"last_name": "Seeded", "changes": {"info": "seeded"}},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    updated = response.json()
+    assert updated["affected"] == 2
+
+    response = client.post(
+        "/api/contacts/bulk/delete",
+        json={"ids": updated["ids"][:1]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"affected": 1, "ids": updated["ids"][:1]}
+
+
+@pytest.mark.parametrize("field", ["first_name", "last_name", "birthday_date"])
+def test_bulk_update_rejects_null_required_field(client, auth_headers, field):
+    """
+    Test that a bulk update cannot null a required contact field.
+    """
+    response = client.patch(
+        "/api/contacts/bulk",
+        json={"last_name": "Seeded", "changes": {field: None}},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422, response.text
+
+
+def test_bulk_delete_requires_selector(client, auth_headers):
+    """
+    Test that a bulk delete without ids or filters is rejected.
+    """
+    response = client.post("/api/contacts/bulk/delete", json={}, headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_create_contact_duplicate(client, auth_headers):
+    """
+    Test that the database unique constraint maps to a 400 response.
+    """
+    body = {**payload, "email": "dup.lee@example.com", "phone_number": "5550099", "birthday_date": "1990-12-15"}
+    response = client.post("/api/contacts/", json=body, headers=auth_headers)
+    assert response.status_code == 201, response.text
+    assert response.json()["email"] == "dup.lee@example.com"
+
+    response = client.post("/api/contacts/", json={**body, "email": "other.lee@example.com"}, headers=auth_headers)
+    assert response.status_code == 400, response.text
@@ -1,5 +1,7 @@
 import pytest
+from datetime import date
 from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.models import User, Contact
@@ -23,13 +25,27 @@ def contact_repository(mock_session):
 @pytest.mark.asyncio
 async def test_create_contact(contact_repository, mock_session):
     data = ContactModel(first_name="Anna", last_name="Smith", email="anna@example.com", phone_number="44444444", birthday_date="1995-03-10")
+    mock_session.execute = AsyncMock(
+        return_value=MagicMock(scalar_one=MagicMock(return_value=Contact(**data.model_dump(), user_id=USER_ID)))
+    )
 
     result = await contact_repository.create_contact(USER_ID, data)
 
     assert result.first_name == "Anna"
-    mock_session.add.assert_called()
+    assert "RETURNING" in str(mock_session.execute.call_args.args[0])
     mock_session.commit.assert_called()
-    mock_session.refresh.assert_called()
+    mock_session.refresh.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_contact_duplicate(contact_repository, mock_session):
+    data = ContactModel(first_name="Anna", last_name="Smith", email="anna@example.com", phone_number="44444444", birthday_date="1995-03-10")
+    mock_session.execute = AsyncMock(side_effect=IntegrityError("INSERT", {}, Exception("unique")))
+
+    with pytest.raises(IntegrityError):
+        await contact_repository.create_contact(USER_ID, data)
+
+    mock_session.rollback.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -75,11 +91,46 @@ async def test_remove_contact(contact_repository, mocker, mock_session):
 
 @pytest.mark.asyncio
 async def test_does_contact_exist_non_existing_contact(contact_repository, mock_session):
-    mock_execute = AsyncMock()
-    mock_execute.scalars.return_value.first.return_value = None
-
-    mock_session.execute = mock_execute
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.first.return_value = None
+    mock_session.execute = AsyncMock(return_value=mock_result)
 
     result = await contact_repository.does_contact_exist(USER_ID, "nonexistent@example.com", "9876543210")
 
     assert result is False
+
+
+@pytest.mark.asyncio
+async def test_does_contact_exist_propagates_errors(contact_repository, mock_session):
+    mock_session.execute = AsyncMock(side_effect=OperationalError("SELECT", {}, Exception("down")))
+
+    with pytest.raises(OperationalError):
+        await contact_repository.does_contact_exist(USER_ID, "nonexistent@example.com", "9876543210")
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_skips_empty_filters(contact_repository, mock_session):
+    mock_session.execute = AsyncMock(return_value=MagicMock())
+
+    await contact_repository.get_contacts(USER_ID, "", "Smi", "", skip=0, limit=10)
+
+    query = str(mock_session.execute.call_args.args[0])
+    assert "contacts.last_name LIKE" in query
+    assert "contacts.first_name LIKE" not in query
+    assert "contacts.email LIKE" not in query
+
+
+@pytest.mark.asyncio
+async def test_get_upcoming_birthdays_wraps_new_year(contact_repository, mocker, mock_session):
+    fake_date = mocker.patch("src.repositories.contacts.date")
+    fake_date.today.return_value = date(2025, 12, 28)
+    mock_session.execute = AsyncMock(return_value=MagicMock())
+
+    await contact_repository.get_upcoming_birthdays(USER_ID, 7)
+
+    query = mock_session.execute.call_args.args[0]
+    params = query.compile().params
+    assert "contacts.birthday_md >=" in str(query)
+    assert "contacts.birthday_md <=" in str(query)
+    assert 1228 in params.values()
+    assert 104 in params.values()
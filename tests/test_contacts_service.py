@@ -1,10 +1,18 @@
+import base64
+import io
+import json
+
 import pytest
-from unittest.mock import AsyncMock
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
 from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+from sqlalchemy.exc import IntegrityError
 
 from src.db.models import Contact
-from src.services.contacts import ContactService
-from src.schemas import ContactModel
+from src.services.cache import ContactCache
+from src.services.contacts import ContactService, _read_csv_rows
+from src.schemas import ContactModel, ContactResponse
 
 
 @pytest.fixture
@@ -24,15 +32,27 @@ def mock_repository():
 
 
 @pytest.fixture
-def contact_service(mock_repository):
+def mock_redis():
+    redis = AsyncMock()
+    redis.get.return_value = None
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    pipe.__aenter__.return_value = pipe
+    redis.pipeline = MagicMock(return_value=pipe)
+    redis.pipe = pipe
+    return redis
+
+
+@pytest.fixture
+def contact_service(mock_repository, mock_redis):
     service = ContactService.__new__(ContactService)
     service._repository = mock_repository
+    service._cache = ContactCache(redis=mock_redis)
     return service
 
 
 @pytest.mark.asyncio
 async def test_create_contact_success(contact_service, contact_data):
-    contact_service._repository.does_contact_exist.return_value = False
     contact_service._repository.create_contact.return_value = Contact(**contact_data.dict())
 
     result = await contact_service.create_contact(user_id=1, data=contact_data)
@@ -43,7 +63,7 @@ async def test_create_contact_success(contact_service, contact_data):
 
 @pytest.mark.asyncio
 async def test_create_contact_duplicate(contact_service, contact_data):
-    contact_service._repository.does_contact_exist.return_value = True
+    contact_service._repository.create_contact.side_effect = IntegrityError("INSERT", {}, Exception("unique"))
 
     with pytest.raises(HTTPException) as exc:
         await contact_service.create_contact(user_id=1, data=contact_data)
@@ -78,3 +98,145 @@ async def test_list_contacts(contact_service):
     result = await contact_service.list_contacts(user_id=1)
 
     assert isinstance(result, list)
+
+
+@pytest.mark.asyncio
+async def test_list_contacts_with_cursor(contact_service):
+    contact_service._repository.get_contacts.return_value = []
+    contacts = [Contact(id=7, first_name="Ann"), Contact(id=9, first_name="Bob")]
+    cursor = ContactService.next_cursor(contacts, limit=2, sort_by="first_name")
+
+    await contact_service.list_contacts(user_id=1, limit=2, sort_by="first_name", cursor=cursor)
+
+    kwargs = contact_service._repository.get_contacts.call_args.kwargs
+    assert kwargs["after"] == ("Bob", 9)
+    assert kwargs["sort_by"] == "first_name"
+
+
+@pytest.mark.asyncio
+async def test_list_contacts_cursor_for_other_ordering(contact_service):
+    cursor = ContactService.next_cursor([Contact(id=1)], limit=1, sort_by="id")
+
+    with pytest.raises(HTTPException) as exc:
+        await contact_service.list_contacts(user_id=1, sort_by="last_name", cursor=cursor)
+
+    assert exc.value.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "sort_by, payload",
+    [
+        ("created_at", ["created_at", "nope", 1]),
+        ("created_at", ["created_at", {"a": 1}, 1]),
+        ("created_at", ["created_at", "2024-01-01T00:00:00", "x"]),
+        ("created_at", ["created_at", "2024-01-01T00:00:00+02:00", 1]),
+        ("first_name", ["first_name", 5, 1]),
+        ("id", ["id", "1", 1]),
+        ("id", ["id", 1, True]),
+        ("id", ["id", 1, 2, 3]),
+    ],
+)
+async def test_list_contacts_rejects_crafted_cursor(contact_service, sort_by, payload):
+    cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    with pytest.raises(HTTPException) as exc:
+        await contact_service.list_contacts(user_id=1, sort_by=sort_by, cursor=cursor)
+
+    assert exc.value.status_code == status.HTTP_400_BAD_REQUEST
+    assert exc.value.detail == "Invalid pagination cursor."
+    contact_service._repository.get_contacts.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_contacts_cursor_restores_datetime(contact_service):
+    contact_service._repository.get_contacts.return_value = []
+    cursor = ContactService.next_cursor([Contact(id=4, created_at=datetime(2024, 1, 1, 12))], limit=1, sort_by="created_at")
+
+    await contact_service.list_contacts(user_id=1, limit=1, sort_by="created_at", cursor=cursor)
+
+    assert contact_service._repository.get_contacts.call_args.kwargs["after"] == (datetime(2024, 1, 1, 12), 4)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("payload", [["rank", "0.5", 1], ["rank", 0.5, "1"], ["rank", None, 1], ["rank", True, 1]])
+async def test_search_contacts_rejects_crafted_cursor(contact_service, payload):
+    cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    with pytest.raises(HTTPException) as exc:
+        await contact_service.search_contacts(user_id=1, search_query="john", cursor=cursor)
+
+    assert exc.value.status_code == status.HTTP_400_BAD_REQUEST
+    contact_service._repository.search_contacts.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cached_reads_come_from_primary(contact_service, mock_redis):
+    contact_service._repository.get_contacts.return_value = []
+    mock_redis.get.side_effect = ["42", None]
+
+    await contact_service.list_contacts(user_id=1)
+    assert contact_service._repository.get_contacts.call_args.kwargs["replica"] is False
+
+    mock_redis.get.side_effect = RedisError("down")
+    await contact_service.list_contacts(user_id=1)
+    assert contact_service._repository.get_contacts.call_args.kwargs["replica"] is True
+
+
+def test_next_cursor_last_page():
+    assert ContactService.next_cursor([Contact(id=1)], limit=10) is None
+
+
+@pytest.mark.asyncio
+async def test_search_contacts_next_cursor(contact_service, contact_data):
+    contact_service._repository.search_contacts.return_value = [
+        (Contact(id=3, **contact_data.model_dump(), created_at=datetime(2025, 1, 1)), 0.5),
+        (Contact(id=8, **contact_data.model_dump(), created_at=datetime(2025, 1, 1)), 0.25),
+    ]
+
+    contacts, cursor = await contact_service.search_contacts(user_id=1, search_query="john", limit=2)
+    assert [contact.id for contact in contacts] == [3, 8]
+
+    await contact_service.search_contacts(user_id=1, search_query="john", limit=2, cursor=cursor)
+    assert contact_service._repository.search_contacts.call_args.kwargs["after"] == (0.25, 8)
+
+
+@pytest.mark.asyncio
+async def test_retrieve_contact_from_cache(contact_service, contact_data, mock_redis):
+    cached = ContactResponse(id=5, **contact_data.model_dump(), created_at=datetime(2025, 1, 1), updated_at=None)
+    mock_redis.get.side_effect = ["42", json.dumps([cached.model_dump(mode="json")])]
+
+    result = await contact_service.retrieve_contact(user_id=1, contact_id=5)
+
+    assert result == cached
+    contact_service._repository.get_contact_by_id.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_write_bumps_cache_version(contact_service, contact_data, mock_redis):
+    contact_service._repository.create_contact.return_value = Contact(**contact_data.model_dump())
+
+    await contact_service.create_contact(user_id=1, data=contact_data)
+
+    mock_redis.pipe.set.assert_called_once()
+    assert mock_redis.pipe.set.call_args.args[0] == "contacts:1:version"
+    assert mock_redis.pipe.set.call_args.kwargs == {"nx": True}
+    mock_redis.pipe.incr.assert_called_once_with("contacts:1:version")
+    mock_redis.pipe.execute.assert_awaited_once()
+
+
+def test_read_csv_rows_skips_unreadable_rows():
+    body = (
+        b"first_name,last_name\n"
+        b"Ann,Lee\n"
+        b"B\xff\xfeb,Stone\n"
+        + b"x" * 200_000 + b",Ray\n"
+        b"Dan,Fox\n"
+    )
+
+    rows = list(_read_csv_rows(io.BytesIO(body)))
+
+    assert rows[0] == (1, {"first_name": "Ann", "last_name": "Lee"})
+    assert rows[1] == (2, "Line 3 is not valid UTF-8")
+    assert rows[2][0] == 3 and rows[2][1].startswith("Unreadable CSV at line 4")
+    assert rows[3] == (4, {"first_name": "Dan", "last_name": "Fox"})
@@ -0,0 +1,137 @@
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import aiosmtplib
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select
+
+from src.db.models import EmailOutbox
+from src.repositories.email_outbox import EmailOutboxRepository
+from src.services.email import send_email_confirmation
+from src.utils import utcnow
+from src.services.mail_transport import MailSink, get_transport
+from src.workers.email_sender import EmailSender
+from tests.conftest import TestingSessionLocal
+
+
+@pytest_asyncio.fixture
+async def outbox(monkeypatch):
+    monkeypatch.setattr("src.services.email.sessionmanager", MagicMock(session=TestingSessionLocal))
+    async with TestingSessionLocal() as session:
+        await session.execute(delete(EmailOutbox))
+        await session.commit()
+        yield session
+
+
+async def enqueue(session, count):
+    for i in range(count):
+        await EmailOutboxRepository(session).enqueue(
+            f"user{i}@example.com", "Confirm your email", "verify_email.html",
+            {"host": "http://testserver/", "username": f"user{i}", "token": "t"}, utcnow(),
+        )
+
+
+@pytest.mark.asyncio
+async def test_send_email_confirmation_enqueues(outbox):
+    await send_email_confirmation("neo@example.com", "neo", "http://testserver/")
+
+    email = (await outbox.execute(select(EmailOutbox))).scalar_one()
+    assert email.recipient == "neo@example.com"
+    assert email.template == "verify_email.html"
+    assert email.context["username"] == "neo"
+    assert await EmailOutboxRepository(outbox).depth() == {"pending": 1, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_batch_is_sent_over_one_connection(outbox):
+    await enqueue(outbox, 3)
+    transport = AsyncMock()
+    sender = EmailSender(transport=transport, session_factory=TestingSessionLocal)
+
+    assert await sender.send_batch() == 3
+
+    assert transport.send.await_count == 3
+    assert transport.send.await_args.args[0]["To"] == "user2@example.com"
+    assert await EmailOutboxRepository(outbox).depth() == {"pending": 0, "failed": 0}
+    assert await sender.send_batch() == 0
+
+
+@pytest.mark.asyncio
+async def test_failures_are_retried_or_given_up(outbox):
+    await enqueue(outbox, 2)
+    transport = AsyncMock()
+    transport.send.side_effect = [
+        aiosmtplib.SMTPResponseException(451, "try again"),
+        aiosmtplib.SMTPResponseException(550, "no such user"),
+    ]
+    sender = EmailSender(transport=transport, session_factory=TestingSessionLocal)
+
+    await sender.send_batch()
+
+    emails = (await outbox.execute(select(EmailOutbox).order_by(EmailOutbox.id))).scalars().all()
+    await outbox.refresh(emails[0])
+    await outbox.refresh(emails[1])
+    assert [email.status for email in emails] == ["pending", "failed"]
+    assert emails[0].attempts == 1
+    assert emails[0].next_attempt_at > utcnow()
+    assert await sender.send_batch() == 0
+
+
+@pytest.mark.asyncio
+async def test_unreachable_server_reschedules_rest_of_batch(outbox):
+    await enqueue(outbox, 3)
+    transport = AsyncMock()
+    transport.send.side_effect = aiosmtplib.SMTPConnectError("refused")
+    sender = EmailSender(transport=transport, session_factory=TestingSessionLocal)
+
+    await sender.send_batch()
+
+    assert transport.send.await_count == 1
+    transport.close.assert_awaited()
+    assert await EmailOutboxRepository(outbox).depth() == {"pending": 3, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_old_sent_emails_are_purged(outbox, monkeypatch):
+    await enqueue(outbox, 3)
+    sender = EmailSender(transport=AsyncMock(), session_factory=TestingSessionLocal)
+    await sender.send_batch()
+    old = (await outbox.execute(select(EmailOutbox.id).order_by(EmailOutbox.id).limit(2))).scalars().all()
+    await EmailOutboxRepository(outbox).mark_sent(old, utcnow() - timedelta(days=2))
+    monkeypatch.setattr("src.workers.email_sender.config.OUTBOX_PURGE_BATCH_SIZE", 1)
+
+    assert await sender.purge_sent() == 2
+
+    remaining = (await outbox.execute(select(EmailOutbox.id))).scalars().all()
+    assert len(remaining) == 1 and remaining[0] not in old
+
+
+@pytest.mark.asyncio
+async def test_sink_transport_receives_batch(outbox):
+    await enqueue(outbox, 2)
+    sink = MailSink(port=8026)
+    sink.start()
+    try:
+        sender = EmailSender(transport=sink.transport(), session_factory=TestingSessionLocal)
+        await sender.send_batch()
+        await sender.transport.close()
+    finally:
+        sink.stop()
+
+    assert [recipients for _, recipients in sink.received] == [["user0@example.com"], ["user1@example.com"]]
+
+
+@pytest.mark.asyncio
+async def test_stopping_worker_shuts_down_sink_transport(monkeypatch):
+    monkeypatch.setattr("src.services.mail_transport.config.MAIL_SINK_PORT", 8027)
+    transport = get_transport("sink")
+    sender = EmailSender(transport=transport, session_factory=TestingSessionLocal)
+    monkeypatch.setattr(sender, "send_batch", AsyncMock(side_effect=asyncio.CancelledError))
+    monkeypatch.setattr(sender, "purge_sent", AsyncMock(return_value=0))
+
+    with pytest.raises(asyncio.CancelledError):
+        await sender.run()
+
+    assert transport.sink._controller is None
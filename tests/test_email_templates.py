@@ -0,0 +1,22 @@
+import pytest
+from jinja2 import TemplateNotFound
+
+from src.services.email import TemplateRegistry, conf
+
+
+def test_registry_compiles_all_templates_once():
+    registry = TemplateRegistry(conf.TEMPLATE_FOLDER)
+    registry.load()
+    template = registry._templates["verify_email.html"]
+
+    html = registry.render("verify_email.html", {"host": "http://h/", "username": "<b>neo</b>", "token": "t"})
+
+    assert set(registry._templates) == {"verify_email.html", "reset_password.html"}
+    assert registry._templates["verify_email.html"] is template
+    assert "http://h/api/auth/confirmed_email/t" in html
+    assert "&lt;b&gt;neo&lt;/b&gt;" in html
+
+
+def test_registry_rejects_unknown_template():
+    with pytest.raises(TemplateNotFound):
+        TemplateRegistry(conf.TEMPLATE_FOLDER).render("missing.html", {})
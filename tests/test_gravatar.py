@@ -0,0 +1,52 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select
+
+from src.db.models import User
+from src.services.gravatar import fill_default_avatar, gravatar_url
+from tests.conftest import TestingSessionLocal
+
+
+@pytest_asyncio.fixture
+async def new_user():
+    async with TestingSessionLocal() as session:
+        user = User(username="gravatar", email="gravatar@example.com", hashed_password="x")
+        session.add(user)
+        await session.commit()
+        yield user
+        await session.execute(delete(User).where(User.id == user.id))
+        await session.commit()
+
+
+def test_gravatar_url_normalizes_email():
+    assert gravatar_url("Neo@Example.com ") == gravatar_url("neo@example.com")
+    assert gravatar_url("neo@example.com").startswith("https://www.gravatar.com/avatar/")
+
+
+@pytest.mark.asyncio
+async def test_fill_default_avatar_sets_gravatar(new_user):
+    with patch("src.services.gravatar.user_cache.invalidate", AsyncMock()) as invalidate:
+        await fill_default_avatar(new_user.id, new_user.email, TestingSessionLocal)
+
+    async with TestingSessionLocal() as session:
+        avatar = (await session.execute(select(User.avatar).where(User.id == new_user.id))).scalar_one()
+    assert avatar == gravatar_url(new_user.email)
+    invalidate.assert_awaited_once_with("gravatar")
+
+
+@pytest.mark.asyncio
+async def test_fill_default_avatar_keeps_uploaded_avatar(new_user):
+    async with TestingSessionLocal() as session:
+        user = await session.get(User, new_user.id)
+        user.avatar = "/media/avatars/abc/manifest.json"
+        await session.commit()
+
+    with patch("src.services.gravatar.user_cache.invalidate", AsyncMock()) as invalidate:
+        await fill_default_avatar(new_user.id, new_user.email, TestingSessionLocal)
+
+    async with TestingSessionLocal() as session:
+        avatar = (await session.execute(select(User.avatar).where(User.id == new_user.id))).scalar_one()
+    assert avatar == "/media/avatars/abc/manifest.json"
+    invalidate.assert_not_awaited()
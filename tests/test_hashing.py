@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from src.services.auth import Hash
+from src.services.users import UserService
+from src.services.hashing import (
+    HashingPool,
+    MAX_BCRYPT_ROUNDS,
+    MIN_BCRYPT_ROUNDS,
+    bcrypt_rounds,
+    calibrate_bcrypt_rounds,
+    configure_hashing,
+    pwd_context,
+)
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_off_the_event_loop():
+    hashed = await Hash().get_password_hash_async("12345678")
+
+    assert await Hash().verify_password_async("12345678", hashed)
+    assert not await Hash().verify_password_async("wrong", hashed)
+
+
+@pytest.mark.asyncio
+async def test_hashing_pool_rejects_when_saturated():
+    pool = HashingPool(workers=1, max_queue=1)
+    release = threading.Event()
+    busy = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as exc:
+        await pool.run(release.wait)
+
+    assert exc.value.status_code == 503
+    assert pool.stats()["rejected"] == 1
+    release.set()
+    await asyncio.gather(*busy)
+    pool.shutdown()
+
+
+def test_configure_hashing_with_fixed_rounds():
+    original = bcrypt_rounds()
+    try:
+        assert configure_hashing(rounds=11) == 11
+        assert pwd_context.hash("12345678").startswith("$2b$11$")
+    finally:
+        configure_hashing(rounds=original)
+
+
+def test_calibration_is_clamped():
+    assert calibrate_bcrypt_rounds(target_ms=0.001) == MIN_BCRYPT_ROUNDS
+    assert calibrate_bcrypt_rounds(target_ms=10 ** 9) == MAX_BCRYPT_ROUNDS
+
+
+@pytest.mark.asyncio
+async def test_outdated_hash_is_upgraded_on_verify():
+    weak = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("12345678")
+
+    verified, new_hash = await Hash().verify_and_update_async("12345678", weak)
+
+    assert verified
+    assert new_hash.startswith(f"$2b${bcrypt_rounds():02d}$")
+    assert await Hash().verify_and_update_async("12345678", new_hash) == (True, None)
+    assert await Hash().verify_and_update_async("wrong", weak) == (False, None)
+
+
+def test_stronger_hash_is_not_downgraded():
+    original = bcrypt_rounds()
+    try:
+        configure_hashing(rounds=10)
+        stronger = CryptContext(schemes=["bcrypt"], bcrypt__rounds=11).hash("12345678")
+        weaker = CryptContext(schemes=["bcrypt"], bcrypt__rounds=9).hash("12345678")
+
+        assert not pwd_context.needs_update(stronger)
+        assert pwd_context.needs_update(weaker)
+    finally:
+        configure_hashing(rounds=original)
+
+
+@pytest.mark.asyncio
+async def test_rehash_password_invalidates_cached_user(monkeypatch):
+    service = UserService(AsyncMock())
+    updated = SimpleNamespace(username="neo", email="neo@example.com")
+    service.repository = AsyncMock(update_password=AsyncMock(return_value=updated))
+    invalidate = AsyncMock()
+    monkeypatch.setattr("src.services.users.user_cache.invalidate", invalidate)
+
+    assert await service.rehash_password(updated, "$2b$12$new") is updated
+
+    service.repository.update_password.assert_awaited_once_with("neo@example.com", "$2b$12$new")
+    invalidate.assert_awaited_once_with("neo")
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import ecdsa
+import pytest
+from jose import JWTError, jwt
+
+from src.services.jwt_keys import KeyRing
+
+
+@pytest.fixture
+def keys_dir(tmp_path):
+    for kid in ("2026-09", "2026-10"):
+        key = ecdsa.SigningKey.generate(curve=ecdsa.NIST256p)
+        (tmp_path / f"{kid}.pem").write_bytes(key.to_pem())
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_signs_with_active_key_and_verifies_all_keys(keys_dir):
+    ring = KeyRing("ES256", keys_dir=str(keys_dir))
+    old_ring = KeyRing("ES256", keys_dir=str(keys_dir), active_kid="2026-09")
+
+    token = ring.encode({"sub": "neo"})
+
+    assert jwt.get_unverified_header(token)["kid"] == "2026-10"
+    assert (await ring.decode(token))["sub"] == "neo"
+    assert (await ring.decode(old_ring.encode({"sub": "neo"})))["sub"] == "neo"
+
+
+@pytest.mark.asyncio
+async def test_tokens_without_kid_use_shared_secret(keys_dir):
+    token = jwt.encode({"sub": "neo"}, "secret", algorithm="HS256")
+
+    assert (await KeyRing("HS256", secret="secret").decode(token))["sub"] == "neo"
+    for ring in (
+        KeyRing("ES256", keys_dir=str(keys_dir)),
+        KeyRing("ES256", secret="secret", keys_dir=str(keys_dir)),
+        KeyRing("ES256", secret="secret", jwks_url="http://issuer/.well-known/jwks.json"),
+    ):
+        with pytest.raises(JWTError):
+            await ring.decode(token)
+
+
+@pytest.mark.asyncio
+async def test_legacy_hmac_tokens_are_accepted_until_deadline(keys_dir):
+    token = jwt.encode({"sub": "neo"}, "secret", algorithm="HS256")
+    now = datetime.now(timezone.utc)
+
+    def ring(until=None):
+        return KeyRing("ES256", secret="secret", keys_dir=str(keys_dir), accept_legacy_hmac=True, legacy_hmac_until=until)
+
+    assert (await ring().decode(token))["sub"] == "neo"
+    assert (await ring(now + timedelta(hours=1)).decode(token))["sub"] == "neo"
+    with pytest.raises(JWTError):
+        await ring(now - timedelta(hours=1)).decode(token)
+
+
+def test_jwks_publishes_public_keys_only(keys_dir):
+    keys = KeyRing("ES256", keys_dir=str(keys_dir)).jwks()["keys"]
+
+    assert [key["kid"] for key in keys] == ["2026-09", "2026-10"]
+    assert all(key["kty"] == "EC" and "d" not in key for key in keys)
+
+
+@pytest.mark.asyncio
+async def test_verifier_loads_keys_from_jwks_url(keys_dir):
+    issuer = KeyRing("ES256", keys_dir=str(keys_dir))
+    verifier = KeyRing("ES256", jwks_url="http://issuer/.well-known/jwks.json")
+
+    with patch.object(verifier, "refresh", wraps=verifier.refresh) as refresh, patch(
+        "src.services.jwt_keys.httpx.AsyncClient.get", new_callable=AsyncMock
+    ) as get:
+        get.return_value.json = lambda: issuer.jwks()
+        get.return_value.raise_for_status = lambda: None
+        for _ in range(3):
+            assert (await verifier.decode(issuer.encode({"sub": "neo"})))["sub"] == "neo"
+
+    assert refresh.call_count == 1
+    get.assert_called_once_with("http://issuer/.well-known/jwks.json")
+
+
+def test_jwks_endpoint(client):
+    response = client.get("/.well-known/jwks.json")
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"keys": []}
+    assert "max-age" in response.headers["Cache-Control"]
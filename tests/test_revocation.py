@@ -0,0 +1,96 @@
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+
+from src.services.revocation import BloomFilter, TokenDenylist
+
+
+@pytest.fixture
+def redis():
+    redis = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis.pipeline = MagicMock(return_value=pipe)
+    pipe.__aenter__.return_value = pipe
+    redis.pipe = pipe
+    return redis
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(size=1 << 12, hashes=5, items=[f"jti:{i}" for i in range(100)])
+
+    assert all(f"jti:{i}" in bloom for i in range(100))
+    assert sum(f"other:{i}" in bloom for i in range(1000)) < 50
+
+
+@pytest.mark.asyncio
+async def test_unrevoked_token_is_checked_without_redis(redis):
+    denylist = TokenDenylist(redis=redis)
+
+    assert not await denylist.is_revoked({"sub": "neo", "jti": "a", "iat": int(time.time())})
+    redis.exists.assert_not_called()
+    redis.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_is_confirmed_in_redis(redis):
+    denylist = TokenDenylist(redis=redis)
+    claims = {"sub": "neo", "jti": "a", "exp": time.time() + 60}
+
+    await denylist.revoke_token(claims)
+    key, _ = redis.pipe.set.call_args.args
+    assert key == "revoked:jti:a"
+    assert 0 < redis.pipe.set.call_args.kwargs["ex"] <= 60
+    redis.pipe.publish.assert_called_once_with(TokenDenylist.CHANNEL, "jti:a")
+
+    redis.exists.return_value = 1
+    assert await denylist.is_revoked(claims)
+
+
+@pytest.mark.asyncio
+async def test_user_cutoff_revokes_older_tokens_only(redis):
+    denylist = TokenDenylist(redis=redis)
+    await denylist.revoke_user("neo")
+    cutoff = int(time.time())
+    redis.get.return_value = str(cutoff)
+
+    assert await denylist.is_revoked({"sub": "neo", "iat": cutoff - 10})
+    assert not await denylist.is_revoked({"sub": "neo", "iat": cutoff})
+
+
+@pytest.mark.asyncio
+async def test_filter_hit_is_rejected_when_redis_is_down(redis):
+    denylist = TokenDenylist(redis=redis)
+    denylist.bloom.add("jti:a")
+    redis.exists.side_effect = RedisError("down")
+
+    assert await denylist.is_revoked({"sub": "neo", "jti": "a"})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "revoke", [lambda d: d.revoke_token({"jti": "a", "exp": time.time() + 60}), lambda d: d.revoke_user("neo")]
+)
+async def test_revocation_fails_when_redis_is_down(redis, revoke):
+    denylist = TokenDenylist(redis=redis)
+    redis.pipe.execute.side_effect = RedisError("down")
+
+    with pytest.raises(HTTPException) as e:
+        await revoke(denylist)
+    assert e.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_sync_rebuilds_filter_from_live_revocations(redis):
+    denylist = TokenDenylist(redis=redis)
+    denylist.bloom.add("jti:expired")
+    redis.pipe.execute.return_value = [0, 0, ["a"], ["neo"]]
+
+    await denylist.sync()
+
+    assert "jti:a" in denylist.bloom
+    assert "sub:neo" in denylist.bloom
+    assert "jti:expired" not in denylist.bloom
@@ -0,0 +1,175 @@
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+from starlette.datastructures import Headers
+
+from src.services.avatar_variants import render_variants
+from src.services.upload_file import AvatarStorage, CloudinaryStorage, LocalStorage, UploadFileService
+
+
+def make_png(width: int = 300, height: int = 200, mode: str = "RGB") -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), "red").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+PNG = make_png()
+
+
+def make_upload(content: bytes, content_type: str = "image/png") -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(content),
+        filename="avatar",
+        size=len(content),
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+@pytest.fixture
+def service(tmp_path):
+    return UploadFileService(LocalStorage(str(tmp_path), "/media/avatars"), max_bytes=len(PNG) + 100)
+
+
+def test_render_variants_crops_to_square_sizes():
+    variants = render_variants(make_png(mode="RGBA"), [64, 128], quality=80)
+
+    assert set(variants) == {"64.webp", "64.jpg", "128.webp", "128.jpg"}
+    with Image.open(io.BytesIO(variants["128.jpg"])) as img:
+        assert img.format == "JPEG"
+        assert img.size == (128, 128)
+    with Image.open(io.BytesIO(variants["64.webp"])) as img:
+        assert img.format == "WEBP"
+        assert img.size == (64, 64)
+
+
+def test_render_variants_does_not_upscale():
+    variants = render_variants(make_png(40, 50), [64], quality=80)
+
+    with Image.open(io.BytesIO(variants["64.webp"])) as img:
+        assert img.size == (40, 40)
+
+
+def test_render_variants_rejects_too_many_pixels():
+    with pytest.raises(Image.DecompressionBombError):
+        render_variants(make_png(100, 60), [64], quality=80, max_pixels=100 * 60 - 1)
+
+
+@pytest.mark.asyncio
+async def test_upload_avatar_stores_variants_and_manifest(service, tmp_path):
+    url = await service.upload_avatar(make_upload(PNG))
+
+    digest = url.split("/")[-2]
+    assert url == f"/media/avatars/{digest}/manifest.json"
+    manifest = json.loads((tmp_path / digest / "manifest.json").read_text())
+    assert manifest["hash"] == digest
+    assert list(manifest["variants"]) == ["64", "128", "256", "512"]
+    assert manifest["variants"]["128"]["webp"] == f"/media/avatars/{digest}/128.webp"
+    assert (tmp_path / digest / "128.webp").is_file()
+
+
+@pytest.mark.asyncio
+async def test_upload_avatar_identical_image_is_noop(service):
+    first = await service.upload_avatar(make_upload(PNG))
+
+    with patch("src.services.upload_file.avatar_variants.render_avatar") as render:
+        second = await service.upload_avatar(make_upload(PNG))
+
+    assert second == first
+    render.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upload_avatar_rejects_large_file(service, tmp_path):
+    upload = make_upload(PNG + b"\x00" * 200)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.upload_avatar(upload)
+
+    assert exc.value.status_code == 413
+    assert not any(tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_upload_avatar_counts_bytes_without_declared_size(service):
+    upload = make_upload(PNG + b"\x00" * 200)
+    upload.size = None
+
+    with pytest.raises(HTTPException) as exc:
+        await service.upload_avatar(upload)
+
+    assert exc.value.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_upload_avatar_rejects_unsupported_type(service):
+    with pytest.raises(HTTPException) as exc:
+        await service.upload_avatar(make_upload(b"%PDF-1.7", "application/pdf"))
+
+    assert exc.value.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_upload_avatar_rejects_mismatched_content(service):
+    with pytest.raises(HTTPException) as exc:
+        await service.upload_avatar(make_upload(b"<svg></svg>", "image/png"))
+
+    assert exc.value.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_upload_avatar_rejects_too_many_pixels(service, monkeypatch):
+    monkeypatch.setattr("src.services.avatar_variants.config.AVATAR_MAX_PIXELS", 100)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.upload_avatar(make_upload(PNG))
+
+    assert exc.value.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_upload_avatar_rejects_undecodable_image(service):
+    with pytest.raises(HTTPException) as exc:
+        await service.upload_avatar(make_upload(b"\x89PNG\r\n\x1a\n" + b"\x00" * 100))
+
+    assert exc.value.status_code == 415
+
+
+def test_incomplete_storage_backend_cannot_be_created():
+    class NoUrlStorage(AvatarStorage):
+        def exists(self, key):
+            return False
+
+        def put(self, key, data, content_type):
+            pass
+
+    with pytest.raises(TypeError):
+        NoUrlStorage()
+
+
+@pytest.mark.parametrize(
+    "outcome, expected",
+    [(httpx.Response(200), True), (httpx.Response(404), False), (httpx.ConnectError("down"), False)],
+)
+def test_cloudinary_exists_checks_delivery_url(outcome, expected):
+    storage = CloudinaryStorage("demo", "1", "secret")
+
+    with patch("src.services.upload_file.httpx.head", side_effect=[outcome]) as head:
+        assert storage.exists("abc/manifest.json") is expected
+
+    assert head.call_args.args[0] == storage.url("abc/manifest.json")
+
+
+def test_local_storage_concurrent_puts_of_same_key(tmp_path):
+    storage = LocalStorage(str(tmp_path), "/media/avatars")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: storage.put("abc/manifest.json", b"{}", "application/json"), range(32)))
+
+    assert storage.exists("abc/manifest.json")
+    assert [path.name for path in (tmp_path / "abc").iterdir()] == ["manifest.json"]
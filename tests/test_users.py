@@ -1,6 +1,12 @@
+import asyncio
+from unittest.mock import AsyncMock
+
 import pytest
 
-from src.services.auth import create_access_token
+from main import app
+from src.db.db import DatabaseSessionManager, get_db
+from src.schemas import User
+from src.services.auth import create_access_token, get_current_user
 
 
 user_data_admin = {
@@ -42,3 +48,26 @@ async def test_me_authenticated(client, monkeypatch):
     response = client.get("/api/users/me")
 
     assert response.status_code == 200
+
+
+def test_cached_user_request_checks_out_no_connection(client, monkeypatch, tmp_path):
+    """
+    Test that a request authenticated from the user cache never checks out a database connection.
+    """
+    manager = DatabaseSessionManager(f"sqlite+aiosqlite:///{tmp_path}/lazy.db")
+
+    async def override_get_db():
+        async with manager.session() as session:
+            yield session
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.delitem(app.dependency_overrides, get_current_user)
+    cached_user = User(id=1, username="agent007", email="agent007@gmail.com", avatar=None)
+    monkeypatch.setattr("src.services.auth.user_cache.get", AsyncMock(return_value=cached_user))
+    token = asyncio.run(create_access_token({"sub": "agent007"}))
+
+    response = client.get("/api/users/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["username"] == "agent007"
+    assert manager.pool_stats()["checkouts"] == 0
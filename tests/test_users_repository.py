@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.models import User
@@ -81,20 +82,28 @@ async def test_get_user_by_email(user_repository, mock_session, user):
 @pytest.mark.asyncio
 async def test_create_user(user_repository, mock_session, user, user_body):
     mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = user
+    mock_result.scalar_one.return_value = user
+    mock_session.execute = AsyncMock(return_value=mock_result)
 
     result = await user_repository.create_user(
         user_body,
         avatar="https://example.com/avatar.jpg",
     )
 
-    assert result.email == user.email
-    assert result.username == user.username
-    assert result.avatar == user.avatar
-
-    mock_session.add.assert_called_once()
+    assert result == user
+    mock_session.execute.assert_awaited_once()
     mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(result)
+    mock_session.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_user_duplicate_rolls_back(user_repository, mock_session, user_body):
+    mock_session.execute = AsyncMock(side_effect=IntegrityError("INSERT", {}, Exception("UNIQUE")))
+
+    with pytest.raises(IntegrityError):
+        await user_repository.create_user(user_body)
+
+    mock_session.rollback.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,20 @@
+from src.db.models import User
+from src.services.auth import get_admin_user
+from main import app
+
+
+def test_metrics_requires_admin(client):
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 403, response.text
+
+
+def test_metrics_reports_outbox_depth(client):
+    app.dependency_overrides[get_admin_user] = lambda: User(id=1, username="admin", email="admin@test.com")
+    try:
+        response = client.get("/api/metrics")
+    finally:
+        del app.dependency_overrides[get_admin_user]
+
+    assert response.status_code == 200, response.text
+    assert set(response.json()["email_outbox"]) == {"pending", "failed"}